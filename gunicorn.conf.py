@@ -0,0 +1,8 @@
+"""
+Gunicorn settings, loaded automatically from the working directory
+"""
+import os
+
+# Sync workers are killed once a request runs longer than this. Streamed ZIP
+# exports stop themselves after EXPORT_TIME_LIMIT seconds, so keep it below.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
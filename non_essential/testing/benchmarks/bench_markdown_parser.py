@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark Markdown question parsing on synthetic question banks
+
+Parses generated banks of up to 50,000 questions and reports the best time
+per question over a few runs, which stays flat when parsing scales linearly,
+next to the time to map the same bank from its compiled artifact. Run from
+the repository root:
+
+    python non_essential/testing/benchmarks/bench_markdown_parser.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from src.quiz_app.repo.markdown_parser import parse_questions
+from src.quiz_app.repo.question_artifact import compile_question_bank, open_compiled_store, source_hash
+
+SIZES = (6250, 12500, 25000, 50000)
+REPEAT = 3
+TOPICS = ('DAG Execution', 'State Management', 'Commands', 'Testing', 'Snapshots')
+
+
+def synthetic_bank(count):
+    """Build a Markdown bank of count questions in the repository's format"""
+    blocks = ["# dbt Certification Questions\n"]
+    for i in range(1, count + 1):
+        blocks.append(f"""
+# Question {i}
+**Topic:** {TOPICS[i % len(TOPICS)]}
+**Difficulty:** {i % 4 + 1} (Generated)
+
+**Scenario:**
+You have a DAG defined as:
+`seed_{i} → stg_{i} → dim_{i}`
+
+```sql
+select * from {{{{ ref('stg_{i}') }}}}
+```
+
+**Question:**
+What happens when you run `dbt build --select dim_{i}`?
+
+**Options:**
+A. Upstream models build first
+B. Only `dim_{i}` runs
+C. Only tests run
+D. Nothing runs
+
+**Correct Answer:** {'ABCD'[i % 4]}
+
+**Explanation:**
+Selecting a model builds its upstream chain before it.
+
+---
+""")
+    return ''.join(blocks)
+
+
+def best_of(function):
+    """Best wall time of REPEAT calls, with the last result"""
+    elapsed = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, result
+
+
+def load_compiled(md_file, artifact_file):
+    """What a worker does at start-up with a fresh artifact: hash the source and map it"""
+    store = open_compiled_store(artifact_file, source_hash(md_file.read_bytes()))
+    count = len(store)
+    store.close()
+    return count
+
+
+def main():
+    print(f"{'questions':>10} {'MB':>8} {'parse s':>10} {'us/question':>12} {'compiled load s':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        md_file = Path(directory) / 'questions.md'
+        for size in SIZES:
+            content = synthetic_bank(size)
+            parse, (questions, errors) = best_of(lambda: parse_questions(content))
+            assert len(questions) == size and not errors
+
+            md_file.write_text(content, encoding='utf-8')
+            artifact_file, _, _ = compile_question_bank(md_file)
+            load, loaded = best_of(lambda: load_compiled(md_file, artifact_file))
+            assert loaded == size
+
+            print(f"{size:>10} {len(content) / 1e6:>8.1f} {parse:>10.3f} {parse / size * 1e6:>12.1f} {load:>16.3f}")
+
+
+if __name__ == '__main__':
+    main()
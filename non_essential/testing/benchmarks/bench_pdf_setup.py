@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-report PDFService setup cost
+
+Compares the previous per-request setup (a fresh stylesheet, six custom
+paragraph styles, the summary TableStyle and static paragraphs parsed for
+every report) with the shared process-wide service. Run from the repository
+root:
+
+    python non_essential/testing/benchmarks/bench_pdf_setup.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from reportlab.platypus import Paragraph, TableStyle
+from src.quiz_app.services import pdf_service
+from src.quiz_app.services.pdf_service import get_pdf_service
+
+REPEAT = 2000
+ATTEMPT = {
+    'id': 1, 'created_at': '2026-01-01T12:00:00', 'total_questions': 45, 'correct_answers': 30,
+    'percentage': 66.7, 'is_pro_quiz': True, 'difficulty': 2
+}
+
+
+def legacy_setup():
+    """Previous implementation: rebuild every style and static flowable per request"""
+    styles, custom = pdf_service._build_styles()
+    TableStyle(pdf_service.SUMMARY_TABLE_STYLE.getCommands())
+    for text, style in [
+        ("dbt Certification Quiz", 'title'), ("Attempt Summary Report", 'subtitle'),
+        ("Quiz Summary", 'header'), ("Performance Analysis", 'header'),
+        ("Questions & Answers", 'header')
+    ]:
+        Paragraph(text, custom[style])
+
+
+def shared_setup():
+    """Current implementation: reuse the process-wide service and copy static paragraphs"""
+    service = get_pdf_service()
+    for name in ('title', 'subtitle', 'summary_header', 'performance_header', 'questions_header'):
+        service._static(name)
+
+
+def main():
+    legacy = timeit.timeit(legacy_setup, number=REPEAT) / REPEAT
+    shared = timeit.timeit(shared_setup, number=REPEAT) / REPEAT
+    render = timeit.timeit(lambda: get_pdf_service().generate_quiz_attempt_pdf(ATTEMPT), number=50) / 50
+
+    print(f"{'setup':>10} {'per report us':>15}")
+    print(f"{'legacy':>10} {legacy * 1e6:>15.1f}")
+    print(f"{'shared':>10} {shared * 1e6:>15.1f}")
+    print(f"Summary-only render: {render * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-worker memory and start-up of the question repository
+
+Builds a synthetic bank and compares a repository that parses the Markdown
+into Python objects with one that maps the compiled question store. Python
+heap growth is what each gunicorn worker pays privately; the mapped file is
+shared between workers through the page cache. Run from the repository root:
+
+    python non_essential/testing/benchmarks/bench_question_store.py
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_markdown_parser import synthetic_bank
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+from src.quiz_app.repo.question_artifact import compile_question_bank
+
+SIZES = (5000, 50000)
+
+
+def measure(md_file, artifact_file):
+    """Start-up time and Python heap held by one repository"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    repo = MarkdownQuestionRepository(md_file=md_file, artifact_file=artifact_file)
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    repo.get_questions(45, 0)
+    return elapsed, held
+
+
+def main():
+    print(f"{'questions':>10} {'mode':>8} {'start-up s':>11} {'heap MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        md_file = Path(directory) / 'questions.md'
+        artifact_file = Path(directory) / 'questions.qbank'
+        for size in SIZES:
+            md_file.write_text(synthetic_bank(size), encoding='utf-8')
+            missing = Path(directory) / 'missing.qbank'
+            compile_question_bank(md_file, artifact_file)
+            for mode, artifact in (('parsed', missing), ('mapped', artifact_file)):
+                elapsed, held = measure(md_file, artifact)
+                print(f"{size:>10} {mode:>8} {elapsed:>11.3f} {held / 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark DatabaseService.get_user_stats against attempt history size
+
+Compares the previous load-every-row implementation with the single aggregate
+query. Run from the repository root:
+
+    python non_essential/testing/benchmarks/bench_user_stats.py
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from flask import Flask
+from src.quiz_app.models import db, User, QuizAttempt
+from src.quiz_app.services.database_service import DatabaseService
+
+SIZES = [100, 1000, 10000]
+REPEAT = 20
+
+
+def legacy_user_stats(user_id):
+    """Previous implementation: load all attempts and aggregate in Python"""
+    attempts = QuizAttempt.query.filter_by(user_id=user_id).all()
+    total_attempts = len(attempts)
+    average_score = sum(attempt.percentage for attempt in attempts) / total_attempts
+    best_score = max(attempt.percentage for attempt in attempts)
+    pro_attempts = len([a for a in attempts if a.is_pro_quiz])
+    return total_attempts, average_score, best_score, pro_attempts
+
+
+def seed_attempts(user_id, count):
+    """Insert `count` attempts for a user"""
+    db.session.bulk_insert_mappings(QuizAttempt, [
+        {
+            'user_id': user_id,
+            'question_count': 10,
+            'difficulty': 2,
+            'correct_answers': score // 10,
+            'total_questions': 10,
+            'percentage': float(score),
+            'is_pro_quiz': score % 2 == 0
+        }
+        for score in (random.randint(0, 100) for _ in range(count))
+    ])
+    db.session.commit()
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        service = DatabaseService()
+
+        print(f"{'attempts':>10} {'legacy ms':>12} {'aggregate ms':>14}")
+        for size in SIZES:
+            user = User(email=f'user{size}@example.com', name='Benchmark')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            seed_attempts(user_id, size)
+
+            legacy = timeit.timeit(lambda: legacy_user_stats(user_id), number=REPEAT) / REPEAT
+            aggregate = timeit.timeit(lambda: service.get_user_stats(user_id), number=REPEAT) / REPEAT
+            db.session.expunge_all()
+
+            print(f"{size:>10} {legacy * 1000:>12.2f} {aggregate * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
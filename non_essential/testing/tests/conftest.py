@@ -0,0 +1,23 @@
+"""
+Shared fixtures for service tests
+"""
+import pytest
+from flask import Flask
+from src.quiz_app.config import TestingConfig
+from src.quiz_app.models import db
+
+
+@pytest.fixture
+def app():
+    """Create a minimal application backed by in-memory SQLite"""
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,234 @@
+"""
+Tests for authenticated API endpoints backed by SQLite
+"""
+
+import pytest
+from src.quiz_app.models import db, Question, QuizAttempt
+from src.quiz_app.routes import api_bp
+from src.quiz_app.services.database_service import DatabaseService
+from src.quiz_app.services.pdf_service import get_pdf_service
+from src.quiz_app.services.quiz_service import QuizService
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client signed in as a seeded user"""
+    app.secret_key = 'test-secret'
+    app.register_blueprint(api_bp)
+    app.database_service = DatabaseService()
+    app.quiz_service = QuizService()
+    app.pdf_service = get_pdf_service()
+
+    for i in range(6):
+        db.session.add(Question(
+            question_id=i + 1,
+            question_text=f'Question {i + 1}',
+            options=['A', 'B', 'C', 'D'],
+            correct_answer=i % 4,
+            difficulty_level=2,
+            topic_category='Testing'
+        ))
+    user = app.database_service.create_user('learner@example.com', 'Learner')
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['is_authenticated'] = True
+        session['user_id'] = user.id
+        session['user_email'] = user.email
+        session['user_name'] = user.name
+        session['is_pro'] = True
+    return client
+
+
+def take_quiz(client, num_questions=4):
+    """Configure and submit a quiz answering the first option everywhere"""
+    config = client.post('/api/configure-quiz', json={'questionCount': num_questions, 'difficulty': 2}).get_json()
+    return client.post('/api/submit-quiz', json={
+        'quizToken': config['quizToken'],
+        'answers': [0] * len(config['questions'])
+    })
+
+
+def test_submit_quiz_with_token(client):
+    """Test a quiz is scored from its token and recorded for the user"""
+    response = take_quiz(client)
+    assert response.status_code == 200
+    assert response.get_json()['totalQuestions'] == 4
+
+    stats = client.get('/api/user/stats').get_json()['stats']
+    assert stats['total_attempts'] == 1
+
+
+def test_submit_quiz_rejects_unknown_token(client):
+    """Test submissions without a valid token are rejected"""
+    response = client.post('/api/submit-quiz', json={'quizToken': 'missing', 'answers': [0]})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('path', ['/api/user/stats', '/api/user/topic-analysis', '/api/user/quiz-history'])
+def test_analytics_etag_until_next_attempt(client, path):
+    """Test analytics answer 304 for repeat views and change after a new attempt"""
+    first = client.get(path)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    repeat = client.get(path, headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+
+    take_quiz(client)
+    updated = client.get(path, headers={'If-None-Match': etag})
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] != etag
+
+
+def test_dashboard_bootstrap(client):
+    """Test the dashboard endpoint returns every section in one response"""
+    take_quiz(client)
+
+    data = client.get('/api/user/dashboard').get_json()
+    assert data['user']['email'] == 'learner@example.com'
+    assert data['stats'] == client.get('/api/user/stats').get_json()['stats']
+    assert data['history'] == client.get('/api/user/quiz-history').get_json()['history']
+    assert data['topic_analysis'] == client.get('/api/user/topic-analysis').get_json()['topic_analysis']
+
+    stats_only = client.get('/api/user/dashboard?sections=stats').get_json()
+    assert set(stats_only) == {'success', 'authenticated', 'user', 'stats'}
+
+
+def test_dashboard_history_limit_clamped(client):
+    """Test the dashboard history limit is clamped like the history endpoint"""
+    for _ in range(2):
+        take_quiz(client)
+
+    assert len(client.get('/api/user/dashboard?sections=history&limit=0').get_json()['history']) == 1
+    assert len(client.get('/api/user/dashboard?sections=history&limit=100000').get_json()['history']) == 2
+
+
+def test_dashboard_requires_authentication(app, client):
+    """Test anonymous users are rejected"""
+    response = app.test_client().get('/api/user/dashboard')
+    assert response.status_code == 401
+    assert response.get_json()['authenticated'] is False
+
+
+def test_quiz_history_cursor_pagination(client):
+    """Test the history endpoint pages through attempts with next_cursor"""
+    for _ in range(3):
+        take_quiz(client)
+
+    first = client.get('/api/user/quiz-history?limit=2').get_json()
+    assert len(first['history']) == 2
+    assert first['next_cursor']
+
+    second = client.get(f"/api/user/quiz-history?limit=2&cursor={first['next_cursor']}").get_json()
+    assert len(second['history']) == 1
+    assert second['next_cursor'] is None
+    assert not {a['id'] for a in first['history']} & {a['id'] for a in second['history']}
+
+    assert client.get('/api/user/quiz-history?cursor=bogus').status_code == 400
+
+
+def test_attempt_pdf_cached_with_validators(app, client, tmp_path, monkeypatch):
+    """Test attempt reports are rendered once and revalidated with ETag"""
+    from src.quiz_app.services.pdf_cache import PDFReportCache
+    from src.quiz_app.services.pdf_service import PDFService
+
+    app.pdf_cache = PDFReportCache(tmp_path)
+    renders = []
+    original = PDFService.generate_quiz_attempt_pdf
+
+    def counting_render(self, *args, **kwargs):
+        renders.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(PDFService, 'generate_quiz_attempt_pdf', counting_render)
+    take_quiz(client)
+    attempt_id = QuizAttempt.query.first().id
+    path = f'/api/user/download-attempt-pdf/{attempt_id}'
+
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.data.startswith(b'%PDF')
+    assert first.headers['Last-Modified']
+    etag = first.headers['ETag']
+
+    second = client.get(path)
+    assert second.data == first.data
+    assert client.get(path, headers={'If-None-Match': etag}).status_code == 304
+    assert len(renders) == 1
+
+
+def test_attempt_pdf_job_status(app, client, tmp_path):
+    """Test PDF jobs are queued for the attempt owner and report completion"""
+    from src.quiz_app.services.job_service import PDFJobService
+    from src.quiz_app.services.pdf_cache import PDFReportCache
+
+    app.pdf_cache = PDFReportCache(tmp_path)
+    app.pdf_job_service = PDFJobService(app.pdf_cache, max_workers=0)
+    take_quiz(client)
+    attempt_id = QuizAttempt.query.first().id
+
+    job = client.post(f'/api/user/attempt-pdf-jobs/{attempt_id}').get_json()
+    assert job['job_id'] == app.pdf_cache.key(attempt_id)
+
+    status = client.get(job['status_url']).get_json()
+    assert status['status'] == 'done'
+    assert client.get(status['download_url']).data.startswith(b'%PDF')
+
+    assert client.get('/api/jobs/attempt-999-v1').status_code == 404
+    assert client.get('/api/jobs/not-a-job').status_code == 404
+
+
+def test_attempt_pdf_download_waits_for_job_in_flight(app, client, tmp_path, monkeypatch):
+    """Test downloads answer 202 while any worker is rendering the report"""
+    from src.quiz_app.services.job_service import PDFJobService
+    from src.quiz_app.services.pdf_cache import PDFReportCache
+    from src.quiz_app.services.pdf_service import PDFService
+
+    app.pdf_cache = PDFReportCache(tmp_path)
+    app.pdf_job_service = PDFJobService(app.pdf_cache, max_workers=0)
+    take_quiz(client)
+    attempt_id = QuizAttempt.query.first().id
+    path = f'/api/user/download-attempt-pdf/{attempt_id}'
+    app.pdf_cache.mark_pending(attempt_id)  # As if another worker queued it
+    monkeypatch.setattr(PDFService, 'generate_quiz_attempt_pdf', lambda *args: pytest.fail('rendered inline'))
+
+    response = client.get(path)
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job['job_id'] == app.pdf_cache.key(attempt_id)
+    assert client.get(job['status_url']).get_json()['status'] == 'pending'
+
+    app.pdf_cache.put(attempt_id, b'%PDF rendered')
+    app.pdf_cache.clear_pending(attempt_id)
+    assert client.get(job['status_url']).get_json()['status'] == 'done'
+    assert client.get(path).data == b'%PDF rendered'
+
+
+def test_export_attempts_zip(app, client, tmp_path):
+    """Test every attempt report is streamed in one ZIP archive"""
+    import io
+    import zipfile
+    from src.quiz_app.services.export_service import ReportExportService
+    from src.quiz_app.services.job_service import PDFJobService
+    from src.quiz_app.services.pdf_cache import PDFReportCache
+
+    app.pdf_cache = PDFReportCache(tmp_path)
+    app.pdf_job_service = PDFJobService(app.pdf_cache, max_workers=0)
+    app.export_service = ReportExportService(app.database_service, app.pdf_job_service, batch_size=2)
+    for _ in range(3):
+        take_quiz(client)
+    attempt_ids = sorted(a.id for a in QuizAttempt.query.all())
+
+    # One report is already cached; the others render during the export
+    app.pdf_cache.put(attempt_ids[0], b'%PDF cached')
+
+    response = client.get('/api/user/export-attempts')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert sorted(archive.namelist()) == sorted(f'quiz-attempt-{i}.pdf' for i in attempt_ids)
+    assert archive.read(f'quiz-attempt-{attempt_ids[0]}.pdf') == b'%PDF cached'
+    assert all(archive.read(name).startswith(b'%PDF') for name in archive.namelist())
@@ -0,0 +1,471 @@
+"""
+Tests for database service
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from src.quiz_app.migrations import upgrade
+from src.quiz_app.models import (
+    db, Question, QuizAttempt, QuizAttemptDetail, User,
+    UserStatsRollup, UserTopicRollup, UserTopicDailyRollup
+)
+from src.quiz_app.services.database_service import DatabaseService
+
+
+@pytest.fixture
+def db_service(app):
+    """Create database service seeded with a small question bank"""
+    service = DatabaseService()
+    for i in range(12):
+        db.session.add(Question(
+            question_id=i + 1,
+            question_text=f'Question {i + 1}',
+            options=['A', 'B', 'C', 'D'],
+            correct_answer=i % 4,
+            explanation=f'Explanation {i + 1}',
+            difficulty_level=(i % 3) + 1,
+            topic_category='Testing' if i % 2 else 'Snapshots'
+        ))
+    db.session.commit()
+    return service
+
+
+@pytest.fixture
+def user(db_service):
+    """Create a user to own quiz attempts"""
+    return db_service.create_user('learner@example.com', 'Learner')
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def record_attempt(db_service, user, answers, questions=None):
+    """Record an attempt answering the given questions with the given answers"""
+    questions = questions or Question.query.order_by(Question.id).limit(len(answers)).all()
+    questions_data = [
+        {'question': {'id': question.id}, 'user_answer': answer}
+        for question, answer in zip(questions, answers)
+    ]
+    correct = sum(1 for question, answer in zip(questions, answers) if answer == question.correct_answer)
+    return db_service.record_quiz_attempt(
+        user_id=user.id,
+        question_count=len(answers),
+        difficulty=2,
+        correct_answers=correct,
+        total_questions=len(answers),
+        percentage=round(correct / len(answers) * 100, 1),
+        is_pro_quiz=len(answers) > 10,
+        questions_data=questions_data
+    )
+
+
+def test_random_questions_filters(db_service):
+    """Test random questions respect difficulty and topic filters"""
+    questions = db_service.get_random_questions(10, difficulty_level=2, topic_category='Testing')
+
+    assert questions
+    assert all(q.difficulty_level == 2 for q in questions)
+    assert all(q.topic_category == 'Testing' for q in questions)
+    assert len(db_service.get_random_questions(5)) == 5
+
+
+def test_question_cache_avoids_database(app, db_service):
+    """Test the question bank is loaded once and then served from memory"""
+    db_service.get_random_questions(5)
+
+    # Questions removed behind the cache's back are still served until invalidation
+    Question.query.delete()
+    db.session.commit()
+    assert len(db_service.get_random_questions(5)) == 5
+
+    db_service.invalidate_question_cache()
+    assert db_service.get_random_questions(5) == []
+
+
+def test_invalidate_question_cache_reloads_bank(db_service):
+    """Test bumping the cache version picks up new questions"""
+    assert len(db_service.get_random_questions(50, topic_category='Models')) == 0
+
+    db.session.add(Question(
+        question_id=100, question_text='New question', options=['A', 'B'],
+        correct_answer=1, topic_category='Models'
+    ))
+    db.session.commit()
+    db_service.invalidate_question_cache()
+
+    questions = db_service.get_random_questions(50, topic_category='Models')
+    assert [q.question_text for q in questions] == ['New question']
+
+
+def test_random_questions_sampled_in_database(app, db_service):
+    """Test the uncached path samples in SQL and honours filters"""
+    app.config['QUESTION_CACHE_ENABLED'] = False
+
+    questions = db_service.get_random_questions(3, difficulty_level=1)
+    assert len(questions) == 3
+    assert all(q.difficulty_level == 1 for q in questions)
+    assert len({q.id for q in questions}) == 3
+
+    assert len(db_service.get_random_questions(50)) == 12
+    assert db_service.question_cache.is_fresh() is False
+
+
+def test_random_questions_sampled_by_id_without_sorting(app, db_service):
+    """Test uncached sampling looks up random ids instead of ordering rows by random()"""
+    app.config['QUESTION_CACHE_ENABLED'] = False
+
+    for _ in range(20):
+        with count_queries() as statements:
+            questions = db_service.get_random_questions(5)
+        assert len({q.id for q in questions}) == 5
+        assert not any('random()' in statement.lower() for statement in statements)
+
+
+def test_random_questions_sparse_range_falls_back(app, db_service, monkeypatch):
+    """Test a sample the id lookups cannot fill is topped up without repeats"""
+    from src.quiz_app.services import database_service as module
+
+    app.config['QUESTION_CACHE_ENABLED'] = False
+    monkeypatch.setattr(module, 'SAMPLE_MAX_IDS', 1)
+    monkeypatch.setattr(module, 'SAMPLE_ROUNDS', 1)
+
+    questions = db_service.get_random_questions(4, topic_category='Testing')
+    assert len({q.id for q in questions}) == 4
+    assert all(q.topic_category == 'Testing' for q in questions)
+
+
+def test_record_quiz_details_bulk(db_service, user):
+    """Test attempt details are written with a constant number of queries"""
+    questions = Question.query.order_by(Question.id).all()
+    answers = [q.correct_answer if i % 2 else None for i, q in enumerate(questions)]
+
+    with count_queries() as statements:
+        attempt = record_attempt(db_service, user, answers, questions)
+
+    details = QuizAttemptDetail.query.filter_by(quiz_attempt_id=attempt.id)\
+        .order_by(QuizAttemptDetail.question_number).all()
+    assert len(details) == len(questions)
+    assert [d.is_correct for d in details] == [bool(i % 2) for i in range(len(questions))]
+    assert len([s for s in statements if 'quiz_attempt_details' in s]) == 1
+    assert len([s for s in statements if 'FROM questions' in s]) == 1
+    assert not any(s.startswith('UPDATE quiz_attempts') for s in statements)
+
+
+def test_user_stats(db_service, user):
+    """Test user statistics are aggregated across attempts"""
+    assert db_service.get_user_stats(user.id) == {
+        'total_attempts': 0, 'average_score': 0, 'best_score': 0,
+        'pro_attempts': 0, 'free_attempts': 0
+    }
+
+    questions = Question.query.order_by(Question.id).all()
+    record_attempt(db_service, user, [q.correct_answer for q in questions])
+    record_attempt(db_service, user, [None, None, questions[2].correct_answer])
+
+    user_id = user.id
+    with count_queries() as statements:
+        stats = db_service.get_user_stats(user_id)
+
+    assert len(statements) == 1
+    assert stats == {
+        'total_attempts': 2, 'average_score': 66.7, 'best_score': 100.0,
+        'pro_attempts': 1, 'free_attempts': 1
+    }
+
+
+def test_rollups_maintained_on_record(db_service, user):
+    """Test recording attempts keeps rollups equal to a full recomputation"""
+    questions = Question.query.order_by(Question.id).all()
+    record_attempt(db_service, user, [q.correct_answer for q in questions])
+    record_attempt(db_service, user, [None, questions[1].correct_answer, 0, 0])
+    user_id = user.id
+
+    stats = db_service.get_user_stats(user_id)
+    topics = db_service.get_user_all_topic_performance(user_id)
+    assert stats == db_service._aggregate_user_stats(user_id)
+    assert {t['topic_category']: (t['total_attempted'], t['total_correct']) for t in topics} == {
+        topic: (attempted, correct)
+        for topic, attempted, correct, _ in db_service._aggregate_user_topic_performance(user_id)
+    }
+
+    UserStatsRollup.query.delete()
+    UserTopicRollup.query.delete()
+    db.session.commit()
+    assert db_service.rebuild_user_rollups() == 1
+    assert db_service.get_user_stats(user_id) == stats
+    assert db_service.get_user_all_topic_performance(user_id) == topics
+
+
+@pytest.fixture
+def legacy_attempts(app):
+    """A database at the baseline revision holding five attempts made before the rollup tables
+
+    Each attempt answered a Testing question correctly and a Snapshots question
+    wrongly, three days ago, scoring 0, 10, 20, 30 and 40 percent.
+    """
+    db.drop_all()
+    upgrade(db.engine, target='0001')
+    service = DatabaseService()
+    user = service.create_user('legacy@example.com', 'Legacy Learner')
+    questions = [
+        Question(question_id=i + 1, question_text=f'Question {i + 1}', options=['A', 'B'],
+                 correct_answer=0, difficulty_level=1, topic_category=topic)
+        for i, topic in enumerate(['Testing', 'Snapshots'])
+    ]
+    db.session.add_all(questions)
+    db.session.commit()
+
+    attempted_at = datetime.utcnow() - timedelta(days=3)
+    for percentage in (0.0, 10.0, 20.0, 30.0, 40.0):
+        attempt_id = db.session.execute(QuizAttempt.__table__.insert().values(
+            user_id=user.id, question_count=2, difficulty=1, correct_answers=1, total_questions=2,
+            percentage=percentage, is_pro_quiz=False, created_at=attempted_at
+        )).inserted_primary_key[0]
+        db.session.execute(QuizAttemptDetail.__table__.insert(), [
+            {'quiz_attempt_id': attempt_id, 'question_id': questions[0].id, 'question_number': 1,
+             'user_answer': 0, 'is_correct': True, 'created_at': attempted_at},
+            {'quiz_attempt_id': attempt_id, 'question_id': questions[1].id, 'question_number': 2,
+             'user_answer': 1, 'is_correct': False, 'created_at': attempted_at}
+        ])
+    db.session.commit()
+    return service, user, questions
+
+
+def test_upgrade_backfills_stats_rollup(legacy_attempts):
+    """Test stats stay whole when a user with older attempts submits after the upgrade"""
+    service, user, questions = legacy_attempts
+    upgrade(db.engine)
+
+    record_attempt(service, user, [q.correct_answer for q in questions], questions)
+
+    assert service.get_user_stats(user.id) == {
+        'total_attempts': 6, 'average_score': 33.3, 'best_score': 100.0,
+        'pro_attempts': 0, 'free_attempts': 6
+    }
+    assert service.get_user_stats(user.id) == service._aggregate_user_stats(user.id)
+
+
+def test_rollups_written_as_upserts(db_service, user):
+    """Test each rollup row is one INSERT ... ON CONFLICT, so first writes cannot race"""
+    questions = Question.query.order_by(Question.id).limit(2).all()
+    user_id = user.id
+
+    # Rows another submission created concurrently are added to, not re-inserted
+    db.session.add(UserStatsRollup(
+        user_id=user_id, total_attempts=1, pro_attempts=0, percentage_sum=50.0, best_score=50.0
+    ))
+    db.session.commit()
+
+    with count_queries() as statements:
+        record_attempt(db_service, user, [q.correct_answer for q in questions], questions)
+
+    rollup_writes = [s for s in statements if 'rollup' in s]
+    assert len(rollup_writes) == 5  # Stats, plus overall and daily rows for two topics
+    assert all(s.startswith('INSERT') and 'ON CONFLICT' in s for s in rollup_writes)
+    assert db_service.get_user_stats(user_id)['total_attempts'] == 2
+    assert db_service.get_user_stats(user_id)['best_score'] == 100.0
+
+
+def test_user_stats_read_from_rollup(db_service, user):
+    """Test dashboard stats are a single-row lookup once the rollup exists"""
+    record_attempt(db_service, user, [0, 1, 2])
+    user_id = user.id
+
+    with count_queries() as statements:
+        db_service.get_user_stats(user_id)
+
+    assert len(statements) == 1
+    assert 'user_stats_rollup' in statements[0]
+
+
+def test_dashboard_matches_sections_and_skips_empty_reads(db_service, user):
+    """Test the dashboard equals its sections and only reads stats for a user without attempts"""
+    user_id = user.id
+    with count_queries() as statements:
+        dashboard = db_service.get_user_dashboard(user_id)
+
+    assert dashboard['stats']['total_attempts'] == 0
+    assert dashboard['history'] == []
+    assert dashboard['topic_analysis'] == db_service.get_user_topic_analysis(user_id)
+    assert sum('FROM quiz_attempts' in s for s in statements) == 1  # The stats aggregate only
+    assert not any('user_topic_daily_rollup' in s for s in statements)
+
+    record_attempt(db_service, user, [0, 1, 2])
+    dashboard = db_service.get_user_dashboard(user_id, history_limit=5)
+
+    assert dashboard['stats'] == db_service.get_user_stats(user_id)
+    assert dashboard['topic_analysis'] == db_service.get_user_topic_analysis(user_id)
+    assert dashboard['history'] == [a.to_dict() for a in db_service.get_user_quiz_history(user_id, 5)]
+
+
+def test_topic_analysis_uses_daily_buckets(app, db_service, user):
+    """Test the analysis window sums daily buckets and ignores older attempts"""
+    questions = Question.query.order_by(Question.id).all()
+    old_attempt = record_attempt(db_service, user, [q.correct_answer for q in questions])
+    record_attempt(db_service, user, [(q.correct_answer + 1) % 4 for q in questions[:4]])
+    user_id = user.id
+
+    # Move the first attempt outside the 10-day window and rebuild its buckets
+    old_attempt.created_at = datetime.utcnow() - timedelta(days=30)
+    db.session.commit()
+    db_service.rebuild_user_rollups(user_id)
+
+    with count_queries() as statements:
+        analysis = db_service.get_user_topic_analysis(user_id)
+
+    assert not any('quiz_attempt_details' in s for s in statements)
+    attempted = {t['topic_category']: t for t in analysis['weak_areas'] if not t.get('unattended')}
+    assert {t: (a['total_attempted'], a['total_correct']) for t, a in attempted.items()} == {
+        'Snapshots': (2, 0), 'Testing': (2, 0)
+    }
+    assert analysis['strengths'] == []
+
+    # A wider window includes the older, fully correct attempt
+    analysis = db_service.get_user_topic_analysis(user_id, window_days=60)
+    assert {t['topic_category']: t['total_correct'] for t in analysis['strengths']} == {
+        'Snapshots': 6, 'Testing': 6
+    }
+    assert UserTopicDailyRollup.query.filter_by(user_id=user_id).count() == 4
+
+
+def test_topic_analysis_inactive_user_skips_raw_join(db_service, user):
+    """Test a user whose buckets all predate the window gets no raw details join"""
+    questions = Question.query.order_by(Question.id).all()
+    record_attempt(db_service, user, [q.correct_answer for q in questions])
+    user_id = user.id
+
+    UserTopicDailyRollup.query.update({
+        UserTopicDailyRollup.bucket_date: datetime.utcnow().date() - timedelta(days=30)
+    })
+    db.session.commit()
+
+    with count_queries() as statements:
+        analysis = db_service.get_user_topic_analysis(user_id)
+
+    assert not any('quiz_attempt_details' in s for s in statements)
+    assert analysis['strengths'] == []
+    assert all(t.get('unattended') for t in analysis['weak_areas'])
+
+
+def test_upgrade_backfills_daily_topic_buckets(legacy_attempts):
+    """Test the analysis window keeps attempts made before the bucket table existed"""
+    service, user, questions = legacy_attempts
+    upgrade(db.engine)
+
+    record_attempt(service, user, [q.correct_answer for q in questions], questions)
+    analysis = service.get_user_topic_analysis(user.id)
+
+    assert [(t['topic_category'], t['total_attempted'], t['total_correct']) for t in analysis['strengths']] == [
+        ('Testing', 6, 6)
+    ]
+    assert [(t['topic_category'], t['total_attempted'], t['total_correct']) for t in analysis['weak_areas']] == [
+        ('Snapshots', 6, 1)
+    ]
+    assert UserTopicDailyRollup.query.filter_by(user_id=user.id).count() == 4
+
+
+def test_quiz_history_keyset_pages(db_service, user):
+    """Test history pages walk every attempt once, newest first, including timestamp ties"""
+    user_id = user.id
+    # Attempts recorded within the same second share their server-default timestamp
+    for i in range(7):
+        assert db_service.record_quiz_attempt(user_id, 10, 2, i, 10, i * 10.0)
+    expected = [a.id for a in QuizAttempt.query.order_by(
+        QuizAttempt.created_at.desc(), QuizAttempt.id.desc()
+    )]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        with count_queries() as statements:
+            attempts, cursor = db_service.get_user_quiz_history_page(user_id, limit=3, cursor=cursor)
+        assert len(statements) == 1
+        seen.extend(a.id for a in attempts)
+        pages += 1
+        if cursor is None or pages > 3:
+            break
+
+    assert seen == expected
+    assert pages == 3
+
+
+def test_iter_user_attempt_pages(db_service, user, monkeypatch):
+    """Test attempt pages cover the whole history with details, and errors propagate"""
+    record_attempt(db_service, user, [0, 1])
+    for i in range(4):
+        assert db_service.record_quiz_attempt(user.id, 10, 2, i, 10, i * 10.0)
+    expected = [a.id for a in QuizAttempt.query.order_by(
+        QuizAttempt.created_at.desc(), QuizAttempt.id.desc()
+    )]
+
+    pages = list(db_service.iter_user_attempt_pages(user.id, page_size=2))
+
+    assert [len(attempts) for attempts, _ in pages] == [2, 2, 1]
+    assert [a.id for attempts, _ in pages for a in attempts] == expected
+    assert len(pages[-1][1][expected[-1]]) == 2
+
+    def fail(*args):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(db_service, '_query_quiz_history_page', fail)
+    with pytest.raises(RuntimeError):
+        list(db_service.iter_user_attempt_pages(user.id, page_size=2))
+
+
+def test_quiz_history_rejects_bad_cursor(db_service, user):
+    """Test malformed cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        db_service.get_user_quiz_history_page(user.id, cursor='not-a-cursor')
+
+
+def test_attempt_details_without_snapshot_eager_load(db_service, user):
+    """Test attempts recorded before snapshots are hydrated with their questions in one join"""
+    questions = Question.query.order_by(Question.id).all()
+    attempt = record_attempt(db_service, user, [q.correct_answer for q in questions])
+    attempt.details_snapshot = None
+    db.session.commit()
+    attempt_id = attempt.id
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        details = db_service.get_quiz_attempt_details(attempt_id)
+
+    assert len(statements) == 2
+    assert 'JOIN questions' in statements[1]
+    assert [d['question_number'] for d in details] == list(range(1, 13))
+    assert all(d['question_text'] and d['options'] for d in details)
+    assert all(d['correct_answer'] == d['user_answer'] for d in details)
+
+
+def test_attempt_details_served_from_snapshot(db_service, user):
+    """Test finished attempts are read from their snapshot, unaffected by later question edits"""
+    questions = Question.query.order_by(Question.id).all()
+    attempt = record_attempt(db_service, user, [q.correct_answer for q in questions[:3]])
+    attempt_id = attempt.id
+    expected = db_service.get_quiz_attempt_details(attempt_id)
+
+    questions[0].question_text = 'Edited after the attempt'
+    db.session.commit()
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        details = db_service.get_quiz_attempt_details(attempt_id)
+
+    assert len(statements) == 1
+    assert 'quiz_attempt_details' not in statements[0] and 'questions' not in statements[0]
+    assert details == expected
+    assert details[0]['question_text'] == 'Question 1'
+    assert [d['is_correct'] for d in details] == [True, True, True]
@@ -0,0 +1,114 @@
+"""
+Tests for the streamed ZIP export of attempt reports
+"""
+import io
+import zipfile
+
+import pytest
+from src.quiz_app.models import db, Question
+from src.quiz_app.services.database_service import DatabaseService
+from src.quiz_app.services.export_service import ERRORS_ENTRY, ReportExportService, report_name
+from src.quiz_app.services.job_service import PDFJobService
+from src.quiz_app.services.pdf_cache import PDFReportCache
+
+
+@pytest.fixture
+def db_service(app):
+    """Create database service with a user who took five quizzes"""
+    service = DatabaseService()
+    for i in range(4):
+        db.session.add(Question(
+            question_id=i + 1,
+            question_text=f'Question {i + 1}',
+            options=['A', 'B', 'C', 'D'],
+            correct_answer=0,
+            difficulty_level=1,
+            topic_category='Testing'
+        ))
+    db.session.commit()
+
+    user = service.create_user('learner@example.com', 'Learner')
+    questions_data = [
+        {'question': {'id': question.id}, 'user_answer': 0}
+        for question in Question.query.order_by(Question.id)
+    ]
+    for _ in range(5):
+        service.record_quiz_attempt(user.id, 4, 1, 4, 4, 100.0, questions_data=questions_data)
+    service.user_id = user.id
+    return service
+
+
+@pytest.fixture
+def export_service(db_service, tmp_path):
+    """Create an export service rendering inline in pages of two attempts"""
+    jobs = PDFJobService(PDFReportCache(tmp_path), max_workers=0)
+    return ReportExportService(db_service, jobs, batch_size=2)
+
+
+def read_archive(export_service, user_id):
+    """Run an export to completion and open the resulting archive"""
+    return zipfile.ZipFile(io.BytesIO(b''.join(export_service.stream_user_reports(user_id))))
+
+
+def test_export_contains_every_attempt(db_service, export_service):
+    """Test every attempt is exported once with its questions"""
+    archive = read_archive(export_service, db_service.user_id)
+
+    assert len(archive.namelist()) == 5
+    assert len(set(archive.namelist())) == 5
+    assert all(archive.read(name).startswith(b'%PDF') for name in archive.namelist())
+    assert export_service.pdf_job_service.pdf_cache.get(1) is not None
+
+
+def test_export_lists_failed_renders(db_service, export_service, monkeypatch):
+    """Test reports that fail to render are named in the errors entry"""
+    original = ReportExportService.iter_attempts
+
+    def iter_attempts(self, user_id):
+        for attempt_data, questions_data in original(self, user_id):
+            if attempt_data['id'] == 3:
+                attempt_data = dict(attempt_data, created_at='not a date')
+            yield attempt_data, questions_data
+
+    monkeypatch.setattr(ReportExportService, 'iter_attempts', iter_attempts)
+    archive = read_archive(export_service, db_service.user_id)
+
+    assert report_name(3) not in archive.namelist()
+    assert len(archive.namelist()) == 5  # Four reports and the errors entry
+    assert archive.read(ERRORS_ENTRY).decode().startswith(f'{report_name(3)}: ')
+
+
+def test_export_propagates_database_errors(db_service, export_service, monkeypatch):
+    """Test a failed detail query aborts the export instead of dropping questions"""
+    def fail(attempt_ids):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(db_service, '_query_quiz_attempt_details', fail)
+
+    with pytest.raises(RuntimeError):
+        b''.join(export_service.stream_user_reports(db_service.user_id))
+
+
+def test_export_stops_when_cursor_does_not_advance(db_service, export_service, monkeypatch):
+    """Test a repeated page ends the export instead of looping"""
+    first_page = db_service._query_quiz_history_page(db_service.user_id, 2, None)
+    monkeypatch.setattr(db_service, '_query_quiz_history_page', lambda *args: first_page)
+
+    archive = read_archive(export_service, db_service.user_id)
+
+    assert sorted(archive.namelist()) == sorted(report_name(a.id) for a in first_page[0])
+
+
+def test_export_stops_at_time_limit(db_service, export_service, monkeypatch):
+    """Test an export past its time limit closes a valid archive naming what it skipped"""
+    from types import SimpleNamespace
+    from src.quiz_app.services import export_service as module
+
+    clock = iter([0, 0, 0, 0, 200])
+    monkeypatch.setattr(module, 'time', SimpleNamespace(monotonic=lambda: next(clock)))
+    export_service.time_limit = 100
+
+    archive = read_archive(export_service, db_service.user_id)
+
+    assert len(archive.namelist()) == 4  # Three reports and the errors entry
+    assert 'export again to continue' in archive.read(ERRORS_ENTRY).decode()
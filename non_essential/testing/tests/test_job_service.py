@@ -0,0 +1,97 @@
+"""
+Tests for background PDF jobs
+"""
+import os
+import time
+
+from src.quiz_app.services.job_service import PDFJobService
+from src.quiz_app.services.pdf_cache import PDFReportCache
+
+ATTEMPT = {
+    'id': 9, 'created_at': '2026-01-01T12:00:00', 'total_questions': 1, 'correct_answers': 1,
+    'percentage': 100.0, 'is_pro_quiz': False, 'difficulty': 1
+}
+QUESTIONS = [
+    {'question_number': 1, 'question_text': 'What is dbt?', 'options': ['A tool', 'A database'],
+     'user_answer': 0, 'is_correct': True, 'correct_answer': 0}
+]
+
+
+def test_inline_job_renders_into_cache(tmp_path):
+    """Test a job renders the report into the cache and reuses its id"""
+    cache = PDFReportCache(tmp_path)
+    jobs = PDFJobService(cache, max_workers=0)
+
+    job_id = jobs.submit_attempt_report(ATTEMPT, QUESTIONS)
+
+    assert job_id == cache.key(9)
+    assert jobs.status(job_id) == {'status': 'done'}
+    assert cache.get(9) is not None
+    assert jobs.submit_attempt_report(ATTEMPT, QUESTIONS) == job_id
+
+
+def test_failed_job_reports_error(tmp_path):
+    """Test render failures surface as failed jobs and can be retried"""
+    jobs = PDFJobService(PDFReportCache(tmp_path), max_workers=0)
+
+    job_id = jobs.submit_attempt_report(dict(ATTEMPT, created_at='not a date'), QUESTIONS)
+
+    assert jobs.status(job_id) == {'status': 'failed', 'error': 'Failed to generate PDF'}
+    assert not jobs.pdf_cache.is_pending(9)
+    jobs.submit_attempt_report(ATTEMPT, QUESTIONS)
+    assert jobs.status(job_id) == {'status': 'done'}
+
+
+def test_unknown_job_uses_shared_cache(tmp_path):
+    """Test jobs queued by another worker are reported from the shared cache"""
+    cache = PDFReportCache(tmp_path)
+    jobs = PDFJobService(cache, max_workers=0)
+
+    assert jobs.status(cache.key(9)) == {'status': 'unknown'}
+    cache.put(9, b'%PDF report')
+    assert jobs.status(cache.key(9)) == {'status': 'done'}
+
+
+def test_job_in_flight_is_shared_between_workers(tmp_path):
+    """Test a job queued by one worker is pending for, and not re-queued by, another"""
+    cache = PDFReportCache(tmp_path)
+    worker = PDFJobService(cache, max_workers=0)
+    other = PDFJobService(PDFReportCache(tmp_path), max_workers=0)
+
+    assert cache.mark_pending(9)  # Claimed by a render still in progress
+    assert other.status(cache.key(9)) == {'status': 'pending'}
+    assert worker.submit_attempt_report(ATTEMPT, QUESTIONS) == cache.key(9)
+    assert cache.get(9) is None
+
+    cache.clear_pending(9)
+    worker.submit_attempt_report(ATTEMPT, QUESTIONS)
+    assert not cache.is_pending(9)
+    assert other.status(cache.key(9)) == {'status': 'done'}
+
+
+def test_abandoned_pending_marker_expires(tmp_path):
+    """Test a marker left by a worker that died is ignored and can be reclaimed"""
+    cache = PDFReportCache(tmp_path, pending_timeout=60)
+    assert cache.mark_pending(9)
+    assert not cache.mark_pending(9)
+
+    stale = time.time() - 120
+    os.utime(cache.pending_path(9), (stale, stale))
+    assert not cache.is_pending(9)
+    assert cache.mark_pending(9)
+    assert cache.is_pending(9)
+
+
+def test_process_pool_job(tmp_path):
+    """Test a job renders in a spawned pool process"""
+    cache = PDFReportCache(tmp_path)
+    jobs = PDFJobService(cache, max_workers=1)
+    try:
+        job_id = jobs.submit_attempt_report(ATTEMPT, QUESTIONS)
+        jobs._jobs[job_id].result(timeout=60)
+
+        assert jobs.status(job_id) == {'status': 'done'}
+        with open(cache.get(9), 'rb') as f:
+            assert f.read().startswith(b'%PDF')
+    finally:
+        jobs.shutdown()
@@ -0,0 +1,127 @@
+"""
+Tests for the single-pass Markdown question parser
+"""
+import logging
+
+from src.quiz_app.repo.markdown_parser import ParseError, parse_questions, split_blocks
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+
+SAMPLE = """# dbt Certification Questions
+
+# Question 7
+**Topic:** DAG Execution
+**Difficulty:** 2 (Medium)
+
+**Scenario:**
+You run:
+```
+dbt build --select B_customer_dim
+   ```
+
+**Question:**
+What is the execution order?
+
+**Options:**
+A. Upstream first
+B. Only the selected model
+C. Tests only
+D. Seeds only
+
+**Correct Answer:** A
+
+**Explanation:**
+dbt builds the upstream chain first.
+
+---
+
+# Question 3
+**Topic:** Commands
+**Difficulty:** 3 (Difficult)
+
+**Scenario:**
+Which flag rebuilds incremental models?
+
+**Options:**
+A. `--full-refresh`
+B. `--defer`
+
+**Correct Answer:** a
+
+**Explanation:**
+Only incremental models are rebuilt.
+"""
+
+
+def test_parse_questions():
+    """Test every field of each question is extracted in file order"""
+    questions, errors = parse_questions(SAMPLE)
+
+    assert errors == []
+    assert questions == [
+        {
+            'id': 1,
+            'question': 'You run:\n```\ndbt build --select B_customer_dim\n```\n\nWhat is the execution order?',
+            'options': ['Upstream first', 'Only the selected model', 'Tests only', 'Seeds only'],
+            'correct_answer': 1,
+            'explanation': 'dbt builds the upstream chain first.\n\n---',
+            'topic': 'DAG Execution',
+            'difficulty': 2
+        },
+        {
+            'id': 2,
+            'question': 'Which flag rebuilds incremental models?',
+            'options': ['`--full-refresh`', '`--defer`'],
+            'correct_answer': 1,
+            'explanation': 'Only incremental models are rebuilt.',
+            'topic': 'Commands',
+            'difficulty': 3
+        }
+    ]
+
+
+def test_split_blocks_records_header_lines():
+    """Test blocks are numbered by position and located by their header line"""
+    blocks = split_blocks(SAMPLE.split('\n'))
+
+    assert [(block.question_id, block.line) for block in blocks] == [(1, 3), (2, 29)]
+    assert blocks[0].lines[:2] == ['', '**Topic:** DAG Execution']
+
+
+def test_parse_errors_have_line_numbers():
+    """Test malformed fields are reported at their line and fall back to defaults"""
+    content = (
+        "# Question 1\n"
+        "**Difficulty:** hard\n"
+        "\n"
+        "**Scenario:**\n"
+        "What is dbt?\n"
+        "\n"
+        "**Options:**\n"
+        "A. A tool\n"
+        "\n"
+        "**Correct Answer:** Z\n"
+    )
+
+    questions, errors = parse_questions(content)
+
+    assert questions[0]['difficulty'] == 2
+    assert questions[0]['correct_answer'] == 1
+    assert errors == [
+        ParseError(1, 1, 'Missing **Topic:**'),
+        ParseError(2, 1, 'Missing difficulty number, using 2'),
+        ParseError(7, 1, 'Expected at least 2 options, found 1'),
+        ParseError(10, 1, "Unrecognized correct answer 'Z', using A")
+    ]
+
+
+def test_repository_logs_parse_errors(tmp_path, caplog):
+    """Test the repository logs parse errors with file and line instead of printing"""
+    md_file = tmp_path / 'questions.md'
+    md_file.write_text(SAMPLE.replace('**Correct Answer:** a', ''), encoding='utf-8')
+
+    with caplog.at_level(logging.WARNING):
+        repo = MarkdownQuestionRepository(md_file=md_file)
+
+    assert repo.parse_errors == [ParseError(29, 2, 'Missing **Correct Answer:**, using A')]
+    assert f"{md_file}:29: Question 2: Missing **Correct Answer:**, using A" in caplog.text
+    assert repo.get_question_stats()['total'] == 2
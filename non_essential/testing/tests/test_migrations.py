@@ -0,0 +1,67 @@
+"""
+Tests for versioned schema migrations
+"""
+import pytest
+from sqlalchemy import create_engine, inspect
+from src.quiz_app.migrations import REVISIONS, applied_versions, pending_revisions, upgrade
+from src.quiz_app.models import db
+
+
+@pytest.fixture
+def engine():
+    """Create an empty in-memory SQLite database"""
+    engine = create_engine('sqlite://')
+    yield engine
+    engine.dispose()
+
+
+def schema_of(engine):
+    """Describe tables, columns and index names of a live database"""
+    inspector = inspect(engine)
+    return {
+        table: (
+            {column['name'] for column in inspector.get_columns(table)},
+            {index['name'] for index in inspector.get_indexes(table)}
+        )
+        for table in inspector.get_table_names() if table != 'schema_migrations'
+    }
+
+
+def test_migrations_match_models(engine):
+    """Test replaying every revision yields the schema declared by the models"""
+    applied = upgrade(engine)
+
+    assert applied == [revision.version for revision in REVISIONS]
+    assert schema_of(engine) == {
+        table.name: (
+            {column.name for column in table.columns},
+            {index.name for index in table.indexes}
+        )
+        for table in db.metadata.sorted_tables
+    }
+
+
+def test_upgrade_is_idempotent(engine):
+    """Test a second upgrade applies nothing"""
+    upgrade(engine)
+
+    assert upgrade(engine) == []
+    assert pending_revisions(engine) == []
+
+
+def test_upgrade_stops_at_target(engine):
+    """Test upgrading to a target leaves later revisions pending"""
+    assert upgrade(engine, target='0001') == ['0001']
+    assert 'user_stats_rollup' not in inspect(engine).get_table_names()
+    assert [revision.version for revision in pending_revisions(engine)] == ['0002', '0003', '0004', '0005']
+
+
+def test_upgrade_adopts_create_all_database(engine):
+    """Test databases created by db.create_all() are adopted in place"""
+    db.metadata.create_all(engine)
+    before = schema_of(engine)
+
+    upgrade(engine)
+
+    assert schema_of(engine) == before
+    assert applied_versions(engine) == {revision.version for revision in REVISIONS}
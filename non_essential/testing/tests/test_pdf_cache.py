@@ -0,0 +1,50 @@
+"""
+Tests for the on-disk PDF report cache
+"""
+import os
+import time
+
+from src.quiz_app.services.pdf_cache import PDFReportCache
+
+
+def test_put_and_get(tmp_path):
+    """Test reports round-trip and are keyed by template version"""
+    cache = PDFReportCache(tmp_path, template_version=1)
+    assert cache.get(7) is None
+
+    path = cache.put(7, b'%PDF-1 report')
+    assert cache.get(7) == path
+    with open(path, 'rb') as f:
+        assert f.read() == b'%PDF-1 report'
+
+    assert PDFReportCache(tmp_path, template_version=2).get(7) is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_least_recently_used_reports_are_evicted(tmp_path):
+    """Test the cache stays within max_bytes by dropping the least recently read report"""
+    cache = PDFReportCache(tmp_path, max_bytes=250)
+    cache.put(1, b'x' * 100)
+    cache.put(2, b'x' * 100)
+
+    # Age both files, then read attempt 1 so attempt 2 becomes least recently used
+    for attempt_id in (1, 2):
+        os.utime(cache.path(attempt_id), (time.time() - 60, time.time() - 60))
+    cache.get(1)
+    cache.put(3, b'x' * 100)
+
+    assert cache.get(1) is not None
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+
+
+def test_get_keeps_modification_time(tmp_path):
+    """Test hits do not change the time served as Last-Modified"""
+    cache = PDFReportCache(tmp_path)
+    path = cache.put(1, b'report')
+    os.utime(path, (1000, 1000))
+
+    cache.get(1)
+
+    assert os.stat(path).st_mtime == 1000
+    assert os.stat(path).st_atime > 1000
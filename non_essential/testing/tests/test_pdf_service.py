@@ -0,0 +1,42 @@
+"""
+Tests for PDF report generation
+"""
+import tempfile
+
+import pytest
+from src.quiz_app.services.pdf_service import PDFService, get_pdf_service
+
+ATTEMPT = {
+    'id': 3, 'created_at': '2026-01-01T12:00:00', 'total_questions': 2, 'correct_answers': 1,
+    'percentage': 50.0, 'is_pro_quiz': True, 'difficulty': 2
+}
+QUESTIONS = [
+    {'question_number': 1, 'question_text': 'What is dbt?', 'options': ['A tool', 'A database'],
+     'user_answer': 0, 'is_correct': True, 'correct_answer': 0, 'explanation': 'It transforms data.'},
+    {'question_number': 2, 'question_text': 'What is a model?', 'options': ['SQL', 'YAML'],
+     'user_answer': None, 'is_correct': False, 'correct_answer': 0},
+]
+
+
+def test_render_in_memory(monkeypatch):
+    """Test reports are rendered without creating temporary files"""
+    def no_temp_files(*args, **kwargs):
+        pytest.fail('PDF rendering touched the filesystem')
+
+    monkeypatch.setattr(tempfile, 'NamedTemporaryFile', no_temp_files)
+    monkeypatch.setattr(tempfile, 'mkstemp', no_temp_files)
+
+    pdf = PDFService().generate_quiz_attempt_pdf(ATTEMPT, QUESTIONS)
+
+    assert pdf.startswith(b'%PDF')
+    assert pdf.rstrip().endswith(b'%%EOF')
+
+
+def test_shared_service_and_styles():
+    """Test the service is a process-wide singleton built on shared styles"""
+    service = get_pdf_service()
+
+    assert get_pdf_service() is service
+    assert PDFService().title_style is service.title_style
+    assert service._static('title') is not service._static('title')
+    assert get_pdf_service().generate_quiz_attempt_pdf(ATTEMPT, QUESTIONS).startswith(b'%PDF')
@@ -0,0 +1,170 @@
+"""
+EXPLAIN-based regression tests for dashboard query plans
+
+The SQLite check always runs against a small dataset. The PostgreSQL check
+seeds 100k attempts with 1M attempt details and only runs when
+EXPLAIN_TEST_DATABASE_URL points at a disposable PostgreSQL database, e.g.
+
+    EXPLAIN_TEST_DATABASE_URL=postgresql://localhost/quiz_explain pytest test_query_plans.py
+
+The questions table is deliberately not checked: it is bounded by the size of
+the question bank and is read in full when the question cache loads.
+"""
+import os
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from src.quiz_app.config import TestingConfig
+from src.quiz_app.models import db, Question, QuizAttempt
+from src.quiz_app.services.database_service import DatabaseService
+
+# Tables that grow with usage and must always be reached through an index
+LARGE_TABLES = {
+    'quiz_attempts', 'quiz_attempt_details',
+    'user_stats_rollup', 'user_topic_rollup', 'user_topic_daily_rollup'
+}
+
+
+@contextmanager
+def capture_selects():
+    """Capture the SELECT statements and parameters executed inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def run_dashboard_queries(service, user_id, attempt_id):
+    """Run every dashboard read path, including the pre-backfill fallbacks"""
+    service.get_user_dashboard(user_id)
+    service.get_user_all_topic_performance(user_id)
+    service.get_quiz_attempt_details(attempt_id)
+    service._aggregate_user_stats(user_id)
+    service._aggregate_user_topic_performance(user_id)
+    _, cursor = service.get_user_quiz_history_page(user_id, limit=2)
+    service.get_user_quiz_history_page(user_id, limit=2, cursor=cursor)
+
+
+def explain(prefix, statement, parameters):
+    """EXPLAIN a captured statement with its original driver parameters"""
+    with db.engine.connect() as connection:
+        return connection.exec_driver_sql(f'{prefix} {statement}', parameters).fetchall()
+
+
+def test_sqlite_dashboard_queries_use_indexes(app):
+    """Test no dashboard query scans a large table on SQLite"""
+    service = DatabaseService()
+    for i in range(20):
+        db.session.add(Question(
+            question_id=i + 1, question_text=f'Q{i}', options=['A', 'B'],
+            correct_answer=0, topic_category=f'Topic {i % 4}'
+        ))
+    user = service.create_user('plan@example.com', 'Plan')
+    for _ in range(5):
+        service.record_quiz_attempt(
+            user.id, 4, 2, 2, 4, 50.0,
+            questions_data=[{'question': {'id': i + 1}, 'user_answer': 0} for i in range(4)]
+        )
+    user_id = user.id
+    attempt_id = QuizAttempt.query.first().id
+
+    with capture_selects() as statements:
+        run_dashboard_queries(service, user_id, attempt_id)
+
+    scans = []
+    for statement, parameters in statements:
+        for row in explain('EXPLAIN QUERY PLAN', statement, parameters):
+            detail = row[-1]
+            words = detail.split()
+            if words[:1] == ['SCAN'] and len(words) > 1 and words[1] in LARGE_TABLES:
+                scans.append((detail, statement))
+
+    assert statements
+    assert scans == []
+
+
+def find_seq_scans(plan):
+    """Collect Seq Scan nodes on large tables from a JSON EXPLAIN plan"""
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in LARGE_TABLES:
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+SEED_SQL = [
+    "INSERT INTO users (email, name, is_pro, created_at, updated_at) "
+    "SELECT 'user' || g || '@example.com', 'User ' || g, true, now(), now() "
+    "FROM generate_series(1, 5000) g",
+
+    "INSERT INTO questions (question_id, question_text, options, correct_answer, "
+    "difficulty_level, topic_category, is_active, created_at, updated_at) "
+    "SELECT g, 'Question ' || g, '[\"A\", \"B\", \"C\", \"D\"]', g % 4, (g % 3) + 1, "
+    "'Topic ' || (g % 12), true, now(), now() FROM generate_series(1, 500) g",
+
+    "INSERT INTO quiz_attempts (user_id, question_count, difficulty, correct_answers, "
+    "total_questions, percentage, is_pro_quiz, created_at) "
+    "SELECT (g % 5000) + 1, 10, 2, g % 11, 10, (g % 11) * 10.0, g % 2 = 0, "
+    "now() - (g % 365) * interval '1 day' FROM generate_series(1, 100000) g",
+
+    "INSERT INTO quiz_attempt_details (quiz_attempt_id, question_id, question_number, "
+    "user_answer, is_correct, created_at) "
+    "SELECT a, ((a * 10 + n) % 500) + 1, n, n % 4, (a + n) % 3 = 0, now() "
+    "FROM generate_series(1, 100000) a, generate_series(1, 10) n",
+]
+
+
+@pytest.fixture
+def postgres_app():
+    """Create an application on the opt-in PostgreSQL database with 1M detail rows"""
+    url = os.environ.get('EXPLAIN_TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('EXPLAIN_TEST_DATABASE_URL is not set')
+
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        with db.engine.begin() as connection:
+            for statement in SEED_SQL:
+                connection.exec_driver_sql(statement)
+        DatabaseService().rebuild_user_rollups()
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.exec_driver_sql('ANALYZE')
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_postgres_dashboard_queries_avoid_seq_scans(postgres_app):
+    """Test no dashboard query plans a Seq Scan on a large table on PostgreSQL"""
+    service = DatabaseService()
+    user_id = 42
+    attempt_id = QuizAttempt.query.filter_by(user_id=user_id).first().id
+
+    with capture_selects() as statements:
+        run_dashboard_queries(service, user_id, attempt_id)
+
+    scans = []
+    for statement, parameters in statements:
+        plan = explain('EXPLAIN (FORMAT JSON)', statement, parameters)[0][0]
+        for relation in find_seq_scans(plan[0]['Plan']):
+            scans.append((relation, statement))
+
+    assert statements
+    assert scans == []
@@ -0,0 +1,99 @@
+"""
+Tests for the precompiled question bank artifact
+"""
+import pytest
+from src.quiz_app.repo import markdown_repository
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+from src.quiz_app.repo.question_artifact import compile_question_bank, default_artifact_path
+
+QUESTION = """# Question {number}
+**Topic:** {topic}
+**Difficulty:** 1 (Easy)
+
+**Scenario:**
+What does `dbt {command}` do?
+
+**Options:**
+A. Runs {command}
+B. Nothing
+
+**Correct Answer:** A
+
+**Explanation:**
+It runs {command}.
+"""
+
+
+@pytest.fixture
+def md_file(tmp_path):
+    """Write a small question bank"""
+    md_file = tmp_path / 'questions.md'
+    md_file.write_text(
+        QUESTION.format(number=1, topic='Commands', command='run')
+        + QUESTION.format(number=2, topic='Testing', command='test'),
+        encoding='utf-8'
+    )
+    return md_file
+
+
+def track_parsing(monkeypatch):
+    """Record every Markdown parse done by the repository"""
+    calls = []
+    parse_questions = markdown_repository.parse_questions
+
+    def tracked(content):
+        calls.append(content)
+        return parse_questions(content)
+
+    monkeypatch.setattr(markdown_repository, 'parse_questions', tracked)
+    return calls
+
+
+def test_compiled_bank_loads_without_parsing(md_file, monkeypatch):
+    """Test a fresh artifact yields the same questions without parsing Markdown"""
+    parsed = MarkdownQuestionRepository(md_file=md_file).questions
+    parsed = {level: list(questions) for level, questions in parsed.items()}
+    artifact_file, questions, errors = compile_question_bank(md_file)
+
+    assert artifact_file == default_artifact_path(md_file)
+    assert len(questions) == 2 and errors == []
+
+    parses = track_parsing(monkeypatch)
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    assert repo.store is not None
+    assert {level: list(questions) for level, questions in repo.questions.items()} == parsed
+    assert parses == []
+
+
+def test_stale_artifact_falls_back_to_parsing(md_file):
+    """Test editing the Markdown invalidates the artifact by its source hash"""
+    compile_question_bank(md_file)
+    md_file.write_text(md_file.read_text(encoding='utf-8').replace('Commands', 'CLI'), encoding='utf-8')
+
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    assert [q['topic'] for q in repo.questions['easy']] == ['CLI', 'Testing']
+
+
+def test_unreadable_artifact_falls_back_to_parsing(md_file):
+    """Test a corrupt artifact is ignored"""
+    default_artifact_path(md_file).write_bytes(b'not marshal data')
+
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    assert repo.get_question_stats()['total'] == 2
+
+
+def test_parser_version_invalidates_artifact(md_file, monkeypatch):
+    """Test artifacts from another parser version are not trusted"""
+    from src.quiz_app.repo import question_artifact
+
+    compile_question_bank(md_file)
+    monkeypatch.setattr(question_artifact, 'PARSER_VERSION', question_artifact.PARSER_VERSION + 1)
+
+    parses = track_parsing(monkeypatch)
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    assert len(parses) == 1
+    assert repo.get_question_stats()['total'] == 2
@@ -0,0 +1,120 @@
+"""
+Tests for the compact question index
+"""
+from array import array
+
+import pytest
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+from src.quiz_app.repo.question_artifact import compile_question_bank
+from src.quiz_app.repo.question_index import QuestionIndex, QuestionRecord
+
+QUESTION = """# Question {number}
+**Topic:** {topic}
+**Difficulty:** {difficulty} (Generated)
+
+**Scenario:**
+What does `dbt {command}` do?
+
+**Options:**
+A. Runs {command}
+B. Nothing
+C. Deletes {command}
+
+**Correct Answer:** A
+
+**Explanation:**
+It runs {command}.
+"""
+COMMANDS = ['run', 'test', 'seed', 'build', 'snapshot', 'compile']
+
+
+@pytest.fixture
+def md_file(tmp_path):
+    """Write a bank of four easy questions and two difficult ones over two topics"""
+    md_file = tmp_path / 'questions.md'
+    md_file.write_text(''.join(
+        QUESTION.format(
+            number=number, command=command,
+            topic='Commands' if number % 2 else 'Testing', difficulty=1 if number <= 4 else 3
+        )
+        for number, command in enumerate(COMMANDS, start=1)
+    ), encoding='utf-8')
+    return md_file
+
+
+def test_records_are_compact_and_immutable(md_file):
+    """Test questions are slotted records with interned topics and array-backed levels"""
+    index = MarkdownQuestionRepository(md_file=md_file).index
+
+    record = index.records[0]
+    assert isinstance(record, QuestionRecord)
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.question = 'changed'
+    assert record.options == ('Runs run', 'Nothing', 'Deletes run')
+
+    assert index.topics == ['Commands', 'Testing']
+    assert [r.topic_id for r in index.records] == [0, 1, 0, 1, 0, 1]
+    assert all(isinstance(positions, array) for positions in index.levels.values())
+    assert {level: list(positions) for level, positions in index.levels.items()} == {
+        'easy': [0, 1, 2, 3], 'medium': [], 'difficult': [4, 5], 'critical': []
+    }
+
+
+def test_only_selected_questions_are_built(md_file, monkeypatch):
+    """Test selection samples positions and builds dicts just for the chosen questions"""
+    repo = MarkdownQuestionRepository(md_file=md_file)
+    built = []
+    question = QuestionIndex.question
+
+    def tracked(index, position):
+        built.append(position)
+        return question(index, position)
+
+    monkeypatch.setattr(QuestionIndex, 'question', tracked)
+    selected = repo.get_questions(3, 1)
+
+    assert len(built) == 3
+    assert sorted(q['id'] for q in selected) == sorted(repo.index.records[p].id for p in built)
+    assert all(q['difficulty'] == 1 for q in selected)
+
+
+def test_selected_questions_do_not_share_state(md_file):
+    """Test shuffling and editing a served question leaves the repository untouched"""
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    for question in repo.get_questions(6, 0):
+        assert question['options'][question['correctAnswer']].startswith('Runs ')
+        question['options'].clear()
+
+    assert all(len(r.options) == 3 for r in repo.index.records)
+
+
+def test_short_level_is_topped_up_from_others(md_file):
+    """Test a difficulty with too few questions is filled from other levels without repeats"""
+    repo = MarkdownQuestionRepository(md_file=md_file)
+
+    selected = repo.get_questions(5, 3)
+
+    assert len(selected) == 5
+    assert len({q['id'] for q in selected}) == 5
+    assert sum(q['difficulty'] == 3 for q in selected) == 2
+
+
+def test_added_question_joins_a_new_index(md_file):
+    """Test adding a question swaps in a new index, also over a mapped store"""
+    compile_question_bank(md_file)
+    repo = MarkdownQuestionRepository(md_file=md_file)
+    assert repo.store is not None
+    before = repo.index
+
+    added = repo.add_question_to_markdown(
+        'What does `dbt docs` do?', ['Docs', 'Nothing', 'Tests', 'Seeds', 'Runs'], 0, 'It builds docs.', 'Docs', 2
+    )
+
+    assert repo.index is not before
+    assert len(before) == 6
+    assert added['id'] == 7 and added['topic'] == 'Docs'
+    assert list(repo.questions['medium']) == [added]
+    assert repo.index.topics == ['Commands', 'Testing', 'Docs']
+    assert repo.get_question_stats()['total'] == 7
@@ -0,0 +1,129 @@
+"""
+Tests for hot-reloading the question bank with incremental re-parsing
+"""
+import threading
+
+import pytest
+from src.quiz_app.repo import markdown_parser
+from src.quiz_app.repo.markdown_parser import IncrementalParser, parse_questions
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+from src.quiz_app.repo.question_watcher import QuestionFileWatcher
+
+QUESTION = """# Question {number}
+**Topic:** Commands
+**Difficulty:** 1 (Easy)
+
+**Scenario:**
+What does `dbt {command}` do?
+
+**Options:**
+A. Runs {command}
+B. Nothing
+
+**Correct Answer:** A
+
+**Explanation:**
+It runs {command}.
+
+---
+
+"""
+COMMANDS = ['run', 'test', 'seed', 'build']
+
+
+def bank(commands):
+    """Build a question bank with one question per command"""
+    return ''.join(QUESTION.format(number=i, command=c) for i, c in enumerate(commands, start=1))
+
+
+def track_block_parsing(monkeypatch):
+    """Record the ids of blocks parsed from scratch"""
+    parsed = []
+    parse_block = markdown_parser.parse_block
+
+    def tracked(block):
+        parsed.append(block.question_id)
+        return parse_block(block)
+
+    monkeypatch.setattr(markdown_parser, 'parse_block', tracked)
+    return parsed
+
+
+def test_incremental_parser_reparses_only_changed_blocks(monkeypatch):
+    """Test unchanged blocks are reused and match a full parse"""
+    parser = IncrementalParser()
+    parser.parse(bank(COMMANDS))
+    parsed = track_block_parsing(monkeypatch)
+
+    content = bank(COMMANDS).replace('Runs seed', 'Loads seed')
+    result = parser.parse(content)
+
+    assert parsed == [3]
+    assert parser.reparsed == [3]
+    assert result == parse_questions(content)
+
+
+def test_incremental_parser_moves_reused_blocks():
+    """Test inserting a block renumbers the questions and errors after it"""
+    parser = IncrementalParser()
+    broken = COMMANDS[:2] + ['docs']
+    parser.parse(bank(broken).replace('**Correct Answer:** A\n\n**Explanation:**\nIt runs docs', '**Explanation:**'))
+
+    content = bank(['compile'] + broken).replace(
+        '**Correct Answer:** A\n\n**Explanation:**\nIt runs docs', '**Explanation:**'
+    )
+    questions, errors = parser.parse(content)
+
+    assert parser.reparsed == [1]
+    assert (questions, errors) == parse_questions(content)
+    assert [q['id'] for q in questions] == [1, 2, 3, 4]
+    assert [(e.line, e.question_id) for e in errors] == [(55, 4)]
+
+
+def test_reload_swaps_in_a_new_index(tmp_path, monkeypatch):
+    """Test a reload re-parses the edited block and leaves the old index intact"""
+    md_file = tmp_path / 'questions.md'
+    md_file.write_text(bank(COMMANDS), encoding='utf-8')
+    repo = MarkdownQuestionRepository(md_file=md_file)
+    assert repo.reload_questions() is False  # Fills the block cache only
+    before = repo.index
+
+    parsed = track_block_parsing(monkeypatch)
+    md_file.write_text(bank(COMMANDS + ['snapshot']).replace('Runs test', 'Tests test'), encoding='utf-8')
+
+    assert repo.reload_questions() is True
+    assert parsed == [2, 5]
+    assert repo.index is not before
+    assert [q['options'][0] for q in before.questions['easy']] == ['Runs run', 'Runs test', 'Runs seed', 'Runs build']
+    assert [q['options'][0] for q in repo.questions['easy']] == [
+        'Runs run', 'Tests test', 'Runs seed', 'Runs build', 'Runs snapshot'
+    ]
+    assert repo.next_id == 6
+    assert repo.reload_questions() is False
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_watcher_reloads_on_change(tmp_path, use_inotify):
+    """Test the watcher notices edits with inotify and with polling"""
+    md_file = tmp_path / 'questions.md'
+    md_file.write_text(bank(COMMANDS), encoding='utf-8')
+    repo = MarkdownQuestionRepository(md_file=md_file)
+    reloaded = threading.Event()
+    primed = threading.Event()
+
+    def reload():
+        if repo.reload_questions():
+            reloaded.set()
+        primed.set()
+
+    watcher = QuestionFileWatcher(md_file, reload, interval=0.05, use_inotify=use_inotify).start()
+    try:
+        if not use_inotify:
+            assert watcher.mode == 'polling'
+        assert primed.wait(5)
+        md_file.write_text(bank(COMMANDS[:2]), encoding='utf-8')
+        assert reloaded.wait(5)
+    finally:
+        watcher.stop()
+
+    assert repo.get_question_stats()['total'] == 2
@@ -0,0 +1,91 @@
+"""
+Tests for the memory-mapped question store
+"""
+import hashlib
+
+import pytest
+from src.quiz_app.repo.markdown_repository import MarkdownQuestionRepository
+from src.quiz_app.repo.question_artifact import compile_question_bank
+from src.quiz_app.repo.question_store import MappedQuestionStore, build_question_store
+
+QUESTIONS = [
+    {'id': 1, 'question': 'What does `dbt run` do?', 'options': ['Runs models', 'Runs tests'],
+     'correct_answer': 1, 'explanation': 'It runs models.', 'topic': 'Commands', 'difficulty': 1},
+    {'id': 2, 'question': 'Which selector picks children? →', 'options': ['+model', 'model+', '@model', 'model', '*'],
+     'correct_answer': 2, 'explanation': 'A trailing + selects children.', 'topic': 'Selectors', 'difficulty': 3},
+    {'id': 3, 'question': 'What does `dbt test` do?', 'options': ['Runs models', 'Runs tests', 'Nothing'],
+     'correct_answer': 2, 'explanation': '', 'topic': 'Commands', 'difficulty': 1},
+]
+SOURCE_HASH = hashlib.sha256(b'questions').hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Write and map a store of three questions"""
+    path = tmp_path / 'questions.qbank'
+    path.write_bytes(build_question_store(QUESTIONS, 2, 1, SOURCE_HASH))
+    store = MappedQuestionStore(path)
+    yield store
+    store.close()
+
+
+def test_store_round_trip(store):
+    """Test every question decodes back to its parsed fields"""
+    assert (store.store_format, store.parser_version, store.source_sha256) == (2, 1, SOURCE_HASH)
+    assert len(store) == 3
+    assert store.max_question_id == 3
+    assert [store.record(i) for i in range(len(store))] == [
+        (q['id'], q['question'], q['options'], q['correct_answer'], q['explanation'], q['topic'], q['difficulty'])
+        for q in QUESTIONS
+    ]
+    with pytest.raises(IndexError):
+        store.record(3)
+
+
+def test_store_interns_topics_and_indexes_difficulty(store):
+    """Test topics are stored once and difficulties map to record positions"""
+    assert store.topics == ['Commands', 'Selectors']
+    assert {difficulty: list(positions) for difficulty, positions in store.difficulty_positions.items()} == {
+        1: [0, 2], 3: [1]
+    }
+
+
+def test_store_shares_repeated_strings(tmp_path):
+    """Test identical text is written to the string heap once"""
+    single = build_question_store(QUESTIONS[:1], 2, 1, SOURCE_HASH)
+    repeated = build_question_store([QUESTIONS[0], dict(QUESTIONS[0], id=2)], 2, 1, SOURCE_HASH)
+
+    assert len(repeated) - len(single) < 100  # One more record and position, no more text
+
+
+def test_rejects_files_that_are_not_stores(tmp_path):
+    """Test foreign and truncated files are refused"""
+    path = tmp_path / 'questions.qbank'
+    path.write_bytes(b'x' * 200)
+    with pytest.raises(ValueError):
+        MappedQuestionStore(path)
+
+    path.write_bytes(build_question_store(QUESTIONS, 2, 1, SOURCE_HASH)[:120])
+    with pytest.raises(ValueError):
+        MappedQuestionStore(path)
+
+
+def test_repository_serves_questions_from_store(tmp_path):
+    """Test the repository maps the compiled bank and decodes only what it serves"""
+    repo = MarkdownQuestionRepository()
+    md_file = tmp_path / 'questions.md'
+    md_file.write_bytes(repo.md_file.read_bytes())
+    compile_question_bank(md_file)
+
+    mapped = MarkdownQuestionRepository(md_file=md_file)
+
+    assert mapped.store is not None
+    assert {level: list(questions) for level, questions in mapped.questions.items()} == {
+        level: list(questions) for level, questions in repo.questions.items()
+    }
+    assert mapped.get_question_stats() == repo.get_question_stats()
+    assert mapped.next_id == repo.next_id
+
+    selected = mapped.get_questions(5, 1)
+    assert len(selected) == 5
+    assert all(q['options'][q['correctAnswer']] for q in selected)
@@ -0,0 +1,56 @@
+"""
+Tests for quiz service
+"""
+import pytest
+from src.quiz_app.models import db, Question
+from src.quiz_app.services.database_service import DatabaseService
+from src.quiz_app.services.quiz_service import QuizService
+
+
+@pytest.fixture
+def quiz_service(app):
+    """Create quiz service over a small question bank"""
+    app.database_service = DatabaseService()
+    for i in range(5):
+        db.session.add(Question(
+            question_id=i + 1,
+            question_text=f'Question {i + 1}',
+            options=['A', 'B', 'C', 'D'],
+            correct_answer=i % 4,
+            difficulty_level=2,
+            topic_category='Testing'
+        ))
+    db.session.commit()
+    return QuizService()
+
+
+def test_quiz_config_keeps_answer_key_on_server(quiz_service):
+    """Test the config exposes a token but no correct answers"""
+    config = quiz_service.get_quiz_config(3, 2)
+
+    assert config['quizToken']
+    assert len(config['questions']) == 3
+    assert all('correctAnswer' not in q for q in config['questions'])
+
+
+def test_score_quiz_with_token(quiz_service):
+    """Test scoring answer indices against the stored session"""
+    config = quiz_service.get_quiz_config(4, 2)
+    key = {q.id: q.correct_answer for q in Question.query.all()}
+    answers = [key[q['id']] for q in config['questions']]
+    answers[0] = None
+
+    result = quiz_service.score_quiz(config['quizToken'], answers)
+
+    assert result['correctAnswers'] == 3
+    assert result['totalQuestions'] == 4
+    assert result['percentage'] == 75.0
+    assert [d['question']['id'] for d in result['questions_data']] == [q['id'] for q in config['questions']]
+
+    # A quiz can only be submitted once
+    assert quiz_service.score_quiz(config['quizToken'], answers) is None
+
+
+def test_score_quiz_unknown_token(quiz_service):
+    """Test an unknown token is rejected"""
+    assert quiz_service.score_quiz('missing', [0, 1]) is None
@@ -0,0 +1,63 @@
+"""
+Tests for quiz session stores
+"""
+import time
+
+import pytest
+from src.quiz_app.services.quiz_session_store import (
+    InMemoryQuizSessionStore,
+    RedisQuizSessionStore,
+    create_quiz_session_store
+)
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def store(request):
+    """Create each session store backend with a short TTL"""
+    if request.param == 'memory':
+        return InMemoryQuizSessionStore(ttl=1, max_entries=3)
+
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisQuizSessionStore(client=fakeredis.FakeRedis(), ttl=1)
+
+
+def test_save_get_pop(store):
+    """Test a session round-trips and can only be popped once"""
+    quiz_session = {'question_ids': [3, 7], 'answer_key': [0, 2], 'difficulty': 2}
+    store.save('token', quiz_session)
+
+    assert store.get('token') == quiz_session
+    assert store.pop('token') == quiz_session
+    assert store.pop('token') is None
+    assert store.get('missing') is None
+
+
+def test_sessions_expire(store):
+    """Test sessions are evicted after their TTL"""
+    store.save('token', {'question_ids': [1], 'answer_key': [0]})
+    time.sleep(1.1)
+
+    assert store.get('token') is None
+    assert store.pop('token') is None
+
+
+def test_memory_store_is_bounded():
+    """Test the in-memory store evicts least recently used sessions"""
+    store = InMemoryQuizSessionStore(max_entries=2)
+    store.save('a', {})
+    store.save('b', {})
+    store.get('a')
+    store.save('c', {})
+
+    assert len(store) == 2
+    assert store.get('b') is None
+    assert store.get('a') == {}
+
+
+def test_create_store_from_config():
+    """Test the backend is selected from configuration"""
+    store = create_quiz_session_store({'QUIZ_SESSION_TTL': 60, 'QUIZ_SESSION_MAX_ENTRIES': 5})
+
+    assert isinstance(store, InMemoryQuizSessionStore)
+    assert store.ttl == 60
+    assert store.max_entries == 5
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 from .config import config_from_env
 from .routes import ui_bp, api_bp
 from .models import db
+from .commands import register_commands
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,19 +30,39 @@ def create_app():
     app.register_blueprint(ui_bp)
     app.register_blueprint(api_bp)
     
+    # Register CLI commands
+    register_commands(app)
+    
     # Initialize extensions and services
     from .services.quiz_service import QuizService
+    from .services.quiz_session_store import create_quiz_session_store
     from .services.database_service import DatabaseService
+    from .services.pdf_cache import PDFReportCache
+    from .services.job_service import PDFJobService
+    from .services.export_service import ReportExportService
+    from .services.pdf_service import PDF_TEMPLATE_VERSION, get_pdf_service
     
-    app.quiz_service = QuizService()
+    app.quiz_service = QuizService(session_store=create_quiz_session_store(app.config))
     app.database_service = DatabaseService()
+    app.database_service.analytics_cache.ttl = app.config['ANALYTICS_CACHE_TTL']
+    app.pdf_service = get_pdf_service()
+    app.pdf_cache = PDFReportCache(
+        app.config['PDF_CACHE_DIR'],
+        max_bytes=app.config['PDF_CACHE_MAX_BYTES'],
+        template_version=PDF_TEMPLATE_VERSION
+    )
+    app.pdf_job_service = PDFJobService(app.pdf_cache, max_workers=app.config['PDF_JOB_WORKERS'])
+    app.export_service = ReportExportService(
+        app.database_service, app.pdf_job_service, time_limit=app.config['EXPORT_TIME_LIMIT']
+    )
     
-    # Create database tables (if they don't exist)
-    with app.app_context():
-        try:
-            db.create_all()
-            app.logger.info("Database tables verified/created successfully")
-        except Exception as e:
-            app.logger.error(f"Database initialization error: {e}")
+    # Schema changes ship as migrations applied by `flask upgrade-db` at release time;
+    # workers only run them at startup when AUTO_MIGRATE is set (local development)
+    if app.config['AUTO_MIGRATE']:
+        with app.app_context():
+            try:
+                app.database_service.init_db()
+            except Exception as e:
+                app.logger.error(f"Database initialization error: {e}")
     
     return app
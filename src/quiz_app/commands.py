@@ -0,0 +1,32 @@
+"""
+Flask CLI commands for dbt Certification Quiz Application
+"""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+@click.command('rebuild-rollups')
+@click.option('--user-id', type=int, default=None, help='Only rebuild rollups for this user')
+@with_appcontext
+def rebuild_rollups_command(user_id):
+    """Rebuild dashboard rollup tables from recorded quiz attempts"""
+    rebuilt = current_app.database_service.rebuild_user_rollups(user_id=user_id)
+    click.echo(f"Rebuilt rollups for {rebuilt} users")
+
+
+@click.command('upgrade-db')
+@with_appcontext
+def upgrade_db_command():
+    """Apply pending schema migrations"""
+    applied = current_app.database_service.init_db()
+    if applied:
+        click.echo(f"Applied migrations: {', '.join(applied)}")
+    else:
+        click.echo("Database schema is up to date")
+
+
+def register_commands(app):
+    """Register CLI commands with the application"""
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(upgrade_db_command)
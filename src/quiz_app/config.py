@@ -2,6 +2,7 @@
 Configuration management for dbt Certification Quiz Application
 """
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -25,6 +26,9 @@ class BaseConfig:
         'max_overflow': 20
     }
     
+    # Apply pending schema migrations when the app starts (release step runs `flask upgrade-db`)
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'false').lower() == 'true'
+    
     # Environment detection
     IS_PRODUCTION = os.environ.get('FLASK_ENV') == 'production' or os.environ.get('RENDER') == 'true'
     IS_DEVELOPMENT = not IS_PRODUCTION
@@ -39,6 +43,30 @@ class BaseConfig:
     DEFAULT_QUESTIONS = 10
     DEFAULT_DIFFICULTY = 2
     
+    # Question bank cache (per worker, reloaded when stale or invalidated)
+    QUESTION_CACHE_ENABLED = os.environ.get('QUESTION_CACHE_ENABLED', 'true').lower() == 'true'
+    QUESTION_CACHE_TTL = int(os.environ.get('QUESTION_CACHE_TTL', 300))  # Seconds
+    
+    # Server-side quiz sessions ('memory' per worker, or 'redis' shared across workers)
+    QUIZ_SESSION_BACKEND = os.environ.get('QUIZ_SESSION_BACKEND', 'memory')
+    QUIZ_SESSION_TTL = int(os.environ.get('QUIZ_SESSION_TTL', 3 * 60 * 60))  # Seconds
+    QUIZ_SESSION_MAX_ENTRIES = int(os.environ.get('QUIZ_SESSION_MAX_ENTRIES', 10000))
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    
+    # Dashboard topic analysis window (days of daily rollup buckets)
+    TOPIC_ANALYSIS_WINDOW_DAYS = int(os.environ.get('TOPIC_ANALYSIS_WINDOW_DAYS', 10))
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 60))  # Seconds
+    
+    # Rendered attempt PDF reports (shared by workers on the same host, LRU-bounded)
+    PDF_CACHE_DIR = os.environ.get('PDF_CACHE_DIR') or str(Path(tempfile.gettempdir()) / 'dbt-quiz-pdf-cache')
+    PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_MB', 256)) * 1024 * 1024
+    
+    # Background PDF render processes per web worker (unset: one per spare core, 0: render inline)
+    PDF_JOB_WORKERS = int(os.environ['PDF_JOB_WORKERS']) if os.environ.get('PDF_JOB_WORKERS') else None
+    
+    # Seconds a ZIP export may run; keep it below gunicorn's worker timeout (gunicorn.conf.py)
+    EXPORT_TIME_LIMIT = int(os.environ.get('EXPORT_TIME_LIMIT', 100))
+    
     # Google OAuth Configuration
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', 'your_google_client_id_here')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET', 'your_google_client_secret_here')
@@ -73,6 +101,7 @@ class DevelopmentConfig(BaseConfig):
     """Development configuration"""
     DEBUG = True
     FLASK_ENV = 'development'
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'
 
 
 class ProductionConfig(BaseConfig):
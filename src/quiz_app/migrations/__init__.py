@@ -0,0 +1,11 @@
+"""
+Versioned schema migrations for dbt Certification Quiz Application
+
+Revisions are applied in order by ``flask upgrade-db`` as a release step and
+recorded in the schema_migrations table, so application workers never run DDL
+at startup.
+"""
+from .revisions import REVISIONS
+from .runner import applied_versions, pending_revisions, upgrade
+
+__all__ = ['REVISIONS', 'applied_versions', 'pending_revisions', 'upgrade']
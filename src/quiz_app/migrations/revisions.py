@@ -0,0 +1,262 @@
+"""
+Schema revisions, oldest first
+
+Each revision declares the tables it touches as they were at that revision
+rather than importing the models, so replaying history on an empty database
+always yields the same schema. Revisions use ``checkfirst`` so databases that
+were created by the old ``db.create_all()`` at startup are adopted in place.
+"""
+from collections import namedtuple
+
+from sqlalchemy import (
+    JSON, Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer,
+    MetaData, String, Table, Text, inspect, text
+)
+
+from .rollups import rebuild_rollup_statements
+
+Revision = namedtuple('Revision', ['version', 'description', 'upgrade'])
+
+
+def create_tables(connection, metadata):
+    """Create the tables in metadata that do not exist yet"""
+    metadata.create_all(connection, checkfirst=True)
+
+
+def add_column(connection, table_name, column):
+    """Add a column to an existing table unless it is already there"""
+    existing = {c['name'] for c in inspect(connection).get_columns(table_name)}
+    if column.name in existing:
+        return
+
+    column_type = column.type.compile(dialect=connection.dialect)
+    nullable = '' if column.nullable else ' NOT NULL'
+    connection.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}{nullable}'))
+
+
+def create_indexes(connection, indexes):
+    """Create the indexes that do not exist yet"""
+    for index in indexes:
+        index.create(connection, checkfirst=True)
+
+
+def baseline(connection):
+    """Tables created by db.create_all() before migrations were introduced"""
+    metadata = MetaData()
+
+    Table(
+        'users', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('email', String(120), unique=True, nullable=False, index=True),
+        Column('name', String(100), nullable=False),
+        Column('google_id', String(100), unique=True, nullable=True, index=True),
+        Column('profile_picture', String(500), nullable=True),
+        Column('is_pro', Boolean, nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
+    Table(
+        'subscriptions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False, index=True),
+        Column('razorpay_payment_id', String(100), unique=True, nullable=False, index=True),
+        Column('razorpay_order_id', String(100), nullable=False, index=True),
+        Column('amount', Integer, nullable=False),
+        Column('currency', String(3), nullable=False),
+        Column('status', String(20), nullable=False),
+        Column('payment_method', String(50), nullable=True),
+        Column('subscription_start', DateTime, nullable=True),
+        Column('subscription_end', DateTime, nullable=True),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
+    Table(
+        'quiz_attempts', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False, index=True),
+        Column('question_count', Integer, nullable=False),
+        Column('difficulty', Integer, nullable=False),
+        Column('correct_answers', Integer, nullable=False),
+        Column('total_questions', Integer, nullable=False),
+        Column('percentage', Float, nullable=False),
+        Column('is_pro_quiz', Boolean, nullable=False),
+        Column('created_at', DateTime, nullable=False)
+    )
+    Table(
+        'questions', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('question_id', Integer, unique=True, nullable=False),
+        Column('question_text', Text, nullable=False),
+        Column('options', JSON, nullable=False),
+        Column('correct_answer', Integer, nullable=False),
+        Column('explanation', Text, nullable=True),
+        Column('difficulty_level', Integer, nullable=False),
+        Column('topic_category', String(100), nullable=True),
+        Column('is_active', Boolean, nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
+    Table(
+        'quiz_attempt_details', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('quiz_attempt_id', Integer, ForeignKey('quiz_attempts.id'), nullable=False, index=True),
+        Column('question_id', Integer, ForeignKey('questions.id'), nullable=False, index=True),
+        Column('question_number', Integer, nullable=False),
+        Column('user_answer', Integer, nullable=True),
+        Column('is_correct', Boolean, nullable=False),
+        Column('created_at', DateTime, nullable=False)
+    )
+
+    create_tables(connection, metadata)
+
+
+def dashboard_rollups(connection):
+    """Per-user stats, topic and daily topic rollup tables for the dashboard
+
+    The rollups are backfilled from existing attempts in the same transaction.
+    Submitting a quiz only adds that attempt to the stored totals, so a user
+    without a backfilled row would otherwise see one attempt as their history.
+    """
+    metadata = MetaData()
+    Table('users', metadata, Column('id', Integer, primary_key=True))
+
+    user_stats_rollup = Table(
+        'user_stats_rollup', metadata,
+        Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+        Column('total_attempts', Integer, nullable=False),
+        Column('pro_attempts', Integer, nullable=False),
+        Column('percentage_sum', Float, nullable=False),
+        Column('best_score', Float, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
+    user_topic_rollup = Table(
+        'user_topic_rollup', metadata,
+        Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+        Column('topic_category', String(100), primary_key=True),
+        Column('total_attempted', Integer, nullable=False),
+        Column('total_correct', Integer, nullable=False),
+        Column('updated_at', DateTime, nullable=False)
+    )
+    user_topic_daily_rollup = Table(
+        'user_topic_daily_rollup', metadata,
+        Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+        Column('topic_category', String(100), primary_key=True),
+        Column('bucket_date', Date, primary_key=True),
+        Column('total_attempted', Integer, nullable=False),
+        Column('total_correct', Integer, nullable=False)
+    )
+
+    create_tables(connection, metadata)
+
+    # The attempt tables as of the baseline, only read by the backfill
+    sources = MetaData()
+    quiz_attempts = Table(
+        'quiz_attempts', sources,
+        Column('id', Integer),
+        Column('user_id', Integer),
+        Column('percentage', Float),
+        Column('is_pro_quiz', Boolean),
+        Column('created_at', DateTime)
+    )
+    quiz_attempt_details = Table(
+        'quiz_attempt_details', sources,
+        Column('id', Integer),
+        Column('quiz_attempt_id', Integer),
+        Column('question_id', Integer),
+        Column('is_correct', Boolean)
+    )
+    questions = Table(
+        'questions', sources,
+        Column('id', Integer),
+        Column('topic_category', String(100))
+    )
+
+    for statement in rebuild_rollup_statements(
+        quiz_attempts, quiz_attempt_details, questions,
+        user_stats_rollup, user_topic_rollup, user_topic_daily_rollup
+    ):
+        connection.execute(statement)
+
+
+def composite_indexes(connection):
+    """Composite indexes for history, analytics and question bank queries
+
+    Their leading columns make the baseline's single-column user_id and
+    quiz_attempt_id indexes redundant, so those are dropped once the
+    composites exist.
+    """
+    metadata = MetaData()
+    quiz_attempts = Table(
+        'quiz_attempts', metadata,
+        Column('user_id', Integer),
+        Column('created_at', DateTime)
+    )
+    questions = Table(
+        'questions', metadata,
+        Column('is_active', Boolean),
+        Column('difficulty_level', Integer),
+        Column('topic_category', String(100))
+    )
+    quiz_attempt_details = Table(
+        'quiz_attempt_details', metadata,
+        Column('quiz_attempt_id', Integer),
+        Column('question_id', Integer),
+        Column('is_correct', Boolean),
+        Column('question_number', Integer)
+    )
+
+    create_indexes(connection, [
+        Index(
+            'ix_quiz_attempts_user_id_created_at',
+            quiz_attempts.c.user_id, quiz_attempts.c.created_at
+        ),
+        Index(
+            'ix_questions_active_difficulty_topic',
+            questions.c.is_active, questions.c.difficulty_level, questions.c.topic_category
+        ),
+        Index(
+            'ix_quiz_attempt_details_attempt_question',
+            quiz_attempt_details.c.quiz_attempt_id, quiz_attempt_details.c.question_id,
+            postgresql_include=['is_correct', 'question_number']
+        ),
+    ])
+    Index('ix_quiz_attempts_user_id', quiz_attempts.c.user_id).drop(connection, checkfirst=True)
+    Index(
+        'ix_quiz_attempt_details_quiz_attempt_id', quiz_attempt_details.c.quiz_attempt_id
+    ).drop(connection, checkfirst=True)
+
+
+def history_keyset_index(connection):
+    """Extend the quiz history index with id for keyset pagination on (created_at, id)"""
+    metadata = MetaData()
+    quiz_attempts = Table(
+        'quiz_attempts', metadata,
+        Column('id', Integer),
+        Column('user_id', Integer),
+        Column('created_at', DateTime)
+    )
+
+    Index(
+        'ix_quiz_attempts_user_id_created_at',
+        quiz_attempts.c.user_id, quiz_attempts.c.created_at
+    ).drop(connection, checkfirst=True)
+    create_indexes(connection, [
+        Index(
+            'ix_quiz_attempts_user_id_created_at_id',
+            quiz_attempts.c.user_id, quiz_attempts.c.created_at, quiz_attempts.c.id
+        ),
+    ])
+
+
+def attempt_snapshots(connection):
+    """Immutable per-attempt snapshot of graded questions, written at submit time"""
+    add_column(connection, 'quiz_attempts', Column('details_snapshot', JSON, nullable=True))
+
+
+REVISIONS = [
+    Revision('0001', 'Baseline schema', baseline),
+    Revision('0002', 'Dashboard rollup tables', dashboard_rollups),
+    Revision('0003', 'Composite query indexes', composite_indexes),
+    Revision('0004', 'Keyset index for quiz history', history_keyset_index),
+    Revision('0005', 'Quiz attempt details snapshot', attempt_snapshots),
+]
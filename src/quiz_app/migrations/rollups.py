@@ -0,0 +1,86 @@
+"""
+Recomputation of the dashboard rollups from recorded quiz attempts
+
+Shared by revision 0002, which backfills the rollups when it creates them,
+and by ``flask rebuild-rollups``, so the two always compute the same totals.
+Both pass in the tables they work with: the revision its own declarations,
+the service the models' tables.
+"""
+from sqlalchemy import case, delete, func, insert, select
+
+
+def rebuild_rollup_statements(quiz_attempts, quiz_attempt_details, questions,
+                              user_stats_rollup, user_topic_rollup, user_topic_daily_rollup, user_id=None):
+    """Build the statements that recompute stats, topic and daily topic rollups
+
+    Args:
+        user_id (int): Optional user to rebuild; all users when omitted
+
+    Returns:
+        list: DELETEs clearing the rollups, then INSERT ... SELECTs refilling them
+    """
+    rollups = (user_stats_rollup, user_topic_rollup, user_topic_daily_rollup)
+    statements = []
+    for rollup in rollups:
+        statement = delete(rollup)
+        if user_id is not None:
+            statement = statement.where(rollup.c.user_id == user_id)
+        statements.append(statement)
+
+    correct = func.sum(case((quiz_attempt_details.c.is_correct == True, 1), else_=0))
+    details = quiz_attempts.join(
+        quiz_attempt_details, quiz_attempt_details.c.quiz_attempt_id == quiz_attempts.c.id
+    ).join(
+        questions, questions.c.id == quiz_attempt_details.c.question_id
+    )
+    bucket_date = func.date(quiz_attempts.c.created_at)
+
+    stats_select = select(
+        quiz_attempts.c.user_id,
+        func.count(quiz_attempts.c.id),
+        func.sum(case((quiz_attempts.c.is_pro_quiz == True, 1), else_=0)),
+        func.sum(quiz_attempts.c.percentage),
+        func.max(quiz_attempts.c.percentage),
+        func.now()
+    ).group_by(quiz_attempts.c.user_id)
+
+    topic_select = select(
+        quiz_attempts.c.user_id,
+        questions.c.topic_category,
+        func.count(quiz_attempt_details.c.id),
+        correct,
+        func.now()
+    ).select_from(details).where(
+        questions.c.topic_category.isnot(None)
+    ).group_by(quiz_attempts.c.user_id, questions.c.topic_category)
+
+    daily_select = select(
+        quiz_attempts.c.user_id,
+        questions.c.topic_category,
+        bucket_date,
+        func.count(quiz_attempt_details.c.id),
+        correct
+    ).select_from(details).where(
+        questions.c.topic_category.isnot(None)
+    ).group_by(quiz_attempts.c.user_id, questions.c.topic_category, bucket_date)
+
+    if user_id is not None:
+        stats_select = stats_select.where(quiz_attempts.c.user_id == user_id)
+        topic_select = topic_select.where(quiz_attempts.c.user_id == user_id)
+        daily_select = daily_select.where(quiz_attempts.c.user_id == user_id)
+
+    statements.extend([
+        insert(user_stats_rollup).from_select(
+            ['user_id', 'total_attempts', 'pro_attempts', 'percentage_sum', 'best_score', 'updated_at'],
+            stats_select
+        ),
+        insert(user_topic_rollup).from_select(
+            ['user_id', 'topic_category', 'total_attempted', 'total_correct', 'updated_at'],
+            topic_select
+        ),
+        insert(user_topic_daily_rollup).from_select(
+            ['user_id', 'topic_category', 'bucket_date', 'total_attempted', 'total_correct'],
+            daily_select
+        ),
+    ])
+    return statements
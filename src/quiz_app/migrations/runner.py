@@ -0,0 +1,61 @@
+"""
+Migration runner that applies pending schema revisions in order
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select
+
+from .revisions import REVISIONS
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', String(32), primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+
+def applied_versions(engine):
+    """Get the set of revision versions already applied to a database"""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return {row.version for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def pending_revisions(engine):
+    """Get the revisions not yet applied, in order"""
+    applied = applied_versions(engine)
+    return [revision for revision in REVISIONS if revision.version not in applied]
+
+
+def upgrade(engine, target=None):
+    """Apply pending revisions up to and including target (default: all)
+
+    Each revision runs in its own transaction together with the row recording
+    it, so a failed revision leaves the database at the previous version.
+
+    Args:
+        engine: SQLAlchemy engine for the database to upgrade
+        target (str): Optional version to stop at
+
+    Returns:
+        list: Versions applied by this call
+    """
+    applied = []
+    for revision in pending_revisions(engine):
+        with engine.begin() as connection:
+            revision.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=revision.version,
+                description=revision.description,
+                applied_at=datetime.utcnow()
+            ))
+        logger.info(f"Applied migration {revision.version}: {revision.description}")
+        applied.append(revision.version)
+
+        if revision.version == target:
+            break
+    return applied
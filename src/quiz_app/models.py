@@ -82,9 +82,13 @@ class Subscription(db.Model):
 class QuizAttempt(db.Model):
     """Quiz attempt model for tracking user quiz attempts"""
     __tablename__ = 'quiz_attempts'
+    __table_args__ = (
+        # User history, keyset pages and windowed analytics: WHERE user_id = ? ORDER BY created_at, id
+        db.Index('ix_quiz_attempts_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Leads ix_quiz_attempts_user_id_created_at_id
     question_count = db.Column(db.Integer, nullable=False)
     difficulty = db.Column(db.Integer, nullable=False)
     correct_answers = db.Column(db.Integer, nullable=False)
@@ -92,6 +96,8 @@ class QuizAttempt(db.Model):
     percentage = db.Column(db.Float, nullable=False)
     is_pro_quiz = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=func.now(), nullable=False)
+    # Graded questions as submitted; deferred so history lists never load it
+    details_snapshot = db.deferred(db.Column(db.JSON, nullable=True))
     
     # Relationship with user
     user = db.relationship('User', backref='quiz_attempts')
@@ -117,6 +123,10 @@ class QuizAttempt(db.Model):
 class Question(db.Model):
     """Question bank model for storing all quiz questions"""
     __tablename__ = 'questions'
+    __table_args__ = (
+        # Question bank loads and in-database sampling by difficulty/topic
+        db.Index('ix_questions_active_difficulty_topic', 'is_active', 'difficulty_level', 'topic_category'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, unique=True, nullable=False)  # ID from markdown file (1-35)
@@ -152,9 +162,16 @@ class Question(db.Model):
 class QuizAttemptDetail(db.Model):
     """Minimal storage for individual question responses"""
     __tablename__ = 'quiz_attempt_details'
+    __table_args__ = (
+        # Attempt detail reads and attempt -> question joins; covers is_correct on PostgreSQL
+        db.Index(
+            'ix_quiz_attempt_details_attempt_question', 'quiz_attempt_id', 'question_id',
+            postgresql_include=['is_correct', 'question_number']
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    quiz_attempt_id = db.Column(db.Integer, db.ForeignKey('quiz_attempts.id'), nullable=False, index=True)
+    quiz_attempt_id = db.Column(db.Integer, db.ForeignKey('quiz_attempts.id'), nullable=False)  # Leads ix_quiz_attempt_details_attempt_question
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False, index=True)
     question_number = db.Column(db.Integer, nullable=False)  # 1-based question number in the attempt
     user_answer = db.Column(db.Integer, nullable=True)  # 0-based index (0=A, 1=B, 2=C, 3=D), NULL if not answered
@@ -193,3 +210,62 @@ class QuizAttemptDetail(db.Model):
                 'topic_category': self.question.topic_category
             })
         return detail_dict
+
+
+class UserStatsRollup(db.Model):
+    """Running per-user quiz totals, updated with every recorded attempt"""
+    __tablename__ = 'user_stats_rollup'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total_attempts = db.Column(db.Integer, default=0, nullable=False)
+    pro_attempts = db.Column(db.Integer, default=0, nullable=False)
+    percentage_sum = db.Column(db.Float, default=0.0, nullable=False)
+    best_score = db.Column(db.Float, default=0.0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f'<UserStatsRollup User {self.user_id} - {self.total_attempts} attempts>'
+    
+    def to_stats_dict(self):
+        """Convert rollup to the user statistics dictionary"""
+        average_score = self.percentage_sum / self.total_attempts if self.total_attempts else 0
+        return {
+            'total_attempts': self.total_attempts,
+            'average_score': round(average_score, 1),
+            'best_score': round(self.best_score, 1),
+            'pro_attempts': self.pro_attempts,
+            'free_attempts': self.total_attempts - self.pro_attempts
+        }
+
+
+class UserTopicRollup(db.Model):
+    """Running per-user, per-topic answer totals, updated with every recorded attempt"""
+    __tablename__ = 'user_topic_rollup'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    topic_category = db.Column(db.String(100), primary_key=True)
+    total_attempted = db.Column(db.Integer, default=0, nullable=False)
+    total_correct = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f'<UserTopicRollup User {self.user_id} - {self.topic_category}>'
+    
+    @property
+    def accuracy(self):
+        """Percentage of correct answers, rounded to one decimal"""
+        return round(self.total_correct * 100.0 / self.total_attempted, 1) if self.total_attempted else 0.0
+
+
+class UserTopicDailyRollup(db.Model):
+    """Per-user, per-topic answer totals bucketed by UTC day for windowed analysis"""
+    __tablename__ = 'user_topic_daily_rollup'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    topic_category = db.Column(db.String(100), primary_key=True)
+    bucket_date = db.Column(db.Date, primary_key=True)
+    total_attempted = db.Column(db.Integer, default=0, nullable=False)
+    total_correct = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<UserTopicDailyRollup User {self.user_id} - {self.topic_category} - {self.bucket_date}>'
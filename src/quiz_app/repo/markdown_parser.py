@@ -0,0 +1,332 @@
+"""
+Single-pass parser for the `# Question N` Markdown question format
+
+Lines are grouped into question blocks at each header, and every block is
+scanned once to locate its metadata and section markers. Sections are then
+sliced out by position instead of rescanning the block per field, so parsing
+is linear in the size of the file.
+"""
+import hashlib
+import re
+from collections import namedtuple
+
+# Bump whenever parsing output changes, so compiled question banks are rebuilt
+PARSER_VERSION = 1
+
+HEADER_PREFIX = '# Question '
+HEADER_PATTERN = re.compile(r'# Question \d+')
+# A header at the start of a line; a literal newline scans far faster than ^ with re.MULTILINE
+HEADER_LINE_PATTERN = re.compile(r'\n# Question \d+')
+DIGITS_PATTERN = re.compile(r'(\d+)')
+OPTION_PATTERN = re.compile(r'^[A-E]\.')
+
+TOPIC = '**Topic:**'
+DIFFICULTY = '**Difficulty:**'
+SCENARIO = '**Scenario:**'
+QUESTION = '**Question:**'
+OPTIONS = '**Options:**'
+CORRECT_ANSWER = '**Correct Answer:**'
+EXPLANATION = '**Explanation:**'
+
+METADATA_MARKERS = (TOPIC, DIFFICULTY, CORRECT_ANSWER)
+SECTION_MARKERS = (SCENARIO, QUESTION, OPTIONS, CORRECT_ANSWER, EXPLANATION)
+QUESTION_TERMINATORS = (OPTIONS, CORRECT_ANSWER, EXPLANATION)
+
+MIN_OPTIONS = 2
+MAX_OPTIONS = 5
+DEFAULT_DIFFICULTY = 2
+ANSWER_NUMBERS = {
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5,
+    '1': 1, '2': 2, '3': 3, '4': 4, '5': 5
+}
+
+# A `# Question N` block: its ordinal id, the 1-based line number of its
+# header, and its lines starting with the rest of the header line
+QuestionBlock = namedtuple('QuestionBlock', ['question_id', 'line', 'lines'])
+
+# A problem found while parsing, located by 1-based line number in the file
+ParseError = namedtuple('ParseError', ['line', 'question_id', 'message'])
+
+
+def split_blocks(lines, first_line=1):
+    """Group lines into question blocks at each `# Question N` header
+    
+    Lines before the first header are ignored. Blocks are numbered in order,
+    so a question's id is its position in the file.
+    """
+    blocks = []
+    current = None
+    for number, line in enumerate(lines, first_line):
+        if line.startswith(HEADER_PREFIX):
+            match = HEADER_PATTERN.match(line)
+            if match:
+                current = [line[match.end():]]
+                blocks.append(QuestionBlock(len(blocks) + 1, number, current))
+                continue
+        if current is not None:
+            current.append(line)
+    return blocks
+
+
+def parse_questions(content):
+    """Parse Markdown content into question dicts
+    
+    Returns:
+        tuple: (questions, errors) where errors lists ParseError entries
+    """
+    questions = []
+    errors = []
+    for block in split_blocks(content.split('\n')):
+        question, block_errors = parse_block(block)
+        if question is not None:
+            questions.append(question)
+        errors.extend(block_errors)
+    return questions, errors
+
+
+class IncrementalParser:
+    """Parser that re-parses only the question blocks changed since its last call
+    
+    Blocks are found with one scan for headers and keyed by a hash of their
+    text; only blocks missing from the previous call are split into lines
+    and parsed. Reused results get the question id and error lines of
+    wherever the block now sits in the file.
+    """
+    
+    def __init__(self):
+        self.blocks = {}
+        self.reparsed = []
+    
+    def parse(self, content):
+        """Parse Markdown content like parse_questions, reusing unchanged blocks
+        
+        The ids of the questions whose blocks had to be parsed are kept in
+        reparsed.
+        
+        Returns:
+            tuple: (questions, errors) where errors lists ParseError entries
+        """
+        questions = []
+        errors = []
+        blocks = {}
+        self.reparsed = []
+        for question_id, (line, text) in enumerate(_block_texts(content), 1):
+            # Trailing whitespace never changes the result; ignoring it keeps the last block's
+            # hash stable when questions are appended after it
+            digest = hashlib.blake2b(text.rstrip().encode('utf-8'), digest_size=16).digest()
+            cached = blocks.get(digest) or self.blocks.get(digest)
+            if cached is None:
+                question, block_errors = parse_block(QuestionBlock(question_id, line, text.split('\n')))
+                self.reparsed.append(question_id)
+            else:
+                question, block_errors = _rebase(question_id, line, *cached)
+            blocks[digest] = (question_id, line, question, block_errors)
+            
+            if question is not None:
+                questions.append(question)
+            errors.extend(block_errors)
+        
+        self.blocks = blocks
+        return questions, errors
+
+
+def _block_texts(content):
+    """Yield (header line number, block text) for the blocks split_blocks would find"""
+    # With a newline prepended so the first line can match, match.start() is the header's offset in content
+    headers = [(match.start(), match.end() - 1) for match in HEADER_LINE_PATTERN.finditer('\n' + content)]
+    line = 1
+    position = 0
+    for i, (start, end) in enumerate(headers):
+        line += content.count('\n', position, start)
+        position = start
+        # A block ends before the newline that starts the next header's line
+        stop = headers[i + 1][0] - 1 if i + 1 < len(headers) else len(content)
+        yield line, content[end:stop]
+
+
+def _rebase(question_id, line, parsed_id, parsed_line, question, errors):
+    """Move a cached block result to the block's current id and line"""
+    if (parsed_id, parsed_line) == (question_id, line):
+        return question, errors
+    
+    shift = line - parsed_line
+    if question is not None:
+        question = dict(question, id=question_id)
+    errors = [error._replace(line=error.line + shift, question_id=question_id) for error in errors]
+    return question, errors
+
+
+def parse_block(block):
+    """Parse one question block
+    
+    Missing or malformed fields fall back to defaults and are reported as
+    errors; a block that cannot be parsed at all yields no question.
+    
+    Returns:
+        tuple: (question dict or None, list of ParseError)
+    """
+    errors = []
+    try:
+        question = _parse_block(block, errors)
+    except Exception as e:
+        errors.append(ParseError(block.line, block.question_id, f"Unparseable question: {e}"))
+        question = None
+    return question, errors
+
+
+def _parse_block(block, errors):
+    """Scan a block once for its markers, then slice out each field"""
+    lines, offset = _trim(block.lines)
+    
+    def report(index, message):
+        line = block.line + offset + index if index is not None else block.line
+        errors.append(ParseError(line, block.question_id, message))
+    
+    # The one scan: the first line starting with each metadata marker, and every
+    # line containing each section marker
+    metadata = {}
+    markers = {marker: [] for marker in SECTION_MARKERS}
+    for index, line in enumerate(lines):
+        if '**' not in line:
+            continue
+        stripped = line.strip()
+        for marker in METADATA_MARKERS:
+            if marker not in metadata and stripped.startswith(marker):
+                metadata[marker] = index
+        for marker in SECTION_MARKERS:
+            if marker in stripped:
+                markers[marker].append(index)
+    
+    topic = _metadata(lines, metadata, TOPIC)
+    if TOPIC not in metadata:
+        report(None, f"Missing {TOPIC}")
+    
+    difficulty_text = _metadata(lines, metadata, DIFFICULTY)
+    difficulty_match = DIGITS_PATTERN.search(difficulty_text)
+    if difficulty_match:
+        difficulty = int(difficulty_match.group(1))
+    else:
+        difficulty = DEFAULT_DIFFICULTY
+        report(metadata.get(DIFFICULTY), f"Missing difficulty number, using {DEFAULT_DIFFICULTY}")
+    
+    scenario_text = _section(lines, markers, SCENARIO, QUESTION)
+    question_text = _section(lines, markers, QUESTION, OPTIONS)
+    if not question_text.strip():
+        # Without a Question section the scenario runs on; keep the text before the options
+        question_lines = []
+        for line in scenario_text.strip().split('\n'):
+            if line.strip().startswith(QUESTION_TERMINATORS):
+                break
+            question_lines.append(line)
+        full_question = '\n'.join(question_lines).strip()
+    else:
+        full_question = f"{scenario_text.strip()}\n\n{question_text.strip()}"
+    
+    listed_options = parse_options(_section(lines, markers, OPTIONS, CORRECT_ANSWER), limit=None)
+    options = listed_options[:MAX_OPTIONS]
+    if not markers[OPTIONS]:
+        report(None, f"Missing {OPTIONS}")
+    elif len(listed_options) < MIN_OPTIONS:
+        report(markers[OPTIONS][0], f"Expected at least {MIN_OPTIONS} options, found {len(listed_options)}")
+    elif len(listed_options) > MAX_OPTIONS:
+        report(markers[OPTIONS][0], f"Found {len(listed_options)} options, keeping the first {MAX_OPTIONS}")
+    
+    correct_answer_text = _metadata(lines, metadata, CORRECT_ANSWER)
+    correct_answer = parse_correct_answer(correct_answer_text)
+    if CORRECT_ANSWER not in metadata:
+        report(None, f"Missing {CORRECT_ANSWER}, using A")
+    elif correct_answer_text.strip().upper() not in ANSWER_NUMBERS:
+        report(metadata[CORRECT_ANSWER], f"Unrecognized correct answer {correct_answer_text!r}, using A")
+    elif options and correct_answer > len(options):
+        report(metadata[CORRECT_ANSWER], f"Correct answer {correct_answer_text} has no matching option")
+    
+    explanation = _section(lines, markers, EXPLANATION, None)
+    
+    return {
+        'id': block.question_id,
+        'question': full_question,
+        'options': options,
+        'correct_answer': correct_answer,
+        'explanation': explanation.strip(),
+        'topic': topic.strip(),
+        'difficulty': difficulty
+    }
+
+
+def _trim(lines):
+    """Strip leading and trailing whitespace from a block as a whole
+    
+    Returns:
+        tuple: (trimmed lines, index of the first kept line in the block)
+    """
+    first = 0
+    last = len(lines) - 1
+    while first <= last and not lines[first].strip():
+        first += 1
+    while last >= first and not lines[last].strip():
+        last -= 1
+    if first > last:
+        return [''], 0
+    
+    trimmed = lines[first:last + 1]
+    trimmed[0] = trimmed[0].lstrip()
+    trimmed[-1] = trimmed[-1].rstrip()
+    return trimmed, first
+
+
+def _metadata(lines, metadata, marker):
+    """Get the value of a `**Marker:** value` line, or '' if absent"""
+    index = metadata.get(marker)
+    if index is None:
+        return ""
+    return lines[index].replace(marker, '').strip()
+
+
+def _section(lines, markers, start_marker, end_marker):
+    """Get the text after the first start marker line, up to the first end marker line
+    
+    Further lines containing the start marker are skipped, and an end marker
+    before any start marker ends the section empty.
+    """
+    starts = markers[start_marker]
+    if not starts:
+        return ""
+    
+    stop = len(lines)
+    if end_marker:
+        for index in markers[end_marker]:
+            if index not in starts:
+                stop = index
+                break
+    if starts[0] >= stop:
+        return ""
+    
+    if len(starts) == 1:
+        content = lines[starts[0] + 1:stop]
+    else:
+        content = [lines[i] for i in range(starts[0] + 1, stop) if i not in starts]
+    result = '\n'.join(content).strip()
+    
+    if '```' in result:
+        # Keep fenced code blocks tight for the front end's code formatting
+        result = re.sub(r'```\s*\n', '```\n', result)
+        result = re.sub(r'\n\s*```', '\n```', result)
+    
+    return result
+
+
+def parse_options(options_text, limit=MAX_OPTIONS):
+    """Parse `A. option` lines into option strings, keeping at most limit of them"""
+    options = []
+    for line in options_text.strip().split('\n'):
+        line = line.strip()
+        if OPTION_PATTERN.match(line):
+            options.append(line[2:].strip())  # Remove "A. " prefix
+    return options[:limit] if limit else options
+
+
+def parse_correct_answer(answer_text):
+    """Parse a correct answer letter or number into a 1-based option number (A=1, B=2, etc.)"""
+    if not answer_text:
+        return 1
+    return ANSWER_NUMBERS.get(answer_text.strip().upper(), 1)
@@ -4,274 +4,179 @@ Markdown-based Question Repository for dbt Certification Quiz
 Provides beautiful formatting for human reading while maintaining CSV compatibility.
 """
 
-import re
 import csv
-import json
+import logging
 import random
+import threading
 from pathlib import Path
-from datetime import datetime
+
+from .markdown_parser import IncrementalParser, parse_questions
+from .question_artifact import (
+    compile_question_bank, decode_markdown, default_artifact_path, open_compiled_store, source_hash
+)
+from .question_index import DIFFICULTY_LEVELS, QuestionIndex
+from .question_watcher import QuestionFileWatcher
+
+logger = logging.getLogger(__name__)
 
 class MarkdownQuestionRepository:
-    def __init__(self, md_file=None, csv_file=None):
+    def __init__(self, md_file=None, csv_file=None, artifact_file=None, watch=False, watch_interval=1.0):
         # Use default paths if not provided
         if md_file is None:
             md_file = Path(__file__).parent.parent.parent.parent / 'data' / 'questions.md'
         if csv_file is None:
             csv_file = Path(__file__).parent.parent.parent.parent / 'data' / 'questions.csv'
+        if artifact_file is None:
+            artifact_file = default_artifact_path(md_file)
         self.md_file = md_file
         self.csv_file = csv_file
-        self.questions = self.load_questions_from_markdown()
+        self.artifact_file = artifact_file
+        self.parse_errors = []
+        self.store = None
+        self.source_sha256 = None
+        self.block_parser = None
+        self.watcher = None
+        self.reload_lock = threading.Lock()
+        self.index = self.load_question_index()
         self.next_id = self.get_next_id()
+        if watch:
+            self.start_watching(watch_interval)
     
-    def load_questions_from_markdown(self):
-        """Load questions from Markdown file"""
-        questions = {
-            'easy': [],
-            'medium': [],
-            'difficult': [],
-            'critical': []
-        }
-        
+    @property
+    def questions(self):
+        """Questions per difficulty level, as read-only lists of dicts"""
+        return self.index.questions
+    
+    def load_question_index(self):
+        """Load the question index from the compiled store or the Markdown file"""
         if not Path(self.md_file).exists():
             print(f"⚠️  Markdown file {self.md_file} not found. Creating empty repository.")
-            return questions
+            return QuestionIndex.from_parsed([], self.get_difficulty_level)
         
         try:
-            with open(self.md_file, 'r', encoding='utf-8') as file:
-                content = file.read()
+            with open(self.md_file, 'rb') as file:
+                raw = file.read()
+            self.source_sha256 = source_hash(raw)
             
-            # Split into individual questions
-            question_blocks = self.parse_markdown_questions(content)
+            # Serve questions straight from the compiled store when it was built from this exact Markdown
+            self.store = open_compiled_store(self.artifact_file, self.source_sha256)
+            if self.store is not None:
+                index = QuestionIndex.from_store(self.store, self.get_difficulty_level)
+                print(f"✅ Mapped {len(index)} questions from {self.artifact_file}")
+                return index
             
-            for question_data in question_blocks:
-                if question_data:
-                    question = {
-                        'id': question_data['id'],
-                        'question': question_data['question'],
-                        'options': question_data['options'],
-                        'correctAnswer': question_data['correct_answer'] - 1,  # Convert to 0-based index
-                        'explanation': question_data['explanation'],
-                        'topic': question_data['topic'],
-                        'difficulty': question_data['difficulty']
-                    }
-                    
-                    # Add to appropriate difficulty level
-                    difficulty_level = self.get_difficulty_level(question_data['difficulty'])
-                    questions[difficulty_level].append(question)
-            
-            print(f"✅ Loaded {sum(len(q) for q in questions.values())} questions from {self.md_file}")
+            index = QuestionIndex.from_parsed(
+                self.parse_markdown_questions(decode_markdown(raw)), self.get_difficulty_level
+            )
+            print(f"✅ Loaded {len(index)} questions from {self.md_file}")
+            return index
             
         except Exception as e:
             print(f"❌ Error loading Markdown file: {e}")
-            return questions
-        
-        return questions
+            return QuestionIndex.from_parsed([], self.get_difficulty_level)
     
     def parse_markdown_questions(self, content):
-        """Parse markdown content into question objects"""
-        questions = []
+        """Parse markdown content into question objects
         
-        # Split by question headers
-        question_sections = re.split(r'^# Question \d+', content, flags=re.MULTILINE)
+        Problems are logged with their line numbers and kept in parse_errors.
+        """
+        questions, self.parse_errors = parse_questions(content)
         
-        for i, section in enumerate(question_sections[1:], 1):  # Skip first empty section
-            try:
-                question_data = self.parse_single_question(section, i)
-                if question_data:
-                    questions.append(question_data)
-            except Exception as e:
-                print(f"⚠️  Error parsing question {i}: {e}")
-                continue
+        for error in self.parse_errors:
+            logger.warning(f"{self.md_file}:{error.line}: Question {error.question_id}: {error.message}")
         
         return questions
     
-    def parse_single_question(self, section, question_id):
-        """Parse a single question section"""
-        lines = section.strip().split('\n')
-        
-        # Extract metadata
-        topic = self.extract_metadata(lines, '**Topic:**')
-        difficulty_text = self.extract_metadata(lines, '**Difficulty:**')
-        
-        # Parse difficulty (extract number from "2 (Medium)")
-        difficulty_match = re.search(r'(\d+)', difficulty_text)
-        difficulty = int(difficulty_match.group(1)) if difficulty_match else 2
-        
-        # Extract scenario and question text
-        scenario_text = self.extract_section(lines, '**Scenario:**', '**Question:**')
-        question_text = self.extract_section(lines, '**Question:**', '**Options:**')
-        
-        # If there's no separate Question section, use the scenario text as the question
-        if not question_text.strip():
-            # The scenario contains the question text - extract only the question part
-            # Look for the actual question in the scenario text
-            scenario_lines = scenario_text.strip().split('\n')
-            question_lines = []
-            for line in scenario_lines:
-                line_stripped = line.strip()
-                # Stop when we hit the Options section
-                if line_stripped.startswith('**Options:**'):
-                    break
-                # Stop when we hit the Correct Answer section
-                if line_stripped.startswith('**Correct Answer:**'):
-                    break
-                # Stop when we hit the Explanation section
-                if line_stripped.startswith('**Explanation:**'):
-                    break
-                question_lines.append(line)
+    def reload_questions(self):
+        """Re-read the Markdown file and swap in a new index if it changed
+        
+        Only the `# Question N` blocks whose text changed since the last
+        reload are parsed again. The first call parses every block to fill
+        the block cache. Readers holding the previous index are unaffected.
+        
+        Returns:
+            bool: True if a new index was swapped in
+        """
+        with self.reload_lock:
+            with open(self.md_file, 'rb') as file:
+                raw = file.read()
+            digest = source_hash(raw)
+            if digest == self.source_sha256 and self.block_parser is not None:
+                return False
             
-            full_question = '\n'.join(question_lines).strip()
-        else:
-            # Combine scenario and question for the full question text
-            full_question = f"{scenario_text.strip()}\n\n{question_text.strip()}"
-        
-        # Extract options
-        options_text = self.extract_section(lines, '**Options:**', '**Correct Answer:**')
-        options = self.parse_options(options_text)
-        
-        # Extract correct answer
-        correct_answer_text = self.extract_metadata(lines, '**Correct Answer:**')
-        correct_answer = self.parse_correct_answer(correct_answer_text)
-        
-        # Extract explanation
-        explanation = self.extract_section(lines, '**Explanation:**', None)
-        
-        return {
-            'id': question_id,
-            'question': full_question,
-            'options': options,
-            'correct_answer': correct_answer,
-            'explanation': explanation.strip(),
-            'topic': topic.strip(),
-            'difficulty': difficulty
-        }
-    
-    def extract_metadata(self, lines, prefix):
-        """Extract metadata from lines"""
-        for line in lines:
-            if line.strip().startswith(prefix):
-                return line.replace(prefix, '').strip()
-        return ""
-    
-    def extract_section(self, lines, start_marker, end_marker):
-        """Extract section between markers"""
-        content = []
-        in_section = False
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
+            if self.block_parser is None:
+                self.block_parser = IncrementalParser()
+            questions, parse_errors = self.block_parser.parse(decode_markdown(raw))
             
-            # Check for start marker (contains the marker)
-            if start_marker in line_stripped:
-                in_section = True
-                continue
-            # Check for end marker (contains the marker)
-            elif end_marker and end_marker in line_stripped:
-                break
-            elif in_section:
-                content.append(line)
-        
-        # Join content and clean up extra whitespace
-        result = '\n'.join(content).strip()
-        
-        # Remove leading/trailing empty lines
-        result = re.sub(r'^\n+', '', result)
-        result = re.sub(r'\n+$', '', result)
-        
-        # Preserve markdown code blocks by ensuring they have proper spacing
-        # This ensures that ```...``` blocks are properly formatted for the JavaScript function
-        result = re.sub(r'```\s*\n', '```\n', result)  # Clean up spacing after opening ```
-        result = re.sub(r'\n\s*```', '\n```', result)  # Clean up spacing before closing ```
-        
-        return result
+            if digest == self.source_sha256:
+                return False  # Only filled the block cache
+            
+            reparsed = set(self.block_parser.reparsed)
+            for error in parse_errors:
+                if error.question_id in reparsed:
+                    logger.warning(f"{self.md_file}:{error.line}: Question {error.question_id}: {error.message}")
+            
+            index = QuestionIndex.from_parsed(questions, self.get_difficulty_level)
+            self.parse_errors = parse_errors
+            self.index = index
+            self.store = None  # Stale; readers of the old index keep it mapped until they are done
+            self.source_sha256 = digest
+            self.next_id = self.get_next_id()
+            logger.info(
+                f"Reloaded {len(index)} questions from {self.md_file}, re-parsed {len(reparsed)} changed blocks"
+            )
+            return True
     
-    def parse_options(self, options_text):
-        """Parse options from text"""
-        options = []
-        lines = options_text.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^[A-E]\.', line):
-                option = line[2:].strip()  # Remove "A. " prefix
-                options.append(option)
-        
-        return options[:5]  # Ensure exactly 5 options
+    def start_watching(self, interval=1.0, use_inotify=True):
+        """Reload questions in the background whenever the Markdown file changes"""
+        if self.watcher is None:
+            self.watcher = QuestionFileWatcher(
+                self.md_file, self.reload_questions, interval=interval, use_inotify=use_inotify
+            ).start()
+        return self.watcher
     
-    def parse_correct_answer(self, answer_text):
-        """Parse correct answer (A=1, B=2, etc.)"""
-        if not answer_text:
-            return 1
-        
-        answer = answer_text.strip().upper()
-        if answer in ['A', '1']:
-            return 1
-        elif answer in ['B', '2']:
-            return 2
-        elif answer in ['C', '3']:
-            return 3
-        elif answer in ['D', '4']:
-            return 4
-        elif answer in ['E', '5']:
-            return 5
-        else:
-            return 1
+    def stop_watching(self):
+        """Stop reloading questions on file changes"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
     
     def get_next_id(self):
         """Get the next available question ID"""
-        max_id = 0
-        for difficulty_questions in self.questions.values():
-            for question in difficulty_questions:
-                if question['id'] > max_id:
-                    max_id = question['id']
-        return max_id + 1
+        return self.index.max_question_id + 1
     
     def get_questions(self, num_questions, difficulty):
         """Get random questions from the repository with flexible selection"""
+        index = self.index
         if difficulty == 0:
             # No preference - get questions from all difficulty levels
-            all_questions = []
-            for difficulty_questions in self.questions.values():
-                all_questions.extend(difficulty_questions)
-            available_questions = all_questions
-            selected_questions = random.sample(available_questions, min(num_questions, len(available_questions)))
+            positions = index.sample(DIFFICULTY_LEVELS, num_questions)
         else:
             difficulty_level = self.get_difficulty_level(difficulty)
-            primary_questions = self.questions[difficulty_level]
-            
-            # Get all questions from other difficulty levels for fallback
-            other_questions = []
-            for diff, questions in self.questions.items():
-                if diff != difficulty_level:
-                    other_questions.extend(questions)
-            
-            # Calculate how many questions we can get from the selected difficulty
-            questions_from_selected = min(num_questions, len(primary_questions))
-            remaining_needed = num_questions - questions_from_selected
             
             # Select questions from the chosen difficulty
-            selected_questions = random.sample(primary_questions, questions_from_selected)
+            positions = index.sample([difficulty_level], num_questions)
             
             # If we need more questions, get them from other difficulties
-            if remaining_needed > 0 and other_questions:
-                additional_questions = random.sample(other_questions, min(remaining_needed, len(other_questions)))
-                selected_questions.extend(additional_questions)
-        
-        # Create deep copies and shuffle options for each question
-        for i, question in enumerate(selected_questions):
-            question_copy = question.copy()
-            question_copy['options'] = question['options'].copy()
-            question_copy['options'], question_copy['correctAnswer'] = self.shuffle_options(
-                question_copy['options'], question_copy['correctAnswer']
+            remaining_needed = num_questions - len(positions)
+            if remaining_needed > 0:
+                other_levels = [level for level in DIFFICULTY_LEVELS if level != difficulty_level]
+                positions.extend(index.sample(other_levels, remaining_needed))
+        
+        # Build dicts only for the selected questions and shuffle their options
+        selected_questions = []
+        for position in positions:
+            question = index.question(position)
+            question['options'], question['correctAnswer'] = self.shuffle_options(
+                question['options'], question['correctAnswer']
             )
-            # Update the question in the list
-            selected_questions[i] = question_copy
+            selected_questions.append(question)
         
         return selected_questions
     
     def shuffle_options(self, options, correct_answer_index):
         """Shuffle options while keeping correct answer in place"""
-        options_copy = options.copy()
+        options_copy = list(options)
         correct_answer = options_copy[correct_answer_index]
         
         # Remove correct answer and shuffle others
@@ -331,17 +236,11 @@ E. {options[4]}
         
         # Also add to memory
         difficulty_level = self.get_difficulty_level(difficulty)
-        question_obj = {
-            'id': self.next_id,
-            'question': question_text,
-            'options': options,
-            'correctAnswer': correct_answer_index,
-            'explanation': explanation,
-            'topic': topic,
-            'difficulty': difficulty
-        }
-        
-        self.questions[difficulty_level].append(question_obj)
+        self.index = self.index.with_question(
+            self.next_id, question_text, options, correct_answer_index, explanation, topic, difficulty,
+            difficulty_level
+        )
+        question_obj = self.index.question(len(self.index) - 1)
         self.next_id += 1
         
         print(f"✅ Question added successfully to Markdown!")
@@ -511,6 +410,12 @@ if __name__ == "__main__":
     elif len(sys.argv) > 1 and sys.argv[1] == "export-csv":
         repo = MarkdownQuestionRepository()
         repo.export_to_csv()
+    elif len(sys.argv) > 1 and sys.argv[1] == "compile":
+        md_file = Path(__file__).parent.parent.parent.parent / 'data' / 'questions.md'
+        artifact_file, questions, errors = compile_question_bank(md_file)
+        for error in errors:
+            print(f"⚠️  {md_file}:{error.line}: Question {error.question_id}: {error.message}")
+        print(f"✅ Compiled {len(questions)} questions to {artifact_file}")
     else:
         # Create sample if file doesn't exist
         if not Path('data/questions.md').exists():
@@ -525,5 +430,6 @@ if __name__ == "__main__":
         print(f"📚 Medium (2): {stats['medium']}")
         print(f"📚 Difficult (3): {stats['difficult']}")
         print(f"📚 Critical (4): {stats['critical']}")
-        print("\n💡 To create sample questions, run: python markdown_question_repository.py create-sample")
-        print("💡 To export to CSV, run: python markdown_question_repository.py export-csv")
+        print("\n💡 To create sample questions, run: python -m src.quiz_app.repo.markdown_repository create-sample")
+        print("💡 To export to CSV, run: python -m src.quiz_app.repo.markdown_repository export-csv")
+        print("💡 To compile the question bank, run: python -m src.quiz_app.repo.markdown_repository compile")
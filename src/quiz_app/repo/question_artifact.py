@@ -0,0 +1,89 @@
+"""
+Precompiled question bank artifact
+
+`compile` turns questions.md into a memory-mappable question store (see
+question_store) stamped with the SHA-256 of the Markdown it came from.
+Opening it only maps the file, so worker start-up and memory no longer grow
+with the size of the bank; whenever the stamp does not match the current
+Markdown, the repository parses the Markdown instead.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from .markdown_parser import PARSER_VERSION, parse_questions
+from .question_store import MappedQuestionStore, build_question_store
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes; PARSER_VERSION covers parsing changes
+ARTIFACT_FORMAT = 2
+ARTIFACT_SUFFIX = '.qbank'
+
+
+def default_artifact_path(md_file):
+    """Get the artifact path next to a Markdown question file"""
+    return Path(md_file).with_suffix(ARTIFACT_SUFFIX)
+
+
+def source_hash(raw):
+    """Get the stamp identifying the Markdown source an artifact was compiled from"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def decode_markdown(raw):
+    """Decode Markdown bytes the way text-mode open() reads them"""
+    return raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def compile_question_bank(md_file, artifact_file=None):
+    """Parse a Markdown question file and write its compiled artifact
+    
+    Returns:
+        tuple: (artifact path, questions, parse errors)
+    """
+    artifact_file = Path(artifact_file) if artifact_file else default_artifact_path(md_file)
+    raw = Path(md_file).read_bytes()
+    questions, errors = parse_questions(decode_markdown(raw))
+    
+    payload = build_question_store(questions, ARTIFACT_FORMAT, PARSER_VERSION, source_hash(raw))
+    
+    # Write atomically so workers starting meanwhile never read a partial artifact
+    fd, tmp_path = tempfile.mkstemp(dir=artifact_file.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, artifact_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    
+    return artifact_file, questions, errors
+
+
+def open_compiled_store(artifact_file, expected_hash):
+    """Map an artifact compiled from the expected source
+    
+    Returns:
+        MappedQuestionStore: The store, or None if the artifact is missing, stale or unreadable
+    """
+    try:
+        store = MappedQuestionStore(artifact_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable question artifact {artifact_file}: {e}")
+        return None
+    
+    if (store.store_format, store.parser_version, store.source_sha256) != (
+        ARTIFACT_FORMAT, PARSER_VERSION, expected_hash
+    ):
+        logger.info(f"Question artifact {artifact_file} is stale; parsing Markdown instead")
+        store.close()
+        return None
+    
+    return store
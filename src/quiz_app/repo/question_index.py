@@ -0,0 +1,171 @@
+"""
+Compact in-memory index of the question bank
+
+Each question is a slotted, immutable QuestionRecord whose topic is interned
+to a small integer id, and every difficulty level is an array of record
+positions. Selecting questions samples positions, so only the questions that
+are actually served are turned into the dicts the quiz API returns.
+"""
+import bisect
+import random
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+from itertools import accumulate
+
+DIFFICULTY_LEVELS = ('easy', 'medium', 'difficult', 'critical')
+
+
+class QuestionRecord(namedtuple('QuestionRecord', [
+    'id', 'question', 'options', 'correct_answer', 'explanation', 'topic_id', 'difficulty'
+])):
+    """One question; options are a tuple and correct_answer is 0-based"""
+    __slots__ = ()
+
+
+class StoredRecords(Sequence):
+    """Question records of a mapped store, decoded as they are accessed"""
+    
+    def __init__(self, store):
+        self.store = store
+        self.topic_ids = {topic: topic_id for topic_id, topic in enumerate(store.topics)}
+    
+    def __len__(self):
+        return len(self.store)
+    
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        
+        question_id, question, options, correct_answer, explanation, topic, difficulty = \
+            self.store.record(position)
+        return QuestionRecord(
+            question_id, question, tuple(options), correct_answer - 1,  # Convert to 0-based index
+            explanation, self.topic_ids[topic], difficulty
+        )
+
+
+class QuestionList(Sequence):
+    """Read-only list of question dicts for one difficulty level, built as they are accessed"""
+    
+    def __init__(self, index, positions):
+        self.index = index
+        self.positions = positions
+    
+    def __len__(self):
+        return len(self.positions)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.index.question(self.positions[index])
+
+
+class QuestionIndex:
+    """Question records with interned topics and per-difficulty position arrays
+    
+    An index is never modified once built; changes produce a new index, so
+    readers holding the old one keep a consistent view.
+    """
+    
+    def __init__(self, records, topics, levels, max_question_id):
+        self.records = records
+        self.topics = topics
+        self.levels = levels
+        self.max_question_id = max_question_id
+        self.questions = {level: QuestionList(self, positions) for level, positions in levels.items()}
+    
+    @classmethod
+    def from_parsed(cls, parsed, level_of):
+        """Build an index from parser question dicts
+        
+        Args:
+            parsed (list): Parser question dicts, in file order
+            level_of (callable): Maps a numeric difficulty to its level name
+        """
+        records = []
+        topics = []
+        topic_ids = {}
+        levels = {level: array('I') for level in DIFFICULTY_LEVELS}
+        
+        for question in parsed:
+            topic_id = topic_ids.get(question['topic'])
+            if topic_id is None:
+                topic_id = topic_ids[question['topic']] = len(topics)
+                topics.append(question['topic'])
+            
+            levels[level_of(question['difficulty'])].append(len(records))
+            records.append(QuestionRecord(
+                question['id'], question['question'], tuple(question['options']),
+                question['correct_answer'] - 1,  # Convert to 0-based index
+                question['explanation'], topic_id, question['difficulty']
+            ))
+        
+        return cls(records, topics, levels, max((r.id for r in records), default=0))
+    
+    @classmethod
+    def from_store(cls, store, level_of):
+        """Build an index over a mapped question store without decoding its questions"""
+        groups = {level: [] for level in DIFFICULTY_LEVELS}
+        for difficulty, positions in sorted(store.difficulty_positions.items()):
+            groups[level_of(difficulty)].append(positions)
+        
+        levels = {}
+        for level, level_groups in groups.items():
+            if len(level_groups) == 1:
+                levels[level] = level_groups[0]  # Read straight from the mapping
+            else:
+                levels[level] = array('I')
+                for positions in level_groups:
+                    levels[level].extend(positions)
+        
+        return cls(StoredRecords(store), store.topics, levels, store.max_question_id)
+    
+    def with_question(self, question_id, question, options, correct_answer, explanation, topic, difficulty, level):
+        """Get a new index with one more question appended to a level"""
+        topics = list(self.topics)
+        if topic in topics:
+            topic_id = topics.index(topic)
+        else:
+            topic_id = len(topics)
+            topics.append(topic)
+        
+        records = list(self.records)
+        levels = {name: array('I', positions) for name, positions in self.levels.items()}
+        levels[level].append(len(records))
+        records.append(QuestionRecord(
+            question_id, question, tuple(options), correct_answer, explanation, topic_id, difficulty
+        ))
+        
+        return QuestionIndex(records, topics, levels, max(self.max_question_id, question_id))
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def sample(self, levels, count):
+        """Pick up to count distinct record positions, uniformly, from the given levels"""
+        groups = [self.levels[level] for level in levels]
+        ends = list(accumulate(len(positions) for positions in groups))
+        total = ends[-1] if ends else 0
+        
+        picks = []
+        for ordinal in random.sample(range(total), min(count, total)):
+            i = bisect.bisect_right(ends, ordinal)
+            picks.append(groups[i][ordinal - (ends[i - 1] if i else 0)])
+        return picks
+    
+    def question(self, position):
+        """Build a fresh API dict for one record"""
+        record = self.records[position]
+        return {
+            'id': record.id,
+            'question': record.question,
+            'options': list(record.options),
+            'correctAnswer': record.correct_answer,
+            'explanation': record.explanation,
+            'topic': self.topics[record.topic_id],
+            'difficulty': record.difficulty
+        }
+
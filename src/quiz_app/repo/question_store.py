@@ -0,0 +1,203 @@
+"""
+Memory-mapped, read-only question store
+
+The compiled question bank is laid out to be used in place: fixed-width
+records hold each question's id, difficulty, topic id and answer index plus
+the offsets of its text in a UTF-8 string heap, and per-difficulty arrays
+list record positions. Workers map the file read-only, so every process
+shares one copy through the page cache and only decodes the questions it
+actually serves.
+
+Layout, little-endian, offsets from the start of the file:
+    header   HEADER
+    records  RECORD x record_count
+    topics   STRING_REF x topic_count
+    groups   GROUP x group_count, each pointing at a uint32 position array
+    heap     UTF-8 text referenced by (offset, length) pairs
+"""
+import mmap
+import sys
+from array import array
+from struct import Struct
+
+MAGIC = b'QBSTORE\x00'
+MAX_OPTIONS = 5
+
+# magic, store format, parser version, source SHA-256, record count, topic count,
+# group count, max question id, records/topics/groups/heap offsets
+HEADER = Struct('<8sHH32sIIIIIIII')
+# id, difficulty, correct answer (1-based), option count, topic id, then
+# (offset, length) heap references for question, explanation and options
+RECORD = Struct('<IHBBH2x' + 'II' * (2 + MAX_OPTIONS))
+STRING_REF = Struct('<II')
+GROUP = Struct('<H2xII')  # difficulty, position count, array offset
+POSITION = Struct('<I')
+
+UINT32_MAX = 2 ** 32 - 1
+
+
+class _Heap:
+    """UTF-8 string heap that stores each distinct string once"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.refs = {}
+    
+    def add(self, text):
+        ref = self.refs.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = (self.size, len(data))
+            self.refs[text] = ref
+            self.chunks.append(data)
+            self.size += len(data)
+            if self.size > UINT32_MAX:
+                raise ValueError("Question text exceeds the 4 GiB string heap")
+        return ref
+
+
+def build_question_store(questions, store_format, parser_version, source_sha256):
+    """Serialize parsed question dicts into the store layout
+    
+    Args:
+        questions (list): Parser question dicts, in file order
+        store_format (int): Layout version stamped in the header
+        parser_version (int): Parser version stamped in the header
+        source_sha256 (str): Hex SHA-256 of the Markdown the questions came from
+    
+    Returns:
+        bytes: Store file contents
+    """
+    heap = _Heap()
+    topic_ids = {}
+    topic_refs = []
+    groups = {}
+    records = bytearray()
+    
+    for position, question in enumerate(questions):
+        options = question['options']
+        if len(options) > MAX_OPTIONS:
+            raise ValueError(f"Question {question['id']} has more than {MAX_OPTIONS} options")
+        
+        topic_id = topic_ids.get(question['topic'])
+        if topic_id is None:
+            topic_id = topic_ids[question['topic']] = len(topic_refs)
+            topic_refs.append(heap.add(question['topic']))
+        
+        refs = [heap.add(question['question']), heap.add(question['explanation'])]
+        refs.extend(heap.add(option) for option in options)
+        refs.extend([(0, 0)] * (MAX_OPTIONS - len(options)))
+        
+        records += RECORD.pack(
+            question['id'], question['difficulty'], question['correct_answer'], len(options), topic_id,
+            *(value for ref in refs for value in ref)
+        )
+        groups.setdefault(question['difficulty'], []).append(position)
+    
+    records_offset = HEADER.size
+    topics_offset = records_offset + len(records)
+    groups_offset = topics_offset + STRING_REF.size * len(topic_refs)
+    arrays_offset = groups_offset + GROUP.size * len(groups)
+    
+    group_table = bytearray()
+    position_arrays = bytearray()
+    for difficulty in sorted(groups):
+        positions = groups[difficulty]
+        group_table += GROUP.pack(difficulty, len(positions), arrays_offset + len(position_arrays))
+        position_arrays += b''.join(POSITION.pack(position) for position in positions)
+    
+    heap_offset = arrays_offset + len(position_arrays)
+    header = HEADER.pack(
+        MAGIC, store_format, parser_version, bytes.fromhex(source_sha256),
+        len(questions), len(topic_refs), len(groups), max((q['id'] for q in questions), default=0),
+        records_offset, topics_offset, groups_offset, heap_offset
+    )
+    
+    return b''.join([
+        header, records, b''.join(STRING_REF.pack(*ref) for ref in topic_refs),
+        group_table, position_arrays, *heap.chunks
+    ])
+
+
+class MappedQuestionStore:
+    """Read-only view of a question store file mapped into memory
+    
+    Records are decoded on access. Topics are decoded once at open since
+    there are only a handful of them, and the per-difficulty position arrays
+    are read straight from the mapping.
+    """
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic, self.store_format, self.parser_version, source_sha256,
+                self.record_count, topic_count, group_count, self.max_question_id,
+                self._records_offset, topics_offset, groups_offset, self._heap_offset
+            ) = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a question store")
+            if self._records_offset + RECORD.size * self.record_count > topics_offset \
+                    or self._heap_offset > len(self._mmap):
+                raise ValueError(f"{path} is truncated")
+            self.source_sha256 = source_sha256.hex()
+            
+            self.topics = [
+                self._string(*STRING_REF.unpack_from(self._mmap, topics_offset + STRING_REF.size * i))
+                for i in range(topic_count)
+            ]
+            self.difficulty_positions = {}
+            for i in range(group_count):
+                difficulty, count, offset = GROUP.unpack_from(self._mmap, groups_offset + GROUP.size * i)
+                self.difficulty_positions[difficulty] = self._positions(offset, count)
+        except Exception:
+            self.close()
+            raise
+    
+    def __len__(self):
+        return self.record_count
+    
+    def _string(self, offset, length):
+        start = self._heap_offset + offset
+        return self._mmap[start:start + length].decode('utf-8')
+    
+    def _positions(self, offset, count):
+        """Get a uint32 position array, without copying on little-endian hosts"""
+        data = memoryview(self._mmap)[offset:offset + POSITION.size * count]
+        if sys.byteorder == 'little':
+            return data.cast('I')
+        positions = array('I')
+        positions.frombytes(data)
+        positions.byteswap()
+        return positions
+    
+    def _fields(self, position):
+        if not 0 <= position < self.record_count:
+            raise IndexError(position)
+        return RECORD.unpack_from(self._mmap, self._records_offset + RECORD.size * position)
+    
+    def record(self, position):
+        """Decode one question
+        
+        Returns:
+            tuple: (id, question, options, correct_answer, explanation, topic, difficulty)
+        """
+        fields = self._fields(position)
+        question_id, difficulty, correct_answer, option_count, topic_id = fields[:5]
+        refs = fields[5:]
+        options = [self._string(refs[i], refs[i + 1]) for i in range(4, 4 + 2 * option_count, 2)]
+        return (
+            question_id, self._string(refs[0], refs[1]), options, correct_answer,
+            self._string(refs[2], refs[3]), self.topics[topic_id], difficulty
+        )
+    
+    def close(self):
+        """Release the mapping; views taken from it must not be used afterwards"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Position arrays still reference it; it is unmapped once they are gone
+            self._mmap = None
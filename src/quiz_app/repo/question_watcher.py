@@ -0,0 +1,161 @@
+"""
+File watcher for hot-reloading the question bank
+
+On Linux the watcher listens for inotify events on the file's directory
+through libc, which also catches editors and deploys that replace the file
+by renaming over it. Elsewhere, or when inotify is unavailable, it polls the
+file's size, mtime and inode. Either way the callback runs in the watcher's
+own thread, so requests keep being served while it works.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+# Wait this long after an event for more to arrive, so one save reloads once
+SETTLE_SECONDS = 0.05
+
+
+def _open_inotify(directory):
+    """Watch a directory with inotify
+    
+    Returns:
+        int: The inotify file descriptor, or None if inotify is unavailable
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError) as e:
+        logger.info(f"inotify unavailable, polling instead: {e}")
+        return None
+    if fd < 0:
+        logger.info(f"inotify_init1 failed, polling instead: {os.strerror(ctypes.get_errno())}")
+        return None
+    
+    if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+        logger.info(f"Cannot watch {directory} with inotify, polling instead: {os.strerror(ctypes.get_errno())}")
+        os.close(fd)
+        return None
+    return fd
+
+
+def _file_state(path):
+    """Get what polling compares to notice a change"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class QuestionFileWatcher:
+    """Calls on_change from a background thread whenever a file changes
+    
+    on_change also runs once when watching starts, to pick up edits made
+    before the watcher was running.
+    """
+    
+    def __init__(self, path, on_change, interval=1.0, use_inotify=True):
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start watching in a daemon thread"""
+        fd = _open_inotify(self.path.parent) if self.use_inotify else None
+        self.mode = 'inotify' if fd is not None else 'polling'
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(fd,), name=f"question-watcher:{self.path.name}", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {self.path} for changes ({self.mode})")
+        return self
+    
+    def stop(self, timeout=None):
+        """Stop watching and wait for the thread to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"Error reloading {self.path}: {e}")
+    
+    def _run(self, fd):
+        try:
+            if fd is not None:
+                self._watch_inotify(fd)
+            else:
+                self._watch_polling()
+        finally:
+            if fd is not None:
+                os.close(fd)
+    
+    def _watch_polling(self):
+        state = _file_state(self.path)
+        self._notify()
+        while not self._stop.wait(self.interval):
+            current = _file_state(self.path)
+            if current != state:
+                state = current
+                self._notify()
+    
+    def _watch_inotify(self, fd):
+        self._notify()
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], self.interval)
+            if not ready or not self._read_events(fd):
+                continue
+            
+            # Let the rest of a multi-step save land before reloading once
+            while select.select([fd], [], [], SETTLE_SECONDS)[0]:
+                self._read_events(fd)
+            self._notify()
+    
+    def _read_events(self, fd):
+        """Drain pending inotify events
+        
+        Returns:
+            bool: True if any of them concern the watched file
+        """
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        
+        name = os.fsencode(self.path.name)
+        changed = False
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            event_name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW or event_name == name:
+                changed = True
+        return changed
@@ -2,6 +2,7 @@
 Flask routes for dbt Certification Quiz Application
 """
 import json
+import hashlib
 import logging
 import time
 from flask import Blueprint, render_template, request, jsonify, current_app, redirect, url_for, session
@@ -16,6 +17,17 @@ api_bp = Blueprint('api', __name__, url_prefix='/api')
 # Setup logging
 logger = logging.getLogger(__name__)
 
+
+def cached_json_response(payload, etag):
+    """JSON response with an ETag, or 304 Not Modified if the client already has it"""
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 # Context processor to pass environment info to all templates
 @ui_bp.context_processor
 def inject_environment():
@@ -438,43 +450,33 @@ def submit_quiz():
     try:
         logger.info("Submit quiz called")
         
-        # Get JSON data from POST request
+        # Get JSON data from POST request (quiz token plus answer indices)
         data = request.get_json()
-        logger.info(f"Submit quiz data received: {data}")
         
         if not data:
             return jsonify({'error': 'No JSON data provided'}), 400
         
         answers = data.get('answers', [])
-        questions = data.get('questions', [])
-        
-        if not answers or not questions:
-            return jsonify({'error': 'Missing answers or questions data'}), 400
+        quiz_token = data.get('quizToken')
         
-        logger.info(f"Processing {len(answers)} answers for {len(questions)} questions")
+        if not answers or not quiz_token:
+            return jsonify({'error': 'Missing answers or quiz token'}), 400
         
         # Get quiz service
         quiz_service = current_app.quiz_service
         
-        # Calculate results
-        correct_answers = 0
-        total_questions = len(questions)
+        # Score against the server-held answer key
+        scored = quiz_service.score_quiz(quiz_token, answers)
+        if scored is None:
+            return jsonify({'error': 'Quiz session expired or not found'}), 400
         
-        for i, (question, user_answer) in enumerate(zip(questions, answers)):
-            if user_answer is not None:  # Only count answered questions
-                # Get correct answer from question (stored as 'correctAnswer' with 0-based index)
-                correct_answer = question.get('correctAnswer', 0)  # Default to 0 (A)
-                
-                if user_answer == correct_answer:
-                    correct_answers += 1
-                    logger.debug(f"Question {i+1}: Correct")
-                else:
-                    logger.debug(f"Question {i+1}: Incorrect (user: {user_answer}, correct: {correct_answer})")
+        correct_answers = scored['correctAnswers']
+        total_questions = scored['totalQuestions']
         
         result = {
             'correctAnswers': correct_answers,
             'totalQuestions': total_questions,
-            'percentage': round((correct_answers / total_questions) * 100, 1) if total_questions > 0 else 0
+            'percentage': scored['percentage']
         }
         
         # Record quiz attempt in database if user is authenticated
@@ -486,24 +488,16 @@ def submit_quiz():
                 # Determine if this is a PRO quiz based on question count
                 is_pro_quiz = total_questions > 10  # More than 10 questions indicates PRO quiz
                 
-                # Prepare detailed questions data for storage
-                questions_data = []
-                for i, (question, user_answer) in enumerate(zip(questions, answers)):
-                    questions_data.append({
-                        'question': question,
-                        'user_answer': user_answer
-                    })
-                
                 # Record the attempt with detailed data
                 quiz_attempt = db_service.record_quiz_attempt(
                     user_id=user['id'],
                     question_count=total_questions,
-                    difficulty=2,  # Default difficulty - could be enhanced
+                    difficulty=scored['difficulty'] if scored['difficulty'] is not None else 2,
                     correct_answers=correct_answers,
                     total_questions=total_questions,
                     percentage=result['percentage'],
                     is_pro_quiz=is_pro_quiz,
-                    questions_data=questions_data
+                    questions_data=scored['questions_data']
                 )
                 
                 if quiz_attempt:
@@ -579,20 +573,64 @@ def get_user_stats():
         # Get database service
         db_service = current_app.database_service
         
-        # Get user statistics
-        stats = db_service.get_user_stats(user['id'])
+        # Get user statistics (cached until the user records another attempt)
+        stats, etag = db_service.analytics_cache.get_or_compute(
+            user['id'], 'stats', lambda: db_service.get_user_stats(user['id'])
+        )
         if stats is None:
             return jsonify({'error': 'Failed to get user stats'}), 500
         
-        return jsonify({
+        return cached_json_response({
             'success': True,
             'stats': stats
-        })
+        }, etag)
         
     except Exception as e:
         logger.error(f"Error getting user stats: {e}")
         return jsonify({'error': 'Failed to get user stats'}), 500
 
+@api_bp.route('/user/dashboard')
+def get_user_dashboard():
+    """Get user info, statistics, topic analysis and recent history in one request"""
+    try:
+        user = OAuthService.get_current_user()
+        if not user:
+            return jsonify({'authenticated': False, 'error': 'User not authenticated'}), 401
+        
+        # Optional subset of sections, e.g. ?sections=stats
+        all_sections = ('history', 'stats', 'topic_analysis')
+        requested = request.args.get('sections')
+        sections = tuple(
+            section for section in all_sections
+            if not requested or section in requested.split(',')
+        )
+        limit = max(1, min(request.args.get('limit', type=int, default=10), 100))
+        
+        # Get database service
+        db_service = current_app.database_service
+        
+        # Get dashboard data (cached until the user records another attempt)
+        dashboard, etag = db_service.analytics_cache.get_or_compute(
+            user['id'], f"dashboard:{','.join(sections)}:{limit}",
+            lambda: db_service.get_user_dashboard(user['id'], sections=sections, history_limit=limit)
+        )
+        if dashboard is None:
+            return jsonify({'error': 'Failed to get dashboard'}), 500
+        
+        # Session user info is part of the payload, so it is part of the ETag too
+        user_etag = hashlib.md5(json.dumps(user, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        
+        return cached_json_response({
+            'success': True,
+            'authenticated': True,
+            'user': user,
+            **dashboard
+        }, f"{etag}-{user_etag}")
+        
+    except Exception as e:
+        logger.error(f"Error getting user dashboard: {e}")
+        return jsonify({'error': 'Failed to get dashboard'}), 500
+
 @api_bp.route('/user/topic-analysis')
 def get_user_topic_analysis():
     """Get current user's topic analysis with weak areas and strengths (last 10 days)"""
@@ -601,16 +639,24 @@ def get_user_topic_analysis():
         if not user:
             return jsonify({'error': 'User not authenticated'}), 401
         
+        # Optional analysis window in days (defaults to TOPIC_ANALYSIS_WINDOW_DAYS)
+        window_days = request.args.get('days', type=int)
+        if window_days is not None and not (1 <= window_days <= 365):
+            window_days = None
+        
         # Get database service
         db_service = current_app.database_service
         
         # Get topic analysis (weak areas and strengths)
-        topic_analysis = db_service.get_user_topic_analysis(user['id'])
+        topic_analysis, etag = db_service.analytics_cache.get_or_compute(
+            user['id'], f'topic-analysis:{window_days}',
+            lambda: db_service.get_user_topic_analysis(user['id'], window_days=window_days)
+        )
         
-        return jsonify({
+        return cached_json_response({
             'success': True,
             'topic_analysis': topic_analysis
-        })
+        }, etag)
         
     except Exception as e:
         logger.error(f"Error getting user topic analysis: {e}")
@@ -666,20 +712,33 @@ def get_user_quiz_history():
         if not user:
             return jsonify({'error': 'User not authenticated'}), 401
         
-        # Get limit from query parameters
-        limit = request.args.get('limit', type=int, default=10)
+        # Get page size and keyset cursor from query parameters
+        limit = max(1, min(request.args.get('limit', type=int, default=10), 100))
+        cursor = request.args.get('cursor') or None
         
         # Get database service
         db_service = current_app.database_service
         
-        # Get quiz history
-        history = db_service.get_user_quiz_history(user['id'], limit)
+        def history_page():
+            attempts, next_cursor = db_service.get_user_quiz_history_page(user['id'], limit, cursor)
+            return {
+                'history': [attempt.to_dict() for attempt in attempts],
+                'next_cursor': next_cursor
+            }
         
-        return jsonify({
+        # Get quiz history page
+        page, etag = db_service.analytics_cache.get_or_compute(
+            user['id'], f'quiz-history:{limit}:{cursor}', history_page
+        )
+        
+        return cached_json_response({
             'success': True,
-            'history': [attempt.to_dict() for attempt in history]
-        })
+            'history': page['history'],
+            'next_cursor': page['next_cursor']
+        }, etag)
         
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
     except Exception as e:
         logger.error(f"Error getting user quiz history: {e}")
         return jsonify({'error': 'Failed to get quiz history'}), 500
@@ -730,6 +789,105 @@ def get_user_subscriptions():
         logger.error(f"Error getting user subscriptions: {e}")
         return jsonify({'error': 'Failed to get subscriptions'}), 500
 
+def pdf_job_response(job_id, attempt_id, job_status):
+    """Build the JSON body describing a PDF job"""
+    payload = {
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('api.get_job_status', job_id=job_id)
+    }
+    payload.update(job_status)
+    if job_status['status'] == 'done':
+        payload['download_url'] = url_for('api.download_attempt_pdf', attempt_id=attempt_id)
+    return payload
+
+@api_bp.route('/user/attempt-pdf-jobs/<int:attempt_id>', methods=['POST'])
+def enqueue_attempt_pdf(attempt_id):
+    """Queue a background render of a quiz attempt PDF"""
+    try:
+        user = OAuthService.get_current_user()
+        if not user:
+            return jsonify({'error': 'User not authenticated'}), 401
+        
+        # Get database service
+        db_service = current_app.database_service
+        
+        # Get the specific attempt
+        attempt = db_service.get_quiz_attempt_by_id(attempt_id)
+        if not attempt:
+            return jsonify({'error': 'Quiz attempt not found'}), 404
+        
+        # Verify the attempt belongs to the current user
+        if attempt.user_id != user['id']:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        job_service = current_app.pdf_job_service
+        if current_app.pdf_cache.get(attempt_id) is not None:
+            job_id = current_app.pdf_cache.key(attempt_id)
+        else:
+            job_id = job_service.submit_attempt_report(
+                attempt.to_dict(), db_service.get_quiz_attempt_details(attempt_id)
+            )
+        
+        job_status = job_service.status(job_id)
+        status_code = 200 if job_status['status'] == 'done' else 202
+        return jsonify(pdf_job_response(job_id, attempt_id, job_status)), status_code
+        
+    except Exception as e:
+        logger.error(f"Error queuing PDF for attempt {attempt_id}: {e}")
+        return jsonify({'error': 'Failed to queue PDF'}), 500
+
+@api_bp.route('/jobs/<job_id>')
+def get_job_status(job_id):
+    """Get the status of a background PDF job"""
+    try:
+        user = OAuthService.get_current_user()
+        if not user:
+            return jsonify({'error': 'User not authenticated'}), 401
+        
+        # Job ids name the attempt they render; only its owner may see them
+        attempt_id = current_app.pdf_cache.attempt_id_from_key(job_id)
+        attempt = current_app.database_service.get_quiz_attempt_by_id(attempt_id) if attempt_id else None
+        if not attempt or attempt.user_id != user['id']:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        job_status = current_app.pdf_job_service.status(job_id)
+        return jsonify(pdf_job_response(job_id, attempt_id, job_status))
+        
+    except Exception as e:
+        logger.error(f"Error getting status of job {job_id}: {e}")
+        return jsonify({'error': 'Failed to get job status'}), 500
+
+@api_bp.route('/user/export-attempts')
+def export_attempt_pdfs():
+    """Stream every quiz attempt report of the current user as a ZIP archive
+    
+    The export stops after EXPORT_TIME_LIMIT seconds, below gunicorn's worker
+    timeout, and lists the attempts it did not reach in errors.txt.
+    """
+    try:
+        user = OAuthService.get_current_user()
+        if not user:
+            return jsonify({'error': 'User not authenticated'}), 401
+        
+        if not user.get('is_pro', False):
+            return jsonify({'error': 'PRO access required'}), 403
+        
+        # Reports are rendered and zipped while the response streams
+        from flask import Response, stream_with_context
+        response = Response(
+            stream_with_context(current_app.export_service.stream_user_reports(user['id'])),
+            mimetype='application/zip'
+        )
+        response.headers['Content-Disposition'] = 'attachment; filename=quiz-attempts.zip'
+        response.headers['Cache-Control'] = 'private, no-store'
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error exporting attempt PDFs: {e}")
+        return jsonify({'error': 'Failed to export quiz attempts'}), 500
+
 @api_bp.route('/user/download-attempt-pdf/<int:attempt_id>')
 def download_attempt_pdf(attempt_id):
     """Download PDF summary of a specific quiz attempt"""
@@ -750,23 +908,34 @@ def download_attempt_pdf(attempt_id):
         if attempt.user_id != user['id']:
             return jsonify({'error': 'Access denied'}), 403
         
-        # Get detailed attempt data
-        attempt_details = db_service.get_quiz_attempt_details(attempt_id)
-        
-        # Import PDF service
-        from .services.pdf_service import PDFService
-        pdf_service = PDFService()
+        # Attempts never change, so a report is rendered once per template version
+        pdf_cache = current_app.pdf_cache
+        pdf_path = pdf_cache.get(attempt_id)
         
-        # Convert attempt to dict for PDF generation
-        attempt_data = attempt.to_dict()
+        if pdf_path is None and pdf_cache.is_pending(attempt_id):
+            # A background job is rendering it; point the client at the job instead of rendering twice
+            job_id = pdf_cache.key(attempt_id)
+            return jsonify(pdf_job_response(job_id, attempt_id, {'status': 'pending'})), 202
         
-        # Generate PDF with detailed data
-        pdf_content = pdf_service.generate_quiz_attempt_pdf(attempt_data, attempt_details)
-        
-        # Create response with PDF content
-        from flask import Response
-        response = Response(pdf_content, mimetype='application/pdf')
-        response.headers['Content-Disposition'] = f'attachment; filename=quiz-attempt-{attempt_id}.pdf'
+        if pdf_path is None:
+            # Get detailed attempt data
+            attempt_details = db_service.get_quiz_attempt_details(attempt_id)
+            
+            # Generate PDF with detailed data
+            pdf_content = current_app.pdf_service.generate_quiz_attempt_pdf(attempt.to_dict(), attempt_details)
+            pdf_path = pdf_cache.put(attempt_id, pdf_content)
+        
+        # Stream from disk; send_file handles If-None-Match / If-Modified-Since
+        from flask import send_file
+        response = send_file(
+            pdf_path,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=f'quiz-attempt-{attempt_id}.pdf',
+            etag=pdf_cache.key(attempt_id),
+            conditional=True
+        )
+        response.headers['Cache-Control'] = 'private, no-cache'
         
         return response
         
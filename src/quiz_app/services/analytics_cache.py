@@ -0,0 +1,77 @@
+"""
+Per-user response cache for dashboard analytics
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class UserAnalyticsCache:
+    """Cache of dashboard analytics payloads keyed by user and generation
+
+    Each user has a generation counter that is bumped whenever new quiz data is
+    recorded for them; entries for older generations are never served again
+    and age out of the bounded LRU. ``ttl`` bounds how long another worker's
+    recording can go unnoticed, since generations are per worker.
+    """
+
+    def __init__(self, ttl=60, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._generations = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, user_id):
+        """Get the current generation for a user"""
+        return self._generations.get(user_id, 0)
+
+    def invalidate_user(self, user_id):
+        """Bump a user's generation so cached analytics are recomputed"""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, user_id, name, compute):
+        """Get a cached payload, computing and storing it on a miss
+
+        Args:
+            user_id (int): Owner of the analytics
+            name (str): Payload name, including any parameters that change it
+            compute (callable): Produces the JSON-serializable payload
+
+        Returns:
+            tuple: (payload, etag); payloads of None are returned uncached
+        """
+        key = (user_id, self.generation(user_id), name)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+
+        payload = compute()
+        if payload is None:
+            return None, None
+
+        body = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        etag = hashlib.md5(body).hexdigest()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, payload, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return payload, etag
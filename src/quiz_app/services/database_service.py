@@ -1,26 +1,62 @@
 """
 Database service for managing users and subscriptions
 """
+import base64
+import json
 import logging
 from datetime import datetime, timedelta
 from flask import current_app
-from ..models import db, User, Subscription, QuizAttempt
+from ..models import (
+    db, User, Subscription, QuizAttempt, UserStatsRollup, UserTopicRollup, UserTopicDailyRollup
+)
+from .question_cache import QuestionBankCache
+from .analytics_cache import UserAnalyticsCache
 
 logger = logging.getLogger(__name__)
 
+# Format version of QuizAttempt.details_snapshot
+SNAPSHOT_VERSION = 1
+
+# Random id lookups per uncached question sample, how far each round oversamples,
+# and the most ids one lookup may carry
+SAMPLE_ROUNDS = 3
+SAMPLE_OVERSAMPLING = 1.5
+SAMPLE_MAX_IDS = 500
+
+
+def encode_history_cursor(attempt):
+    """Encode a quiz attempt's (created_at, id) position as an opaque cursor"""
+    position = json.dumps([attempt.created_at.isoformat(), attempt.id])
+    return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_history_cursor(cursor):
+    """Decode a history cursor into (created_at, id), raising ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, attempt_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(attempt_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid history cursor: {cursor!r}") from e
+
 
 class DatabaseService:
     """Service class for database operations"""
     
     def __init__(self):
         self.db = db
+        self.question_cache = QuestionBankCache()
+        self.analytics_cache = UserAnalyticsCache()
     
     def init_db(self):
-        """Initialize database tables"""
+        """Bring the database schema up to date by applying pending migrations"""
+        from ..migrations import upgrade
+        
         try:
             with current_app.app_context():
-                self.db.create_all()
-                logger.info("Database tables created successfully")
+                applied = upgrade(self.db.engine)
+                logger.info(f"Database schema up to date ({len(applied)} migrations applied)")
+                return applied
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
@@ -157,13 +193,19 @@ class DatabaseService:
                 is_pro_quiz=is_pro_quiz
             )
             self.db.session.add(quiz_attempt)
-            self.db.session.flush()  # Get the ID without committing
             
             # Record detailed data if provided
-            if questions_data and quiz_attempt.id:
-                self._record_quiz_details(quiz_attempt.id, questions_data)
+            topic_results = {}
+            if questions_data:
+                topic_results = self._record_quiz_details(quiz_attempt, questions_data)
+            else:
+                self.db.session.flush()  # Get the ID without committing
+            
+            # Keep dashboard rollups in step within the same transaction
+            self._update_user_rollups(user_id, percentage, is_pro_quiz, topic_results)
             
             self.db.session.commit()
+            self.analytics_cache.invalidate_user(user_id)
             logger.info(f"Quiz attempt recorded for user {user_id}")
             return quiz_attempt
         except Exception as e:
@@ -171,57 +213,294 @@ class DatabaseService:
             logger.error(f"Error recording quiz attempt for user {user_id}: {e}")
             return None
     
-    def _record_quiz_details(self, quiz_attempt_id, questions_data):
-        """Record detailed quiz attempt data using question IDs"""
+    def _record_quiz_details(self, quiz_attempt, questions_data):
+        """Record detailed quiz attempt data using question IDs
+        
+        Questions are fetched with a single IN query and the detail rows are
+        written with one bulk insert, so the cost does not grow with quiz length.
+        The graded questions are also stored on the attempt as an immutable
+        snapshot, written with the attempt's own INSERT.
+        
+        Returns:
+            dict: (attempted, correct) counts per topic category
+        """
         try:
             from ..models import QuizAttemptDetail, Question
             
+            question_ids = set()
             for i, question_data in enumerate(questions_data, 1):
-                question = question_data.get('question', {})
+                question_id = question_data.get('question', {}).get('id')
+                if question_id:
+                    question_ids.add(question_id)
+                else:
+                    logger.warning(f"No question ID found for question {i} in attempt by user {quiz_attempt.user_id}")
+            
+            # Get the answered questions from the question bank in one round trip, without
+            # autoflushing the pending attempt before its snapshot is set
+            questions = {}
+            if question_ids:
+                with self.db.session.no_autoflush:
+                    questions = {
+                        question.id: question
+                        for question in self.db.session.query(
+                            Question.id, Question.question_text, Question.options, Question.correct_answer,
+                            Question.explanation, Question.difficulty_level, Question.topic_category
+                        ).filter(Question.id.in_(question_ids))
+                    }
+            
+            topic_results = {}
+            
+            details = []
+            snapshot = []
+            for i, question_data in enumerate(questions_data, 1):
+                question_id = question_data.get('question', {}).get('id')
                 user_answer = question_data.get('user_answer')
                 
-                # Get question from question bank (you'll need to implement this logic)
-                # For now, we'll assume the question exists in the bank
-                question_id = question.get('id')  # This should be the ID from question bank
-                
                 if not question_id:
-                    logger.warning(f"No question ID found for question {i} in attempt {quiz_attempt_id}")
                     continue
                 
-                # Get the question from database to verify correct answer
-                db_question = Question.query.get(question_id)
-                if not db_question:
+                question = questions.get(question_id)
+                if question is None:
                     logger.warning(f"Question {question_id} not found in question bank")
                     continue
                 
                 # Determine if answer is correct
-                is_correct = user_answer == db_question.correct_answer if user_answer is not None else False
+                is_correct = user_answer == question.correct_answer if user_answer is not None else False
                 
-                detail = QuizAttemptDetail(
-                    quiz_attempt_id=quiz_attempt_id,
-                    question_id=question_id,
-                    question_number=i,
-                    user_answer=user_answer,
-                    is_correct=is_correct
+                details.append({
+                    'question_id': question_id,
+                    'question_number': i,
+                    'user_answer': user_answer,
+                    'is_correct': is_correct
+                })
+                snapshot.append({
+                    'question_id': question_id,
+                    'question_number': i,
+                    'user_answer': user_answer,
+                    'is_correct': is_correct,
+                    'question_text': question.question_text,
+                    'options': question.options,
+                    'correct_answer': question.correct_answer,
+                    'explanation': question.explanation,
+                    'difficulty_level': question.difficulty_level,
+                    'topic_category': question.topic_category
+                })
+                
+                if question.topic_category:
+                    attempted, correct = topic_results.get(question.topic_category, (0, 0))
+                    topic_results[question.topic_category] = (attempted + 1, correct + int(is_correct))
+            
+            quiz_attempt.details_snapshot = {'version': SNAPSHOT_VERSION, 'questions': snapshot}
+            self.db.session.flush()  # Insert the attempt with its snapshot and get the ID
+            
+            if details:
+                for detail in details:
+                    detail['quiz_attempt_id'] = quiz_attempt.id
+                self.db.session.bulk_insert_mappings(QuizAttemptDetail, details, render_nulls=True)
+            
+            logger.info(f"Recorded {len(details)} question details for attempt {quiz_attempt.id}")
+            return topic_results
+            
+        except Exception as e:
+            logger.error(f"Error recording quiz details for attempt by user {quiz_attempt.user_id}: {e}")
+            raise
+    
+    def _update_user_rollups(self, user_id, percentage, is_pro_quiz, topic_results):
+        """Add one attempt to the user's stats and topic rollups
+        
+        Each rollup row is written with a single INSERT ... ON CONFLICT DO UPDATE
+        that adds the attempt to the stored totals, so concurrent submissions for
+        the same user neither lose updates nor race to insert a user's, topic's or
+        day's first row.
+        """
+        from sqlalchemy import case, func
+        
+        insert = self._upsert_insert()
+        
+        stats = UserStatsRollup.__table__
+        statement = insert(stats).values(
+            user_id=user_id,
+            total_attempts=1,
+            pro_attempts=1 if is_pro_quiz else 0,
+            percentage_sum=percentage,
+            best_score=percentage
+        )
+        self.db.session.execute(statement.on_conflict_do_update(
+            index_elements=[stats.c.user_id],
+            set_={
+                'total_attempts': stats.c.total_attempts + statement.excluded.total_attempts,
+                'pro_attempts': stats.c.pro_attempts + statement.excluded.pro_attempts,
+                'percentage_sum': stats.c.percentage_sum + statement.excluded.percentage_sum,
+                'best_score': case(
+                    (stats.c.best_score < statement.excluded.best_score, statement.excluded.best_score),
+                    else_=stats.c.best_score
+                ),
+                'updated_at': func.now()
+            }
+        ))
+        
+        today = datetime.utcnow().date()
+        for topic_category, (attempted, correct) in topic_results.items():
+            for table, keys in (
+                (UserTopicRollup.__table__, {}),
+                (UserTopicDailyRollup.__table__, {'bucket_date': today})
+            ):
+                statement = insert(table).values(
+                    user_id=user_id,
+                    topic_category=topic_category,
+                    total_attempted=attempted,
+                    total_correct=correct,
+                    **keys
                 )
-                self.db.session.add(detail)
+                increments = {
+                    'total_attempted': table.c.total_attempted + statement.excluded.total_attempted,
+                    'total_correct': table.c.total_correct + statement.excluded.total_correct
+                }
+                if 'updated_at' in table.c:
+                    increments['updated_at'] = func.now()
+                self.db.session.execute(statement.on_conflict_do_update(
+                    index_elements=list(table.primary_key.columns),
+                    set_=increments
+                ))
+    
+    def _upsert_insert(self):
+        """Get the dialect's INSERT construct, which supports ON CONFLICT DO UPDATE"""
+        if self.db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert
+    
+    def rebuild_user_rollups(self, user_id=None):
+        """Rebuild stats, topic and daily topic rollups from quiz_attempts and quiz_attempt_details
+        
+        Uses the same statements as the backfill in migration 0002.
+        
+        Args:
+            user_id (int): Optional user to rebuild; all users when omitted
+            
+        Returns:
+            int: Number of users with a stats rollup after the rebuild
+        """
+        try:
+            from ..models import QuizAttemptDetail, Question
+            from ..migrations.rollups import rebuild_rollup_statements
             
-            logger.info(f"Recorded {len(questions_data)} question details for attempt {quiz_attempt_id}")
+            for statement in rebuild_rollup_statements(
+                QuizAttempt.__table__, QuizAttemptDetail.__table__, Question.__table__,
+                UserStatsRollup.__table__, UserTopicRollup.__table__, UserTopicDailyRollup.__table__,
+                user_id=user_id
+            ):
+                self.db.session.execute(statement)
+            self.db.session.commit()
+            self.analytics_cache.clear()
             
+            stats_query = UserStatsRollup.query
+            if user_id is not None:
+                stats_query = stats_query.filter_by(user_id=user_id)
+            rebuilt = stats_query.count()
+            logger.info(f"Rebuilt user rollups ({rebuilt} users)")
+            return rebuilt
         except Exception as e:
-            logger.error(f"Error recording quiz details for attempt {quiz_attempt_id}: {e}")
+            self.db.session.rollback()
+            logger.error(f"Error rebuilding user rollups: {e}")
             raise
     
     def get_user_quiz_history(self, user_id, limit=10):
         """Get quiz history for a user"""
         try:
-            return QuizAttempt.query.filter_by(user_id=user_id)\
-                .order_by(QuizAttempt.created_at.desc())\
-                .limit(limit).all()
+            return self._query_quiz_history(user_id, limit)
         except Exception as e:
             logger.error(f"Error getting quiz history for user {user_id}: {e}")
             return []
     
+    def _query_quiz_history(self, user_id, limit):
+        """Fetch a user's most recent attempts, raising on errors"""
+        return QuizAttempt.query.filter_by(user_id=user_id)\
+            .order_by(QuizAttempt.created_at.desc(), QuizAttempt.id.desc())\
+            .limit(limit).all()
+    
+    def get_user_quiz_history_page(self, user_id, limit=10, cursor=None):
+        """Get one page of a user's quiz history, newest first
+        
+        Pages are keyset-paginated on (created_at, id), so each page is a single
+        index range scan no matter how deep the user has paged.
+        
+        Args:
+            user_id (int): User ID
+            limit (int): Page size
+            cursor (str): next_cursor from the previous page, or None for the first page
+            
+        Returns:
+            tuple: (attempts, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = decode_history_cursor(cursor) if cursor else None
+        
+        try:
+            return self._query_quiz_history_page(user_id, limit, position)
+        except Exception as e:
+            logger.error(f"Error getting quiz history page for user {user_id}: {e}")
+            return [], None
+    
+    def iter_user_attempt_pages(self, user_id, page_size):
+        """Yield every quiz attempt of a user page by page, newest first, with details
+        
+        Unlike get_user_quiz_history_page, database errors propagate, so a
+        caller walking the whole history never mistakes a failed page for the
+        last one.
+        
+        Args:
+            user_id (int): User ID
+            page_size (int): Attempts per page
+            
+        Yields:
+            tuple: (attempts, details); details maps attempt ID -> list of detail dicts
+        """
+        cursor = None
+        seen = set()
+        while True:
+            position = decode_history_cursor(cursor) if cursor else None
+            attempts, next_cursor = self._query_quiz_history_page(user_id, page_size, position)
+            attempts = [attempt for attempt in attempts if attempt.id not in seen]
+            if not attempts:
+                return
+            
+            seen.update(attempt.id for attempt in attempts)
+            yield attempts, self._query_quiz_attempt_details([attempt.id for attempt in attempts])
+            
+            # A cursor that does not advance would page forever
+            if next_cursor is None or next_cursor == cursor:
+                return
+            cursor = next_cursor
+    
+    def _query_quiz_history_page(self, user_id, limit, position):
+        """Fetch one history page after a decoded (created_at, id) position, raising on errors"""
+        from sqlalchemy import func, tuple_
+        
+        query = QuizAttempt.query.filter_by(user_id=user_id)
+        if position:
+            created_at, attempt_id = position
+            # Compare against the cursor row's stored timestamp rather than the bound
+            # value: SQLite keeps server-default timestamps as text without fractional
+            # seconds, which never compares equal to a bound datetime
+            stored_created_at = self.db.session.query(QuizAttempt.created_at)\
+                .filter(QuizAttempt.id == attempt_id).scalar_subquery()
+            query = query.filter(
+                tuple_(QuizAttempt.created_at, QuizAttempt.id)
+                < tuple_(func.coalesce(stored_created_at, created_at), attempt_id)
+            )
+        
+        # Fetch one extra row to learn whether another page exists
+        attempts = query.order_by(QuizAttempt.created_at.desc(), QuizAttempt.id.desc())\
+            .limit(limit + 1).all()
+        
+        if len(attempts) > limit:
+            return attempts[:limit], encode_history_cursor(attempts[limit - 1])
+        return attempts, None
+    
     def get_quiz_attempt_by_id(self, attempt_id):
         """Get a specific quiz attempt by ID"""
         try:
@@ -231,44 +510,150 @@ class DatabaseService:
             return None
     
     def get_quiz_attempt_details(self, attempt_id):
-        """Get detailed data for a specific quiz attempt with full question data"""
+        """Get detailed data for a specific quiz attempt with full question data
+        
+        Attempts recorded with a snapshot are served from that single row, as
+        the questions were when the quiz was submitted; older attempts are
+        joined against the current question bank.
+        """
+        return self.get_quiz_attempt_details_batch([attempt_id]).get(attempt_id, [])
+    
+    def get_quiz_attempt_details_batch(self, attempt_ids):
+        """Get detailed data for several quiz attempts in at most two queries
+        
+        Args:
+            attempt_ids (list): Quiz attempt IDs
+            
+        Returns:
+            dict: Attempt ID -> list of detail dicts ordered by question number
+        """
         try:
-            from ..models import QuizAttemptDetail
-            details = QuizAttemptDetail.query.filter_by(quiz_attempt_id=attempt_id)\
-                .order_by(QuizAttemptDetail.question_number).all()
-            return [detail.to_dict_with_question() for detail in details]
+            return self._query_quiz_attempt_details(attempt_ids)
         except Exception as e:
-            logger.error(f"Error getting quiz attempt details {attempt_id}: {e}")
-            return []
+            logger.error(f"Error getting quiz attempt details for attempts {attempt_ids}: {e}")
+            return {}
+    
+    def _query_quiz_attempt_details(self, attempt_ids):
+        """Fetch detail dicts for several attempts, raising on errors"""
+        from ..models import QuizAttemptDetail
+        from sqlalchemy.orm import joinedload
+        
+        if not attempt_ids:
+            return {}
+        
+        details = {}
+        unsnapshotted = []
+        for attempt_id, created_at, snapshot in self.db.session.query(
+            QuizAttempt.id, QuizAttempt.created_at, QuizAttempt.details_snapshot
+        ).filter(QuizAttempt.id.in_(attempt_ids)):
+            if snapshot:
+                created_at = created_at.isoformat() if created_at else None
+                details[attempt_id] = [
+                    dict(question, quiz_attempt_id=attempt_id, created_at=created_at)
+                    for question in snapshot['questions']
+                ]
+            else:
+                unsnapshotted.append(attempt_id)
+        
+        if unsnapshotted:
+            # Load each detail's question in the same query instead of one lazy SELECT per row
+            for detail in QuizAttemptDetail.query\
+                    .filter(QuizAttemptDetail.quiz_attempt_id.in_(unsnapshotted))\
+                    .options(joinedload(QuizAttemptDetail.question))\
+                    .order_by(QuizAttemptDetail.quiz_attempt_id, QuizAttemptDetail.question_number):
+                details.setdefault(detail.quiz_attempt_id, []).append(detail.to_dict_with_question())
+        
+        return details
     
     def get_user_stats(self, user_id):
-        """Get user statistics"""
+        """Get user statistics from the stats rollup"""
         try:
-            attempts = QuizAttempt.query.filter_by(user_id=user_id).all()
-            if not attempts:
-                return {
-                    'total_attempts': 0,
-                    'average_score': 0,
-                    'best_score': 0,
-                    'pro_attempts': 0,
-                    'free_attempts': 0
-                }
-            
-            total_attempts = len(attempts)
-            average_score = sum(attempt.percentage for attempt in attempts) / total_attempts
-            best_score = max(attempt.percentage for attempt in attempts)
-            pro_attempts = len([a for a in attempts if a.is_pro_quiz])
-            free_attempts = total_attempts - pro_attempts
-            
+            return self._query_user_stats(user_id)
+        except Exception as e:
+            logger.error(f"Error getting user stats for user {user_id}: {e}")
+            return None
+    
+    def _query_user_stats(self, user_id):
+        """Read user statistics from the stats rollup, raising on errors"""
+        rollup = UserStatsRollup.query.get(user_id)
+        if rollup:
+            return rollup.to_stats_dict()
+        
+        # Migration 0002 backfilled earlier attempts, so a missing row means no attempts yet
+        return self._aggregate_user_stats(user_id)
+    
+    def _aggregate_user_stats(self, user_id):
+        """Compute user statistics from quiz_attempts with a single aggregate query"""
+        from sqlalchemy import func, case
+        
+        total_attempts, average_score, best_score, pro_attempts = self.db.session.query(
+            func.count(QuizAttempt.id),
+            func.avg(QuizAttempt.percentage),
+            func.max(QuizAttempt.percentage),
+            func.sum(case((QuizAttempt.is_pro_quiz == True, 1), else_=0))
+        ).filter(
+            QuizAttempt.user_id == user_id
+        ).one()
+        
+        if not total_attempts:
             return {
-                'total_attempts': total_attempts,
-                'average_score': round(average_score, 1),
-                'best_score': round(best_score, 1),
-                'pro_attempts': pro_attempts,
-                'free_attempts': free_attempts
+                'total_attempts': 0,
+                'average_score': 0,
+                'best_score': 0,
+                'pro_attempts': 0,
+                'free_attempts': 0
             }
+        
+        pro_attempts = int(pro_attempts or 0)
+        
+        return {
+            'total_attempts': total_attempts,
+            'average_score': round(float(average_score), 1),
+            'best_score': round(float(best_score), 1),
+            'pro_attempts': pro_attempts,
+            'free_attempts': total_attempts - pro_attempts
+        }
+    
+    def get_user_dashboard(self, user_id, sections=('stats', 'topic_analysis', 'history'),
+                           history_limit=10, window_days=None):
+        """Get the data behind the PRO dashboard pages in one pass
+        
+        Every section is read in the same session and transaction, starting
+        with the user's stats row. A user without attempts has no topic
+        buckets or history either, so those queries are skipped for them.
+        
+        Args:
+            user_id (int): User ID
+            sections (iterable): Any of 'stats', 'topic_analysis' and 'history'
+            history_limit (int): Number of recent attempts to include
+            window_days (int): Optional topic analysis window
+            
+        Returns:
+            dict: One key per requested section, or None if reading failed
+        """
+        try:
+            stats = self._query_user_stats(user_id)
+            has_attempts = stats['total_attempts'] > 0
+            dashboard = {}
+            
+            if 'stats' in sections:
+                dashboard['stats'] = stats
+            
+            if 'topic_analysis' in sections:
+                user_performance = self._windowed_topic_performance(
+                    user_id, self._topic_window_start(window_days)
+                ) if has_attempts else []
+                dashboard['topic_analysis'] = self._build_topic_analysis(user_id, user_performance)
+            
+            if 'history' in sections:
+                dashboard['history'] = [
+                    attempt.to_dict() for attempt in self._query_quiz_history(user_id, history_limit)
+                ] if has_attempts else []
+            
+            return dashboard
         except Exception as e:
-            logger.error(f"Error getting user stats for user {user_id}: {e}")
+            self.db.session.rollback()
+            logger.error(f"Error getting dashboard for user {user_id}: {e}")
             return None
     
     def check_pro_access(self, user_id):
@@ -311,27 +696,102 @@ class DatabaseService:
     def get_random_questions(self, count, difficulty_level=None, topic_category=None):
         """Get random questions for quiz generation"""
         try:
-            from ..models import Question
             import random
             
-            query = Question.query.filter_by(is_active=True)
-            
-            if difficulty_level:
-                query = query.filter_by(difficulty_level=difficulty_level)
-            
-            if topic_category:
-                query = query.filter_by(topic_category=topic_category)
-            
-            all_questions = query.all()
+            if current_app.config.get('QUESTION_CACHE_ENABLED', True):
+                try:
+                    # Served from the per-worker question bank cache
+                    all_questions = self.question_cache.get(
+                        self._load_active_questions,
+                        difficulty_level=difficulty_level,
+                        topic_category=topic_category,
+                        max_age=current_app.config.get('QUESTION_CACHE_TTL')
+                    )
+                except Exception as e:
+                    logger.warning(f"Question bank cache unavailable, sampling in database: {e}")
+                    return self._sample_questions_in_db(count, difficulty_level, topic_category)
+            else:
+                return self._sample_questions_in_db(count, difficulty_level, topic_category)
             
             if len(all_questions) <= count:
-                return all_questions
+                return list(all_questions)
             
             return random.sample(all_questions, count)
         except Exception as e:
             logger.error(f"Error getting random questions: {e}")
             return []
     
+    def _sample_questions_in_db(self, count, difficulty_level=None, topic_category=None):
+        """Sample random questions inside the database without sorting the candidates
+        
+        One aggregate query finds the id range and number of matching questions.
+        Random ids are then drawn from that range and only those rows are
+        fetched, oversampling by how sparse the range is so that gaps and
+        filtered-out ids rarely need another round. If the range is too sparse
+        to fill the quiz in a few rounds, the remainder falls back to ordering
+        the unpicked ids by random().
+        """
+        from ..models import Question
+        from sqlalchemy import func
+        import math
+        import random
+        
+        filters = [Question.is_active == True]
+        if difficulty_level:
+            filters.append(Question.difficulty_level == difficulty_level)
+        if topic_category:
+            filters.append(Question.topic_category == topic_category)
+        
+        low, high, total = self.db.session.query(
+            func.min(Question.id), func.max(Question.id), func.count(Question.id)
+        ).filter(*filters).one()
+        if not total:
+            return []
+        if total <= count:
+            questions = Question.query.filter(*filters).all()
+            random.shuffle(questions)
+            return questions
+        
+        span = high - low + 1
+        picked = {}
+        tried = set()
+        for _ in range(SAMPLE_ROUNDS):
+            needed = count - len(picked)
+            if needed <= 0 or len(tried) >= span:
+                break
+            draws = min(
+                span - len(tried), SAMPLE_MAX_IDS, math.ceil(needed * span / total * SAMPLE_OVERSAMPLING)
+            )
+            ids = set()
+            while len(ids) < draws:
+                candidate = random.randint(low, high)
+                if candidate not in tried:
+                    ids.add(candidate)
+            tried.update(ids)
+            for question in Question.query.filter(Question.id.in_(ids), *filters):
+                picked[question.id] = question
+        
+        questions = list(picked.values())
+        if len(questions) > count:
+            questions = random.sample(questions, count)
+        elif len(questions) < count:
+            questions.extend(
+                Question.query.filter(Question.id.notin_(picked), *filters)
+                .order_by(func.random()).limit(count - len(questions)).all()
+            )
+        
+        random.shuffle(questions)
+        return questions
+    
+    def _load_active_questions(self):
+        """Load all active questions for the question bank cache"""
+        from ..models import Question
+        return Question.query.filter_by(is_active=True).all()
+    
+    def invalidate_question_cache(self):
+        """Invalidate the question bank cache after admin changes to questions"""
+        self.question_cache.invalidate()
+    
     def add_question_to_bank(self, question_text, options, correct_answer, explanation=None, 
                            difficulty_level=2, topic_category=None):
         """Add a new question to the question bank"""
@@ -349,6 +809,7 @@ class DatabaseService:
             
             self.db.session.add(question)
             self.db.session.commit()
+            self.invalidate_question_cache()
             
             logger.info(f"Added question {question.id} to question bank")
             return question
@@ -393,32 +854,15 @@ class DatabaseService:
     def get_user_all_topic_performance(self, user_id):
         """Get user's performance across ALL topics (for debugging)"""
         try:
-            from ..models import QuizAttemptDetail, Question
-            from sqlalchemy import func, case
-            
-            result = self.db.session.query(
-                Question.topic_category,
-                func.count(QuizAttemptDetail.id).label('total_attempted'),
-                func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)).label('total_correct'),
-                func.round(
-                    func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)) * 100.0 / 
-                    func.count(QuizAttemptDetail.id), 1
-                ).label('accuracy')
-            ).join(
-                QuizAttemptDetail, Question.id == QuizAttemptDetail.question_id
-            ).join(
-                QuizAttempt, QuizAttemptDetail.quiz_attempt_id == QuizAttempt.id
-            ).filter(
-                QuizAttempt.user_id == user_id,
-                Question.topic_category.isnot(None)  # Exclude null topic categories
-            ).group_by(
-                Question.topic_category
-            ).order_by(
-                func.round(
-                    func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)) * 100.0 / 
-                    func.count(QuizAttemptDetail.id), 1
-                ).asc()  # Order by lowest accuracy first
-            ).all()
+            result = [
+                (rollup.topic_category, rollup.total_attempted, rollup.total_correct, rollup.accuracy)
+                for rollup in UserTopicRollup.query.filter_by(user_id=user_id)
+            ]
+            if result:
+                result.sort(key=lambda row: row[3])  # Order by lowest accuracy first
+            else:
+                # Migration 0002 backfilled earlier attempts, so this normally finds nothing either
+                result = self._aggregate_user_topic_performance(user_id)
             
             # Convert to list of dictionaries
             all_topics = []
@@ -438,102 +882,155 @@ class DatabaseService:
             logger.error(f"Error getting all topic performance for user {user_id}: {e}")
             return []
 
-    def get_user_topic_analysis(self, user_id):
-        """Get user's topic analysis with weak areas and strengths (last 10 days)"""
+    def _aggregate_user_topic_performance(self, user_id):
+        """Compute per-topic performance by joining attempt details with questions"""
+        from ..models import QuizAttemptDetail, Question
+        from sqlalchemy import func, case
+        
+        return self.db.session.query(
+            Question.topic_category,
+            func.count(QuizAttemptDetail.id).label('total_attempted'),
+            func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)).label('total_correct'),
+            func.round(
+                func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)) * 100.0 / 
+                func.count(QuizAttemptDetail.id), 1
+            ).label('accuracy')
+        ).join(
+            QuizAttemptDetail, Question.id == QuizAttemptDetail.question_id
+        ).join(
+            QuizAttempt, QuizAttemptDetail.quiz_attempt_id == QuizAttempt.id
+        ).filter(
+            QuizAttempt.user_id == user_id,
+            Question.topic_category.isnot(None)  # Exclude null topic categories
+        ).group_by(
+            Question.topic_category
+        ).order_by(
+            func.round(
+                func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)) * 100.0 / 
+                func.count(QuizAttemptDetail.id), 1
+            ).asc()  # Order by lowest accuracy first
+        ).all()
+
+    def get_user_topic_analysis(self, user_id, window_days=None):
+        """Get user's topic analysis with weak areas and strengths (last 10 days by default)
+        
+        Performance is summed over the user's daily topic rollup buckets, so the
+        cost depends on the window size rather than on how many quizzes were taken.
+        The window covers whole UTC days starting `window_days` days ago.
+        """
         try:
-            from ..models import QuizAttemptDetail, Question
-            from sqlalchemy import func, case
-            from datetime import datetime, timedelta
-            
-            # Calculate date 10 days ago
-            ten_days_ago = datetime.utcnow() - timedelta(days=10)
-            
-            # Get all available topic categories
-            all_topics = self.db.session.query(
-                Question.topic_category
-            ).filter(
-                Question.topic_category.isnot(None),
-                Question.is_active == True
-            ).distinct().all()
-            
-            all_topic_categories = [topic[0] for topic in all_topics]
-            
-            # Get user's performance for last 10 days
-            user_performance = self.db.session.query(
-                Question.topic_category,
-                func.count(QuizAttemptDetail.id).label('total_attempted'),
-                func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)).label('total_correct'),
-                func.round(
-                    func.sum(case((QuizAttemptDetail.is_correct == True, 1), else_=0)) * 100.0 / 
-                    func.count(QuizAttemptDetail.id), 1
-                ).label('accuracy')
-            ).join(
-                QuizAttemptDetail, Question.id == QuizAttemptDetail.question_id
-            ).join(
-                QuizAttempt, QuizAttemptDetail.quiz_attempt_id == QuizAttempt.id
-            ).filter(
-                QuizAttempt.user_id == user_id,
-                QuizAttempt.created_at >= ten_days_ago,
-                Question.topic_category.isnot(None)
-            ).group_by(
-                Question.topic_category
-            ).all()
-            
-            # Create a dictionary of attempted topics
-            attempted_topics = {}
-            for topic_category, total_attempted, total_correct, accuracy in user_performance:
-                attempted_topics[topic_category] = {
-                    'total_attempted': total_attempted,
-                    'total_correct': total_correct,
-                    'accuracy': float(accuracy)
-                }
-            
-            # Separate into weak areas and strengths
-            weak_areas = []
-            strengths = []
-            
-            # Process attempted topics
-            for topic_category, total_attempted, total_correct, accuracy in user_performance:
-                topic_data = {
-                    'topic_category': topic_category,
-                    'total_attempted': total_attempted,
-                    'total_correct': total_correct,
-                    'accuracy': float(accuracy),
-                    'recommendation': self._get_topic_recommendation(topic_category, float(accuracy))
-                }
-                
-                if float(accuracy) < 70.0:
-                    weak_areas.append(topic_data)
-                else:
-                    strengths.append(topic_data)
-            
-            # Add unattended topics to weak areas
-            unattended_topics = [topic for topic in all_topic_categories if topic not in attempted_topics]
-            for topic in unattended_topics:
-                weak_areas.append({
-                    'topic_category': topic,
-                    'total_attempted': 0,
-                    'total_correct': 0,
-                    'accuracy': 0.0,
-                    'recommendation': f'Start practicing {topic} questions to build your knowledge',
-                    'unattended': True
-                })
-            
-            # Sort weak areas by accuracy (lowest first) and strengths by accuracy (highest first)
-            weak_areas.sort(key=lambda x: x['accuracy'])
-            strengths.sort(key=lambda x: x['accuracy'], reverse=True)
-            
-            logger.info(f"Topic analysis for user {user_id}: {len(weak_areas)} weak areas, {len(strengths)} strengths")
-            
-            return {
-                'weak_areas': weak_areas,
-                'strengths': strengths
-            }
-            
+            user_performance = self._windowed_topic_performance(user_id, self._topic_window_start(window_days))
+            return self._build_topic_analysis(user_id, user_performance)
         except Exception as e:
             logger.error(f"Error getting topic analysis for user {user_id}: {e}")
             return {'weak_areas': [], 'strengths': []}
 
+    def _topic_window_start(self, window_days=None):
+        """Get the start of the topic analysis window, `window_days` days ago"""
+        if window_days is None:
+            window_days = current_app.config.get('TOPIC_ANALYSIS_WINDOW_DAYS', 10)
+        return datetime.utcnow() - timedelta(days=window_days)
+
+    def _build_topic_analysis(self, user_id, user_performance):
+        """Split windowed topic performance rows into weak areas and strengths
+        
+        Active topics the user has not attempted in the window are weak areas.
+        """
+        # Get all available topic categories
+        all_topic_categories = self._active_topic_categories()
+        
+        # Create a dictionary of attempted topics
+        attempted_topics = {}
+        for topic_category, total_attempted, total_correct, accuracy in user_performance:
+            attempted_topics[topic_category] = {
+                'total_attempted': total_attempted,
+                'total_correct': total_correct,
+                'accuracy': float(accuracy)
+            }
+        
+        # Separate into weak areas and strengths
+        weak_areas = []
+        strengths = []
+        
+        # Process attempted topics
+        for topic_category, total_attempted, total_correct, accuracy in user_performance:
+            topic_data = {
+                'topic_category': topic_category,
+                'total_attempted': total_attempted,
+                'total_correct': total_correct,
+                'accuracy': float(accuracy),
+                'recommendation': self._get_topic_recommendation(topic_category, float(accuracy))
+            }
+            
+            if float(accuracy) < 70.0:
+                weak_areas.append(topic_data)
+            else:
+                strengths.append(topic_data)
+        
+        # Add unattended topics to weak areas
+        unattended_topics = [topic for topic in all_topic_categories if topic not in attempted_topics]
+        for topic in unattended_topics:
+            weak_areas.append({
+                'topic_category': topic,
+                'total_attempted': 0,
+                'total_correct': 0,
+                'accuracy': 0.0,
+                'recommendation': f'Start practicing {topic} questions to build your knowledge',
+                'unattended': True
+            })
+        
+        # Sort weak areas by accuracy (lowest first) and strengths by accuracy (highest first)
+        weak_areas.sort(key=lambda x: x['accuracy'])
+        strengths.sort(key=lambda x: x['accuracy'], reverse=True)
+        
+        logger.info(f"Topic analysis for user {user_id}: {len(weak_areas)} weak areas, {len(strengths)} strengths")
+        
+        return {
+            'weak_areas': weak_areas,
+            'strengths': strengths
+        }
+
+    def _active_topic_categories(self):
+        """Get topic categories of active questions, from the question bank cache when enabled"""
+        if current_app.config.get('QUESTION_CACHE_ENABLED', True):
+            return self.question_cache.topics(
+                self._load_active_questions,
+                max_age=current_app.config.get('QUESTION_CACHE_TTL')
+            )
+        
+        from ..models import Question
+        all_topics = self.db.session.query(
+            Question.topic_category
+        ).filter(
+            Question.topic_category.isnot(None),
+            Question.is_active == True
+        ).distinct().all()
+        return [topic[0] for topic in all_topics]
+
+    def _windowed_topic_performance(self, user_id, window_start):
+        """Sum daily topic buckets since window_start into (topic, attempted, correct, accuracy) rows
+        
+        Migration 0002 backfilled buckets for attempts made before the table
+        existed, so the buckets alone cover the user's whole history.
+        """
+        from sqlalchemy import func
+        
+        buckets = self.db.session.query(
+            UserTopicDailyRollup.topic_category,
+            func.sum(UserTopicDailyRollup.total_attempted),
+            func.sum(UserTopicDailyRollup.total_correct)
+        ).filter(
+            UserTopicDailyRollup.user_id == user_id,
+            UserTopicDailyRollup.bucket_date >= window_start.date()
+        ).group_by(
+            UserTopicDailyRollup.topic_category
+        ).all()
+        
+        return [
+            (topic_category, int(attempted), int(correct), round(int(correct) * 100.0 / int(attempted), 1))
+            for topic_category, attempted, correct in buckets if attempted
+        ]
+
     def _get_topic_recommendation(self, topic_category, accuracy):
         """Get recommendation for a weak topic"""
         recommendations = {
@@ -0,0 +1,150 @@
+"""
+Bulk export of a user's quiz attempt reports as a streamed ZIP archive
+"""
+import logging
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_BATCH_SIZE = 50
+
+ERRORS_ENTRY = 'errors.txt'
+
+
+def report_name(attempt_id):
+    """Get the archive entry name of an attempt's report"""
+    return f"quiz-attempt-{attempt_id}.pdf"
+
+
+class _ZipStream:
+    """Write-only file object collecting archive bytes between yields
+
+    It has no ``tell``, so zipfile writes in streaming mode with data
+    descriptors and never seeks back.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Take the bytes written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ReportExportService:
+    """Streams every attempt report of a user as one ZIP archive
+
+    Attempts are read in keyset pages, with the details of each page fetched
+    in batched queries. Reports not already in the PDF cache render in the job
+    pool, and at most ``max_in_flight`` renders are outstanding at a time. Each
+    report is added to the archive and sent as soon as it is ready, so memory
+    stays bounded by the window rather than the user's history.
+
+    A sync gunicorn worker is killed once a request outlives its timeout,
+    which would cut the archive off mid-entry. After ``time_limit`` seconds
+    the export therefore stops queueing renders, finishes those in flight and
+    closes the archive with the remaining attempts listed in ``errors.txt``.
+    Every rendered report stays cached, so exporting again picks up where the
+    previous export stopped.
+    """
+
+    def __init__(self, database_service, pdf_job_service, batch_size=DEFAULT_EXPORT_BATCH_SIZE,
+                 time_limit=None):
+        self.database_service = database_service
+        self.pdf_job_service = pdf_job_service
+        self.batch_size = batch_size
+        self.time_limit = time_limit
+
+    @property
+    def max_in_flight(self):
+        """Get how many renders may be outstanding: two per pool process keeps it busy"""
+        return max(2, self.pdf_job_service.max_workers * 2)
+
+    def iter_attempts(self, user_id):
+        """Yield (attempt_data, questions_data) for every attempt of a user, newest first
+
+        Database errors propagate, so a failed page aborts the export instead
+        of producing a silently truncated archive.
+        """
+        for attempts, details in self.database_service.iter_user_attempt_pages(user_id, self.batch_size):
+            for attempt in attempts:
+                yield attempt.to_dict(), details.get(attempt.id, [])
+
+    def stream_user_reports(self, user_id):
+        """Generate the ZIP archive of a user's reports chunk by chunk
+
+        Reports that fail to render are listed in an ``errors.txt`` entry
+        instead of being left out silently.
+        """
+        stream = _ZipStream()
+        pdf_cache = self.pdf_job_service.pdf_cache
+        pending = {}
+        failures = []
+        exported = 0
+        deadline = time.monotonic() + self.time_limit if self.time_limit else None
+
+        with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+            for attempt_data, questions_data in self.iter_attempts(user_id):
+                if deadline is not None and time.monotonic() >= deadline:
+                    failures.append(
+                        f"Export stopped after {self.time_limit} seconds before reaching "
+                        f"{report_name(attempt_data['id'])} and older attempts; export again to continue"
+                    )
+                    break
+
+                cached_path = pdf_cache.get(attempt_data['id'])
+                if cached_path is not None:
+                    exported += self._add_report(archive, attempt_data, questions_data, cached_path)
+                else:
+                    future = self.pdf_job_service.submit_render(attempt_data, questions_data)
+                    pending[future] = (attempt_data, questions_data)
+                    if len(pending) >= self.max_in_flight:
+                        exported += self._collect(archive, pending, failures)
+
+                chunk = stream.drain()
+                if chunk:
+                    yield chunk
+
+            while pending:
+                exported += self._collect(archive, pending, failures)
+                yield stream.drain()
+
+            if failures:
+                archive.writestr(ERRORS_ENTRY, '\n'.join(failures) + '\n')
+
+        yield stream.drain()
+        logger.info(f"Exported {exported} attempt reports for user {user_id} ({len(failures)} failed)")
+
+    def _collect(self, archive, pending, failures):
+        """Wait for at least one render and add every finished report to the archive"""
+        added = 0
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            attempt_data, questions_data = pending.pop(future)
+            try:
+                added += self._add_report(archive, attempt_data, questions_data, future.result())
+            except Exception as e:
+                logger.error(f"Error exporting report for attempt {attempt_data['id']}: {e}")
+                failures.append(f"{report_name(attempt_data['id'])}: {e}")
+        return added
+
+    def _add_report(self, archive, attempt_data, questions_data, path):
+        """Add one cached report to the archive, rendering it here if it was evicted meanwhile"""
+        arcname = report_name(attempt_data['id'])
+        try:
+            archive.write(path, arcname)
+        except FileNotFoundError:
+            from .pdf_service import get_pdf_service
+            archive.writestr(arcname, get_pdf_service().generate_quiz_attempt_pdf(attempt_data, questions_data))
+        return 1
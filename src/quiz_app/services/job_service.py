@@ -0,0 +1,170 @@
+"""
+Background PDF report jobs for dbt Certification Quiz Application
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_JOBS = 1000
+
+
+def default_pdf_workers():
+    """Leave one core for the web worker itself"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def render_attempt_report(cache_dir, max_bytes, template_version, attempt_data, questions_data):
+    """Render one attempt report into the shared PDF cache
+
+    Runs in a pool process, so it only receives plain dicts and never touches
+    the database.
+
+    Returns:
+        str: Path of the cached report
+    """
+    from .pdf_cache import PDFReportCache
+    from .pdf_service import get_pdf_service
+
+    cache = PDFReportCache(cache_dir, max_bytes=max_bytes, template_version=template_version)
+    pdf_content = get_pdf_service().generate_quiz_attempt_pdf(attempt_data, questions_data)
+    return cache.put(attempt_data['id'], pdf_content)
+
+
+class PDFJobService:
+    """Queue of PDF report renders executed in a process pool
+
+    A job renders one attempt's report into the PDF cache, and its id is the
+    report's cache key, so enqueueing the same attempt twice reuses the job.
+    While a job is in flight its report carries a pending marker in the shared
+    cache, so every worker reports it as pending, none queues it a second
+    time, and any worker reports it done once the file appears.
+
+    The pool is started on first use with the 'spawn' start method, so it is
+    created after gunicorn forks and never inherits the web worker's threads
+    or database connections. With ``max_workers=0`` reports render inline,
+    which keeps tests and single-process setups simple.
+    """
+
+    def __init__(self, pdf_cache, max_workers=None, max_jobs=DEFAULT_MAX_JOBS):
+        self.pdf_cache = pdf_cache
+        self.max_workers = default_pdf_workers() if max_workers is None else max_workers
+        self.max_jobs = max_jobs
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """Get the process pool, starting it on first use"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                    logger.info(f"Started PDF job pool with {self.max_workers} processes")
+        return self._executor
+
+    def submit_attempt_report(self, attempt_data, questions_data):
+        """Enqueue an attempt report render unless it is cached or already queued
+
+        Returns:
+            str: Job id
+        """
+        attempt_id = attempt_data['id']
+        job_id = self.pdf_cache.key(attempt_id)
+
+        with self._lock:
+            future = self._jobs.get(job_id)
+            if future is not None and not (future.done() and future.exception()):
+                return job_id
+
+        if self.pdf_cache.get(attempt_id) is not None:
+            return job_id
+
+        # Another worker may already be rendering it
+        if not self.pdf_cache.mark_pending(attempt_id):
+            return job_id
+
+        try:
+            future = self.submit_render(attempt_data, questions_data)
+        except Exception:
+            self.pdf_cache.clear_pending(attempt_id)
+            raise
+        future.add_done_callback(lambda _: self.pdf_cache.clear_pending(attempt_id))
+
+        with self._lock:
+            self._jobs[job_id] = future
+            self._jobs.move_to_end(job_id)
+            self._trim()
+
+        logger.info(f"Queued PDF job {job_id}")
+        return job_id
+
+    def submit_render(self, attempt_data, questions_data):
+        """Render an attempt report into the cache without tracking it as a job
+
+        Returns:
+            Future: Resolves to the cached report's path
+        """
+        args = (
+            self.pdf_cache.directory, self.pdf_cache.max_bytes, self.pdf_cache.template_version,
+            attempt_data, questions_data
+        )
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                future.set_result(render_attempt_report(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self.executor.submit(render_attempt_report, *args)
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond max_jobs (caller holds the lock)"""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, future in self._jobs.items() if future.done()][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def status(self, job_id):
+        """Get a job's status: 'pending', 'running', 'done', 'failed' or 'unknown'
+
+        Jobs this worker never queued, or has since forgotten, are looked up
+        in the shared cache: 'done' once the report is there, 'pending' while
+        its marker is, and 'unknown' otherwise.
+
+        Returns:
+            dict: {'status'} plus a generic 'error' for failed jobs
+        """
+        with self._lock:
+            future = self._jobs.get(job_id)
+
+        if future is None:
+            # Possibly enqueued by another worker
+            attempt_id = self.pdf_cache.attempt_id_from_key(job_id)
+            if attempt_id is not None and os.path.exists(self.pdf_cache.path(attempt_id)):
+                return {'status': 'done'}
+            if attempt_id is not None and self.pdf_cache.is_pending(attempt_id):
+                return {'status': 'pending'}
+            return {'status': 'unknown'}
+
+        if not future.done():
+            return {'status': 'running' if future.running() else 'pending'}
+
+        error = future.exception()
+        if error is not None:
+            logger.error(f"PDF job {job_id} failed: {error}", exc_info=error)
+            return {'status': 'failed', 'error': 'Failed to generate PDF'}
+        return {'status': 'done'}
+
+    def shutdown(self, wait=True):
+        """Stop the process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,150 @@
+"""
+On-disk cache of generated quiz attempt PDF reports
+"""
+import logging
+import os
+import re
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Pending markers older than this are left behind by a worker that died mid-render
+DEFAULT_PENDING_TIMEOUT = 10 * 60
+
+KEY_PATTERN = re.compile(r'^attempt-(\d+)-v(\d+)$')
+
+
+class PDFReportCache:
+    """Bounded directory of rendered attempt reports keyed by attempt and template version
+
+    Attempts never change after submission, so a report only needs rendering
+    again when the PDF template changes; bumping ``template_version`` retires
+    every older file. Files are written atomically, so workers sharing the
+    directory never serve a partial report. Each hit stamps the file's access
+    time, and once the directory exceeds ``max_bytes`` the least recently used
+    reports are deleted. Modification time is left alone and serves as
+    Last-Modified.
+
+    A report being rendered has a ``.pending`` marker next to where it will be
+    stored, so every worker sharing the directory sees that it is in flight.
+    Markers older than ``pending_timeout`` seconds are treated as abandoned.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_PDF_CACHE_MAX_BYTES, template_version=1,
+                 pending_timeout=DEFAULT_PENDING_TIMEOUT):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.template_version = template_version
+        self.pending_timeout = pending_timeout
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, attempt_id):
+        """Get the cache key, also used as the ETag, for an attempt's report"""
+        return f"attempt-{attempt_id}-v{self.template_version}"
+
+    def attempt_id_from_key(self, key):
+        """Get the attempt id from a cache key of the current template version, or None"""
+        match = KEY_PATTERN.match(key)
+        if match is None or int(match.group(2)) != self.template_version:
+            return None
+        return int(match.group(1))
+
+    def path(self, attempt_id):
+        """Get the file path for an attempt's report"""
+        return os.path.join(self.directory, f"{self.key(attempt_id)}.pdf")
+
+    def pending_path(self, attempt_id):
+        """Get the path of the marker showing an attempt's report is being rendered"""
+        return os.path.join(self.directory, f"{self.key(attempt_id)}.pending")
+
+    def mark_pending(self, attempt_id):
+        """Claim the render of an attempt's report for this worker
+
+        Returns:
+            bool: False if another worker is already rendering it
+        """
+        path = self.pending_path(attempt_id)
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            if self.is_pending(attempt_id):
+                return False
+            with open(path, 'a'):
+                os.utime(path)  # Take over an abandoned marker
+        return True
+
+    def is_pending(self, attempt_id):
+        """Check whether some worker is rendering an attempt's report"""
+        try:
+            marked_at = os.stat(self.pending_path(attempt_id)).st_mtime
+        except FileNotFoundError:
+            return False
+        return time.time() - marked_at < self.pending_timeout
+
+    def clear_pending(self, attempt_id):
+        """Remove an attempt's pending marker once its render has finished or failed"""
+        try:
+            os.unlink(self.pending_path(attempt_id))
+        except FileNotFoundError:
+            pass
+
+    def get(self, attempt_id):
+        """Get the path of a cached report, or None on a miss"""
+        path = self.path(attempt_id)
+        try:
+            modified_at = os.stat(path).st_mtime
+            os.utime(path, (time.time(), modified_at))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, attempt_id, pdf_content):
+        """Store a rendered report and evict old ones if the cache is over budget
+
+        Returns:
+            str: Path of the stored report
+        """
+        path = self.path(attempt_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_content)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete least recently used reports until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.pdf'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+                logger.info(f"Evicted cached PDF report {os.path.basename(path)}")
+            except FileNotFoundError:
+                total -= size  # Already evicted by another worker
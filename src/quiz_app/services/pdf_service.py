@@ -1,8 +1,8 @@
 """
 PDF Service for generating quiz attempt summaries
 """
-import os
-import tempfile
+import copy
+import io
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
@@ -13,73 +13,128 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor
 
+# Bump whenever the report layout changes so cached PDFs are regenerated
+PDF_TEMPLATE_VERSION = 1
 
-class PDFService:
-    """Service for generating PDF reports"""
-    
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+
+def _build_styles():
+    """Build the sample stylesheet and the report's custom paragraph styles"""
+    styles = getSampleStyleSheet()
     
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
+    custom = {
         # Title style
-        self.title_style = ParagraphStyle(
+        'title': ParagraphStyle(
             'CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
             spaceAfter=30,
             alignment=TA_CENTER,
             textColor=HexColor('#8b5cf6')  # Purple color
-        )
+        ),
         
         # Subtitle style
-        self.subtitle_style = ParagraphStyle(
+        'subtitle': ParagraphStyle(
             'CustomSubtitle',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=16,
             spaceAfter=20,
             alignment=TA_CENTER,
             textColor=HexColor('#6b7280')  # Gray color
-        )
+        ),
         
         # Header style
-        self.header_style = ParagraphStyle(
+        'header': ParagraphStyle(
             'CustomHeader',
-            parent=self.styles['Heading3'],
+            parent=styles['Heading3'],
             fontSize=14,
             spaceAfter=12,
             textColor=HexColor('#374151')  # Dark gray
-        )
+        ),
         
         # Normal text style
-        self.normal_style = ParagraphStyle(
+        'normal': ParagraphStyle(
             'CustomNormal',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=11,
             spaceAfter=6,
             textColor=HexColor('#1f2937')  # Very dark gray
-        )
+        ),
         
         # Question style
-        self.question_style = ParagraphStyle(
+        'question': ParagraphStyle(
             'CustomQuestion',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=11,
             spaceAfter=8,
             leftIndent=20,
             textColor=HexColor('#1f2937')
-        )
+        ),
         
         # Answer style
-        self.answer_style = ParagraphStyle(
+        'answer': ParagraphStyle(
             'CustomAnswer',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             spaceAfter=6,
             leftIndent=30,
             textColor=HexColor('#6b7280')
         )
+    }
+    return styles, custom
+
+
+# Styles and static flowables are built once per process and shared by every report
+STYLES, CUSTOM_STYLES = _build_styles()
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#8b5cf6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+])
+
+# Paragraph markup is parsed once here; layout state is per copy (see _static)
+STATIC_PARAGRAPHS = {
+    'title': Paragraph("dbt Certification Quiz", CUSTOM_STYLES['title']),
+    'subtitle': Paragraph("Attempt Summary Report", CUSTOM_STYLES['subtitle']),
+    'summary_header': Paragraph("Quiz Summary", CUSTOM_STYLES['header']),
+    'performance_header': Paragraph("Performance Analysis", CUSTOM_STYLES['header']),
+    'questions_header': Paragraph("Questions & Answers", CUSTOM_STYLES['header']),
+    'not_answered': Paragraph("<b>Your Answer:</b> Not answered", CUSTOM_STYLES['answer']),
+}
+
+
+class PDFService:
+    """Service for generating PDF reports
+    
+    Holds no per-report state, so one instance is shared per process (see
+    get_pdf_service) and reuses the module's prebuilt styles.
+    """
+    
+    def __init__(self):
+        self.styles = STYLES
+        self.title_style = CUSTOM_STYLES['title']
+        self.subtitle_style = CUSTOM_STYLES['subtitle']
+        self.header_style = CUSTOM_STYLES['header']
+        self.normal_style = CUSTOM_STYLES['normal']
+        self.question_style = CUSTOM_STYLES['question']
+        self.answer_style = CUSTOM_STYLES['answer']
+    
+    @staticmethod
+    def _static(name):
+        """Get a fresh copy of a prebuilt paragraph
+        
+        Flowables record layout state while a document is built, so concurrent
+        reports each get a shallow copy that shares the parsed text.
+        """
+        return copy.copy(STATIC_PARAGRAPHS[name])
     
     def generate_quiz_attempt_pdf(self, attempt_data, questions_data=None):
         """
@@ -92,69 +147,51 @@ class PDFService:
         Returns:
             bytes: PDF file content
         """
-        # Create temporary file
-        tmp_file = None
-        try:
-            tmp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-            tmp_file.close()  # Close immediately to avoid file handle issues
-            
-            doc = SimpleDocTemplate(
-                tmp_file.name,
-                pagesize=A4,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Build PDF content
-            story = []
-            
-            # Add header with logo and title
-            story.extend(self._create_header(attempt_data))
-            
-            # Add attempt summary
-            story.extend(self._create_summary_section(attempt_data))
-            
-            # Add performance breakdown
-            story.extend(self._create_performance_section(attempt_data))
-            
-            # Add questions and answers if provided
-            if questions_data:
-                story.extend(self._create_questions_section(questions_data))
-            
-            # Add footer
-            story.extend(self._create_footer(attempt_data))
-            
-            # Build PDF
-            doc.build(story)
-            
-            # Read the generated PDF
-            with open(tmp_file.name, 'rb') as f:
-                pdf_content = f.read()
-            
-            return pdf_content
-            
-        finally:
-            # Clean up temporary file with error handling
-            if tmp_file and os.path.exists(tmp_file.name):
-                try:
-                    os.unlink(tmp_file.name)
-                except (OSError, PermissionError):
-                    # On Windows, sometimes the file can't be deleted immediately
-                    # This is not critical for the functionality
-                    pass
+        # Render into memory; nothing touches the filesystem
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=72
+        )
+        
+        # Build PDF content
+        story = []
+        
+        # Add header with logo and title
+        story.extend(self._create_header(attempt_data))
+        
+        # Add attempt summary
+        story.extend(self._create_summary_section(attempt_data))
+        
+        # Add performance breakdown
+        story.extend(self._create_performance_section(attempt_data))
+        
+        # Add questions and answers if provided
+        if questions_data:
+            story.extend(self._create_questions_section(questions_data))
+        
+        # Add footer
+        story.extend(self._create_footer(attempt_data))
+        
+        # Build PDF
+        doc.build(story)
+        
+        return buffer.getvalue()
     
     def _create_header(self, attempt_data):
         """Create PDF header with logo and title"""
         elements = []
         
         # Title
-        title = Paragraph("dbt Certification Quiz", self.title_style)
+        title = self._static('title')
         elements.append(title)
         
         # Subtitle
-        subtitle = Paragraph("Attempt Summary Report", self.subtitle_style)
+        subtitle = self._static('subtitle')
         elements.append(subtitle)
         
         # Attempt info
@@ -171,7 +208,7 @@ class PDFService:
         elements = []
         
         # Section header
-        header = Paragraph("Quiz Summary", self.header_style)
+        header = self._static('summary_header')
         elements.append(header)
         
         # Summary table
@@ -186,19 +223,7 @@ class PDFService:
         ]
         
         summary_table = Table(summary_data, colWidths=[2*inch, 3*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#8b5cf6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9fafb')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-        ]))
+        summary_table.setStyle(SUMMARY_TABLE_STYLE)
         
         elements.append(summary_table)
         elements.append(Spacer(1, 20))
@@ -209,7 +234,7 @@ class PDFService:
         elements = []
         
         # Section header
-        header = Paragraph("Performance Analysis", self.header_style)
+        header = self._static('performance_header')
         elements.append(header)
         
         # Performance assessment
@@ -252,7 +277,7 @@ class PDFService:
         elements = []
         
         # Section header
-        header = Paragraph("Questions & Answers", self.header_style)
+        header = self._static('questions_header')
         elements.append(header)
         
         for question_data in questions_data:
@@ -285,7 +310,7 @@ class PDFService:
                 user_para = Paragraph(user_answer_text, self.answer_style)
                 elements.append(user_para)
             else:
-                user_para = Paragraph("<b>Your Answer:</b> Not answered", self.answer_style)
+                user_para = self._static('not_answered')
                 elements.append(user_para)
             
             # Correct answer
@@ -344,3 +369,14 @@ class PDFService:
         # 4. Update database records accordingly
         
         pass
+
+
+_pdf_service = None
+
+
+def get_pdf_service():
+    """Get the process-wide PDFService instance"""
+    global _pdf_service
+    if _pdf_service is None:
+        _pdf_service = PDFService()
+    return _pdf_service
@@ -0,0 +1,103 @@
+"""
+In-process question bank cache for dbt Certification Quiz Application
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CachedQuestion:
+    """Detached, read-only copy of a Question row used for quiz generation"""
+
+    __slots__ = (
+        'id', 'question_text', 'options', 'correct_answer',
+        'explanation', 'difficulty_level', 'topic_category'
+    )
+
+    def __init__(self, question):
+        self.id = question.id
+        self.question_text = question.question_text
+        self.options = question.options
+        self.correct_answer = question.correct_answer
+        self.explanation = question.explanation
+        self.difficulty_level = question.difficulty_level
+        self.topic_category = question.topic_category
+
+    def __repr__(self):
+        return f'<CachedQuestion {self.id} - {self.topic_category}>'
+
+
+class QuestionBankCache:
+    """Versioned cache of active questions keyed by (difficulty, topic)
+
+    The bank is loaded once per worker and reused until either the version is
+    bumped through ``invalidate`` or the entry is older than ``max_age`` seconds,
+    which bounds staleness for changes made by other workers.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._loaded_version = None
+        self._loaded_at = 0.0
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Bump the version so the next lookup reloads the bank"""
+        with self._lock:
+            self.version += 1
+        logger.info(f"Question bank cache invalidated (version {self.version})")
+
+    def is_fresh(self, max_age=None):
+        """Check whether the loaded bank matches the current version and age"""
+        if self._loaded_version != self.version:
+            return False
+        if max_age is not None and time.monotonic() - self._loaded_at > max_age:
+            return False
+        return True
+
+    def get(self, loader, difficulty_level=None, topic_category=None, max_age=None):
+        """Get cached questions for a difficulty/topic, loading the bank if needed
+
+        Args:
+            loader (callable): Returns an iterable of active Question rows
+            difficulty_level (int): Optional difficulty filter
+            topic_category (str): Optional topic filter
+            max_age (float): Optional maximum age of the loaded bank in seconds
+
+        Returns:
+            list: CachedQuestion objects matching the filters
+        """
+        if not self.is_fresh(max_age):
+            self.load(loader)
+        return self._index.get((difficulty_level or None, topic_category or None), [])
+
+    def topics(self, loader, max_age=None):
+        """Get the sorted topic categories present in the cached bank"""
+        if not self.is_fresh(max_age):
+            self.load(loader)
+        return sorted(topic for difficulty, topic in self._index if difficulty is None and topic)
+
+    def load(self, loader):
+        """Load the bank and rebuild the (difficulty, topic) index"""
+        with self._lock:
+            version = self.version
+            questions = [CachedQuestion(question) for question in loader()]
+
+            index = {(None, None): questions}
+            for question in questions:
+                index.setdefault((question.difficulty_level, None), []).append(question)
+                if question.topic_category:
+                    index.setdefault((None, question.topic_category), []).append(question)
+                    index.setdefault(
+                        (question.difficulty_level, question.topic_category), []
+                    ).append(question)
+
+            # Swap in one assignment so concurrent readers never see a partial index
+            self._index = index
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+        logger.info(f"Question bank cache loaded {len(questions)} questions (version {version})")
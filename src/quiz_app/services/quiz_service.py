@@ -2,9 +2,11 @@
 Quiz service for dbt Certification Quiz Application
 """
 import time
+import secrets
 import logging
 from flask import current_app
 from .scoring_service import ScoringService
+from .quiz_session_store import InMemoryQuizSessionStore
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +14,10 @@ logger = logging.getLogger(__name__)
 class QuizService:
     """Service for managing quiz operations"""
     
-    def __init__(self):
+    def __init__(self, session_store=None):
         """Initialize quiz service"""
         self.scoring_service = ScoringService()
+        self.session_store = session_store or InMemoryQuizSessionStore()
         logger.info("Quiz service initialized")
     
     def get_quiz_config(self, num_questions, difficulty):
@@ -29,14 +32,13 @@ class QuizService:
                 difficulty_level=difficulty if difficulty > 0 else None
             )
             
-            # Convert questions to the expected format
+            # Convert questions to the expected format (answer key stays on the server)
             formatted_questions = []
             for question in questions:
                 formatted_question = {
                     'id': question.id,
                     'question': question.question_text,
                     'options': question.options,
-                    'correctAnswer': question.correct_answer,
                     'explanation': question.explanation,
                     'difficulty': question.difficulty_level,
                     'topic': question.topic_category
@@ -49,11 +51,20 @@ class QuizService:
             else:
                 difficulty_name = ["Easy", "Medium", "Difficult", "Critical"][difficulty - 1]
             
+            # Hold question ids and answer key server-side for scoring on submit
+            quiz_token = secrets.token_urlsafe(16)
+            self.session_store.save(quiz_token, {
+                'question_ids': [question.id for question in questions],
+                'answer_key': [question.correct_answer for question in questions],
+                'difficulty': difficulty
+            })
+            
             config = {
                 "numQuestions": num_questions,
                 "difficulty": difficulty,
                 "difficultyName": difficulty_name,
                 "timestamp": time.time(),
+                "quizToken": quiz_token,
                 "questions": formatted_questions
             }
             
@@ -64,6 +75,43 @@ class QuizService:
             logger.error(f"Error generating quiz config: {e}")
             raise
     
+    def score_quiz(self, quiz_token, answers):
+        """Score submitted answer indices against a server-held quiz session
+        
+        Args:
+            quiz_token (str): Token issued by get_quiz_config
+            answers (list): 0-based answer index (or None) per question
+            
+        Returns:
+            dict: Result plus per-question data for recording, or None if the
+                token is unknown, expired or already submitted
+        """
+        quiz_session = self.session_store.pop(quiz_token)
+        if quiz_session is None:
+            return None
+        
+        question_ids = quiz_session['question_ids']
+        answer_key = quiz_session['answer_key']
+        answers = list(answers[:len(question_ids)])
+        answers.extend([None] * (len(question_ids) - len(answers)))
+        
+        correct_answers = sum(
+            1 for user_answer, correct_answer in zip(answers, answer_key)
+            if user_answer is not None and user_answer == correct_answer
+        )
+        total_questions = len(question_ids)
+        
+        return {
+            'correctAnswers': correct_answers,
+            'totalQuestions': total_questions,
+            'percentage': round((correct_answers / total_questions) * 100, 1) if total_questions > 0 else 0,
+            'difficulty': quiz_session.get('difficulty'),
+            'questions_data': [
+                {'question': {'id': question_id}, 'user_answer': user_answer}
+                for question_id, user_answer in zip(question_ids, answers)
+            ]
+        }
+    
     def get_question_stats(self):
         """Get statistics about available questions from question bank"""
         try:
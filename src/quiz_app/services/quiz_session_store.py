@@ -0,0 +1,146 @@
+"""
+Server-side quiz session storage for dbt Certification Quiz Application
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = 3 * 60 * 60  # Seconds; longer than any timed PRO quiz
+DEFAULT_MAX_SESSIONS = 10000
+
+
+class QuizSessionStore:
+    """Interface for storing issued quizzes between configuration and submission
+
+    A quiz session is a small JSON-serializable dict holding the question ids
+    and answer key of a generated quiz, looked up by the opaque token handed to
+    the client. Sessions expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl=DEFAULT_SESSION_TTL):
+        self.ttl = ttl
+
+    def save(self, token, quiz_session):
+        """Store a quiz session under a token"""
+        raise NotImplementedError
+
+    def get(self, token):
+        """Get a quiz session by token, or None if unknown or expired"""
+        raise NotImplementedError
+
+    def delete(self, token):
+        """Remove a quiz session"""
+        raise NotImplementedError
+
+    def pop(self, token):
+        """Get and remove a quiz session so it can only be submitted once"""
+        quiz_session = self.get(token)
+        if quiz_session is not None:
+            self.delete(token)
+        return quiz_session
+
+
+class InMemoryQuizSessionStore(QuizSessionStore):
+    """Quiz session store held in the worker's memory
+
+    Entries are kept in least-recently-used order and the oldest are evicted
+    once ``max_entries`` is reached, so memory stays bounded. Only suitable when
+    a quiz is configured and submitted on the same worker.
+    """
+
+    def __init__(self, ttl=DEFAULT_SESSION_TTL, max_entries=DEFAULT_MAX_SESSIONS):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, token, quiz_session):
+        with self._lock:
+            self._sessions[token] = (time.monotonic() + self.ttl, quiz_session)
+            self._sessions.move_to_end(token)
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def get(self, token):
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            expires_at, quiz_session = entry
+            if expires_at <= time.monotonic():
+                del self._sessions[token]
+                return None
+            self._sessions.move_to_end(token)
+            return quiz_session
+
+    def delete(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def pop(self, token):
+        with self._lock:
+            entry = self._sessions.pop(token, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class RedisQuizSessionStore(QuizSessionStore):
+    """Quiz session store shared by all workers through a Redis-protocol server
+
+    Every key is written with an expiry, and the server's maxmemory policy
+    bounds total memory, so workers can scale out without sticky sessions.
+    """
+
+    def __init__(self, url=None, client=None, ttl=DEFAULT_SESSION_TTL, prefix='quiz-session:'):
+        super().__init__(ttl)
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, token):
+        return f"{self.prefix}{token}"
+
+    def save(self, token, quiz_session):
+        self.client.set(self._key(token), json.dumps(quiz_session), ex=self.ttl)
+
+    def get(self, token):
+        value = self.client.get(self._key(token))
+        return json.loads(value) if value is not None else None
+
+    def delete(self, token):
+        self.client.delete(self._key(token))
+
+    def pop(self, token):
+        # GET and DEL in one transaction so concurrent submits cannot both succeed
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.get(self._key(token))
+        pipeline.delete(self._key(token))
+        value, _ = pipeline.execute()
+        return json.loads(value) if value is not None else None
+
+
+def create_quiz_session_store(config):
+    """Create the quiz session store selected by QUIZ_SESSION_BACKEND"""
+    backend = config.get('QUIZ_SESSION_BACKEND', 'memory')
+    ttl = config.get('QUIZ_SESSION_TTL', DEFAULT_SESSION_TTL)
+
+    if backend == 'redis':
+        logger.info("Using Redis quiz session store")
+        return RedisQuizSessionStore(url=config.get('REDIS_URL'), ttl=ttl)
+
+    if backend != 'memory':
+        logger.warning(f"Unknown quiz session backend '{backend}', using in-memory store")
+    return InMemoryQuizSessionStore(
+        ttl=ttl,
+        max_entries=config.get('QUIZ_SESSION_MAX_ENTRIES', DEFAULT_MAX_SESSIONS)
+    )